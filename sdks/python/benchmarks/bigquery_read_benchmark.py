@@ -0,0 +1,72 @@
+"""Compares single and multi-stream reads against a stand-in Storage Read API.
+
+The fake read client serves recorded Arrow record batches, sleeping for a fixed
+latency before each response. The server splits the table into as many streams
+as requested, like the real API does for large tables.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.bigquery_read_benchmark --batches 200 --latency 0.01
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import pyarrow
+
+from terrabridge.gcp import bigquery
+from terrabridge.gcp.bigquery import BigQueryTable
+
+
+class FakeReadClient:
+    def __init__(self, schema, batches, latency):
+        self.schema = schema.serialize().to_pybytes()
+        self.batches = batches
+        self.latency = latency
+        self.streams = {}
+
+    def create_read_session(self, parent, read_session, max_stream_count):
+        self.streams = {
+            f"stream-{i}": self.batches[i::max_stream_count]
+            for i in range(max_stream_count)
+        }
+        return SimpleNamespace(
+            arrow_schema=SimpleNamespace(serialized_schema=self.schema),
+            streams=[SimpleNamespace(name=name) for name in self.streams],
+        )
+
+    def read_rows(self, name):
+        for batch in self.streams[name]:
+            time.sleep(self.latency)
+            yield SimpleNamespace(
+                arrow_record_batch=SimpleNamespace(serialized_record_batch=batch)
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+
+    batch = pyarrow.record_batch(
+        [pyarrow.array(range(args.rows)), pyarrow.array(["x" * 16] * args.rows)],
+        names=["id", "payload"],
+    )
+    recorded = [batch.serialize().to_pybytes()] * args.batches
+    client = FakeReadClient(batch.schema, recorded, args.latency)
+    bigquery._get_read_client = lambda: client
+
+    table = BigQueryTable("table", state_file=args.state_file)
+    print(f"{args.batches} batches of {args.rows} rows, {args.latency * 1000:.0f}ms")
+    for streams in (1, 2, 4, 8):
+        start = time.perf_counter()
+        rows = sum(b.num_rows for b in table.iter_record_batches(max_streams=streams))
+        elapsed = time.perf_counter() - start
+        print(f"{streams} stream(s): {rows / elapsed:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
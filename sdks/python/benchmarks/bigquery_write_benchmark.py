@@ -0,0 +1,68 @@
+"""Compares single and multi-stream writes against a stand-in Storage Write API.
+
+The fake write client acknowledges every append after a fixed latency, which
+stands in for the network round trip and server side processing of a real
+AppendRows call.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.bigquery_write_benchmark --batches 200 --latency 0.01
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import pyarrow
+
+from terrabridge.gcp import bigquery
+from terrabridge.gcp.bigquery import BigQueryTable
+
+
+class FakeWriteClient:
+    def __init__(self, latency):
+        self.latency = latency
+        self.streams = 0
+
+    def create_write_stream(self, parent, write_stream):
+        self.streams += 1
+        return SimpleNamespace(name=f"{parent}/streams/stream-{self.streams}")
+
+    def append_rows(self, requests, metadata):
+        for _ in requests:
+            time.sleep(self.latency)
+            yield SimpleNamespace(error=SimpleNamespace(code=0, message=""))
+
+    def finalize_write_stream(self, name):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+
+    batch = pyarrow.record_batch(
+        [pyarrow.array(range(args.rows)), pyarrow.array(["x" * 16] * args.rows)],
+        names=["id", "payload"],
+    )
+    client = FakeWriteClient(args.latency)
+    bigquery._get_write_client = lambda: client
+
+    table = BigQueryTable("table", state_file=args.state_file)
+    print(f"{args.batches} batches of {args.rows} rows, {args.latency * 1000:.0f}ms")
+    for streams in (1, 2, 4, 8):
+        start = time.perf_counter()
+        rows = table.write(
+            (batch for _ in range(args.batches)),
+            mode="committed",
+            max_streams=streams,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{streams} stream(s): {rows / elapsed:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
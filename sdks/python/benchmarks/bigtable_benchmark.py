@@ -0,0 +1,65 @@
+"""Compares per-row and batched writes, and sequential and sharded reads.
+
+Runs against the Bigtable emulator. Start it and point the client at it first::
+
+    gcloud beta emulators bigtable start --host-port=localhost:8086
+    export BIGTABLE_EMULATOR_HOST=localhost:8086
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.bigtable_benchmark --rows 20000
+"""
+import argparse
+import os
+import time
+
+from google.cloud import bigtable as bigtable_admin
+from google.cloud.bigtable import column_family
+from google.cloud.bigtable.data import RowMutationEntry, SetCell
+
+from terrabridge.gcp.bigtable import BigTableTable
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--per-row", type=int, default=1000)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+    if "BIGTABLE_EMULATOR_HOST" not in os.environ:
+        parser.error("BIGTABLE_EMULATOR_HOST must point at the Bigtable emulator")
+
+    table = BigTableTable("bigtable_table", state_file=args.state_file)
+    admin = bigtable_admin.Client(project=table.project, admin=True)
+    admin_table = admin.instance(table.instance_name).table(table.name)
+    if admin_table.exists():
+        admin_table.delete()
+    admin_table.create(column_families={"cf": column_family.MaxVersionsGCRule(1)})
+    keys = [f"row-{i:08}".encode() for i in range(args.rows)]
+    value = b"x" * 100
+
+    try:
+        start = time.perf_counter()
+        for key in keys[: args.per_row]:
+            table.table().mutate_row(key, SetCell("cf", b"q", value))
+        elapsed = time.perf_counter() - start
+        print(f"mutate_row:        {args.per_row / elapsed:10.0f} rows/s")
+
+        start = time.perf_counter()
+        with table.mutations_batcher(flush_count=1000) as batcher:
+            for key in keys:
+                batcher.append(RowMutationEntry(key, [SetCell("cf", b"q", value)]))
+        elapsed = time.perf_counter() - start
+        print(f"mutations_batcher: {args.rows / elapsed:10.0f} rows/s")
+
+        for workers in (1, 4, 8):
+            start = time.perf_counter()
+            rows = sum(1 for _ in table.read_rows(max_workers=workers))
+            elapsed = time.perf_counter() - start
+            print(f"read_rows({workers} workers): {rows / elapsed:10.0f} rows/s")
+    finally:
+        admin_table.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compares parsing a local state file with loading a compiled bundle.
+
+The state holds ``--resources`` resources of which the application uses
+``--used``, with four attributes each. Both timings exclude the network, a
+remote state would add its download on top of the parse.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.bundle_benchmark --resources 20000 --used 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.state_fetch_benchmark import _state
+from terrabridge import parser
+from terrabridge.bundle import compile_bundle, load_bundle
+from terrabridge.gcp import GCSBucket
+
+
+def _timed(label: str, fn, repeat: int = 5) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        parser.tf_state_cache.clear()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:8.2f}ms")
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--resources", type=int, default=20000)
+    argparser.add_argument("--used", type=int, default=20)
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "terraform.tfstate")
+        with open(state_file, "wb") as f:
+            f.write(_state(args.resources))
+        manifest = {
+            "resources": [
+                {"name": f"bucket_{i}", "attributes": ["id", "project", "name", "url"]}
+                for i in range(args.used)
+            ]
+        }
+        bundle_file = os.path.join(tmp, "terraform.tfb")
+        compile_bundle([state_file], bundle_file, manifest)
+        print(
+            f"{args.resources} resources, {args.used} used: "
+            f"{os.path.getsize(state_file) / 2**20:.1f}MB state, "
+            f"{os.path.getsize(bundle_file) / 2**10:.1f}KB bundle"
+        )
+
+        def use():
+            for i in range(args.used):
+                GCSBucket(f"bucket_{i}", state_file=state_file)
+
+        _timed("parse state", use)
+        _timed("load bundle", lambda: (load_bundle(bundle_file), use()))
+
+
+if __name__ == "__main__":
+    main()
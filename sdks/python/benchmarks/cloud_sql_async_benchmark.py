@@ -0,0 +1,79 @@
+"""Measures query throughput of the thread-offload async engine.
+
+MySQL and SQL Server async engines without a native async driver run on a
+``ThreadedAsyncEngine``. This benchmark compares it against serial use of the
+underlying sync engine, using SQLite connections with injected connect and query
+latency as a stand-in for a remote database.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.cloud_sql_async_benchmark --queries 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import sqlite3
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from terrabridge.gcp.cloud_sql import ThreadedAsyncEngine
+
+
+def _engine(connect_latency: float, pool_size: int):
+    def creator():
+        time.sleep(connect_latency)
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.create_function("sleep", 1, time.sleep)
+        return conn
+
+    return create_engine(
+        "sqlite://",
+        creator=creator,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--connect-latency", type=float, default=0.05)
+    parser.add_argument("--query-latency", type=float, default=0.005)
+    args = parser.parse_args()
+    query = text(f"SELECT sleep({args.query_latency})")
+
+    sync_engine = _engine(args.connect_latency, args.concurrency)
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        with sync_engine.connect() as conn:
+            conn.execute(query)
+    serial = time.perf_counter() - start
+
+    async def run_async():
+        engine = ThreadedAsyncEngine(
+            _engine(args.connect_latency, args.concurrency), args.concurrency
+        )
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one():
+            async with semaphore:
+                async with engine.connect() as conn:
+                    await conn.execute(query)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.queries)))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+        return elapsed
+
+    threaded = asyncio.run(run_async())
+    print(f"{args.queries} queries, concurrency {args.concurrency}")
+    print(f"sync serial       {args.queries / serial:8.0f} queries/s")
+    print(f"threaded async    {args.queries / threaded:8.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
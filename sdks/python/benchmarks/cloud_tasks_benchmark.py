@@ -0,0 +1,103 @@
+"""Compares a serial create_task loop with enqueue_many.
+
+A local gRPC server stands in for Cloud Tasks, sleeping for a fixed latency
+before acknowledging each CreateTask call. The client talks to it over a real
+channel, so request serialization and HTTP/2 multiplexing are included.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.cloud_tasks_benchmark --tasks 2000 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+from concurrent import futures
+
+import grpc
+from google.cloud import tasks_v2
+from google.cloud.tasks_v2.services.cloud_tasks.transports import (
+    CloudTasksGrpcAsyncIOTransport,
+    CloudTasksGrpcTransport,
+)
+
+from terrabridge.gcp import cloud_tasks
+from terrabridge.gcp.cloud_tasks import CloudTasksQueue
+
+
+def serve(latency: float) -> tuple:
+    def create_task(request, context):
+        time.sleep(latency)
+        return request.task
+
+    handler = grpc.method_handlers_generic_handler(
+        "google.cloud.tasks.v2.CloudTasks",
+        {
+            "CreateTask": grpc.unary_unary_rpc_method_handler(
+                create_task,
+                request_deserializer=tasks_v2.CreateTaskRequest.deserialize,
+                response_serializer=tasks_v2.Task.serialize,
+            )
+        },
+    )
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=256))
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return server, f"localhost:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+
+    server, address = serve(args.latency)
+    client = tasks_v2.CloudTasksClient(
+        transport=CloudTasksGrpcTransport(channel=grpc.insecure_channel(address))
+    )
+    cloud_tasks._get_client = lambda: client
+    queue = CloudTasksQueue("queue", state_file=args.state_file)
+    tasks = [
+        {"url": "https://worker.example.com/run", "payload": {"i": i}}
+        for i in range(args.tasks)
+    ]
+    print(f"{args.tasks} tasks, {args.latency * 1000:.0f}ms per request")
+
+    serial = tasks[: max(1, args.tasks // 10)]
+    start = time.perf_counter()
+    for kwargs in serial:
+        queue.enqueue(**kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"serial enqueue:          {len(serial) / elapsed:8.0f} tasks/s")
+
+    for concurrency in (8, 32, 64):
+        start = time.perf_counter()
+        queue.enqueue_many(tasks, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        print(
+            f"enqueue_many({concurrency:>2}):        {args.tasks / elapsed:8.0f} tasks/s"
+        )
+
+    async def run_async(concurrency):
+        async_client = tasks_v2.CloudTasksAsyncClient(
+            transport=CloudTasksGrpcAsyncIOTransport(
+                channel=grpc.aio.insecure_channel(address)
+            )
+        )
+        cloud_tasks._get_async_client = lambda: async_client
+        start = time.perf_counter()
+        await queue.aenqueue_many(tasks, max_concurrency=concurrency)
+        return time.perf_counter() - start
+
+    for concurrency in (32, 128):
+        elapsed = asyncio.run(run_async(concurrency))
+        print(
+            f"aenqueue_many({concurrency:>3}):     {args.tasks / elapsed:8.0f} tasks/s"
+        )
+    server.stop(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Times generating and loading typed resource classes, and attribute access.
+
+A synthetic provider schema with ``--types`` resource types of ``--attributes``
+attributes and one nested block each stands in for a large provider. Attribute
+access compares ``Resource.__getattr__`` with the generated slots for the
+bucket in the test state.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.codegen_benchmark --types 1000 --attributes 40
+"""
+import argparse
+import json
+import time
+import timeit
+
+from terrabridge.codegen import generate
+from terrabridge.gcp import GCSBucket
+
+
+def _schema(types: int, attributes: int) -> dict:
+    block = {
+        "attributes": {
+            "id": {"type": "string"},
+            "project": {"type": "string"},
+            **{f"attribute_{i}": {"type": "string"} for i in range(attributes)},
+        },
+        "block_types": {
+            "nested": {
+                "nesting_mode": "list",
+                "block": {"attributes": {"enabled": {"type": "bool"}}},
+            }
+        },
+    }
+    return {
+        "provider_schemas": {
+            "synthetic": {
+                "resource_schemas": {
+                    f"google_synthetic_{i}": {"block": block} for i in range(types)
+                }
+            }
+        }
+    }
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--types", type=int, default=1000)
+    argparser.add_argument("--attributes", type=int, default=40)
+    args = argparser.parse_args()
+
+    schema = _schema(args.types, args.attributes)
+    start = time.perf_counter()
+    source = generate(
+        schema, list(schema["provider_schemas"]["synthetic"]["resource_schemas"])
+    )
+    generated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    code = compile(source, "tf_types.py", "exec")
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exec(code, {"__name__": "tf_types"})
+    loaded = time.perf_counter() - start
+
+    print(
+        f"{args.types} types x {args.attributes} attributes, "
+        f"{len(source) / 2**20:.1f}MB of source"
+    )
+    print(f"{'generate':<28} {generated * 1000:8.0f}ms")
+    print(f"{'compile':<28} {compiled * 1000:8.0f}ms")
+    print(f"{'load (cached bytecode)':<28} {loaded * 1000:8.0f}ms")
+
+    with open("tests/data/providers_schema.json") as f:
+        namespace = {"__name__": "tf_types"}
+        exec(generate(json.load(f), ["google_storage_bucket"]), namespace)
+    state_file = "tests/data/terraform.tfstate"
+    dynamic = GCSBucket("bucket", state_file=state_file)
+    typed = namespace["GoogleStorageBucket"]("bucket", state_file=state_file)
+    number = 1_000_000
+    for label, bucket in (("__getattr__", dynamic), ("generated slot", typed)):
+        seconds = timeit.timeit(lambda: bucket.location, number=number)
+        print(f"{label + ' access':<28} {seconds / number * 1e9:8.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compares item-at-a-time DynamoDB calls with the batch and parallel scan helpers.
+
+An in-memory fake stands in for the DynamoDB client, sleeping for a fixed
+latency per request to stand in for the network round trip. moto is not used
+because its scans get slower with every page of a large table. Scans use a
+small page size so the table spans many pages, as a large table would.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.dynamodb_benchmark --items 5000 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+from terrabridge.aws import DynamoDBTable
+
+
+class FakeClient:
+    def __init__(self, table: str, latency: float, page_size: int) -> None:
+        self.table = table
+        self.latency = latency
+        self.page_size = page_size
+        self.lock = threading.Lock()
+        self.items = {}
+        self.sorted_keys = None
+
+    @staticmethod
+    def _key(item):
+        return json.dumps([item["pk"], item["sk"]])
+
+    def put_item(self, TableName, Item):
+        time.sleep(self.latency)
+        with self.lock:
+            self.items[self._key(Item)] = Item
+            self.sorted_keys = None
+        return {}
+
+    def get_item(self, TableName, Key, ConsistentRead):
+        time.sleep(self.latency)
+        item = self.items.get(self._key(Key))
+        return {} if item is None else {"Item": item}
+
+    def batch_write_item(self, RequestItems):
+        time.sleep(self.latency)
+        with self.lock:
+            for request in RequestItems[self.table]:
+                item = request["PutRequest"]["Item"]
+                self.items[self._key(item)] = item
+            self.sorted_keys = None
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems):
+        time.sleep(self.latency)
+        keys = RequestItems[self.table]["Keys"]
+        found = [self.items.get(self._key(key)) for key in keys]
+        return {"Responses": {self.table: [item for item in found if item]}}
+
+    def scan(self, TableName, Segment=0, TotalSegments=1, ExclusiveStartKey=None):
+        time.sleep(self.latency)
+        with self.lock:
+            if self.sorted_keys is None:
+                self.sorted_keys = sorted(self.items)
+        keys = self.sorted_keys[Segment::TotalSegments]
+        start = 0 if ExclusiveStartKey is None else ExclusiveStartKey["index"] + 1
+        page = keys[start : start + self.page_size]
+        response = {"Items": [self.items[key] for key in page]}
+        if start + self.page_size < len(keys):
+            response["LastEvaluatedKey"] = {"index": start + len(page) - 1}
+        return response
+
+
+def _timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count / elapsed:8.0f} items/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--state-file", default="tests/data/aws.tfstate")
+    args = parser.parse_args()
+
+    table = DynamoDBTable("table", state_file=args.state_file)
+    client = FakeClient(table.name, args.latency, args.page_size)
+    DynamoDBTable.client = lambda self: client
+    items = [
+        {"pk": f"user-{i % 100}", "sk": i, "payload": "x" * 100}
+        for i in range(args.items)
+    ]
+    keys = [{"pk": item["pk"], "sk": item["sk"]} for item in items]
+    serial = max(1, args.items // 20)
+    print(f"{args.items} items, {args.latency * 1000:.0f}ms per request")
+
+    def put_serial():
+        for item in items[:serial]:
+            table.put_item(item)
+
+    def get_serial():
+        for key in keys[:serial]:
+            table.get_item(key)
+
+    _timed("serial put_item", serial, put_serial)
+    _timed("batch_write", args.items, lambda: table.batch_write(items))
+    _timed("serial get_item", serial, get_serial)
+    _timed("batch_get", args.items, lambda: table.batch_get(keys))
+
+    for segments in (1, 4, 16):
+        _timed(
+            f"scan(segments={segments})",
+            args.items,
+            lambda: sum(1 for _ in table.scan(segments=segments)),
+        )
+
+    async def ascan():
+        async for _ in table.ascan(segments=16):
+            pass
+
+    _timed("ascan(segments=16)", args.items, lambda: asyncio.run(ascan()))
+
+
+if __name__ == "__main__":
+    main()
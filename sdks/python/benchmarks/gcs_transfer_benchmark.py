@@ -0,0 +1,153 @@
+"""Compares serial and parallel GCS transfers against a latency-injecting fake.
+
+The fake client keeps objects in memory and sleeps for a fixed latency plus a
+per-byte cost on every request, standing in for a real (or fake-gcs-server)
+endpoint.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.gcs_transfer_benchmark --objects 500 --latency 0.02
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from terrabridge.gcp import gcs_bucket
+from terrabridge.gcp.gcs_bucket import GCSBucket
+
+
+class FakeBlob:
+    def __init__(self, client, name, **kwargs):
+        self.client = client
+        self.name = name
+        self.generation = 1
+
+    def _request(self, size):
+        time.sleep(self.client.latency + size / self.client.bandwidth)
+
+    @property
+    def size(self):
+        return len(self.client.objects[self.name])
+
+    def upload_from_filename(self, path):
+        with open(path, "rb") as f:
+            self.upload_from_string(f.read())
+
+    def upload_from_string(self, data):
+        self._request(len(data))
+        self.client.objects[self.name] = data
+
+    def download_to_filename(self, path):
+        data = self.download_as_bytes()
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def download_as_bytes(self, start=0, end=None, checksum="md5"):
+        data = self.client.objects[self.name]
+        data = data[start : None if end is None else end + 1]
+        self._request(len(data))
+        return data
+
+    def compose(self, sources):
+        self._request(0)
+        self.client.objects[self.name] = b"".join(
+            self.client.objects[source.name] for source in sources
+        )
+
+    def delete(self):
+        self._request(0)
+        del self.client.objects[self.name]
+
+
+class FakeClient:
+    def __init__(self, latency, bandwidth):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.objects = {}
+
+    def bucket(self, name):
+        client = self
+
+        class Bucket:
+            def blob(self, blob_name, **kwargs):
+                return FakeBlob(client, blob_name, **kwargs)
+
+            def get_blob(self, blob_name):
+                blob = self.blob(blob_name)
+                blob._request(0)
+                return blob
+
+        return Bucket()
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    print(f"{label:<28} {time.perf_counter() - start:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--bandwidth-mb", type=float, default=100)
+    parser.add_argument("--large-mb", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+
+    client = FakeClient(args.latency, args.bandwidth_mb * 1024 * 1024)
+    gcs_bucket._get_client = lambda: client
+    bucket = GCSBucket("bucket", state_file=args.state_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.objects):
+            path = os.path.join(tmp, f"small-{i}")
+            with open(path, "wb") as f:
+                f.write(os.urandom(1024))
+            files.append((path, f"small/{i}"))
+        large = os.path.join(tmp, "large")
+        with open(large, "wb") as f:
+            f.write(os.urandom(args.large_mb * 1024 * 1024))
+
+        print(f"{args.objects} small objects, {args.latency * 1000:.0f}ms latency")
+        _timed(
+            "serial upload",
+            lambda: [gcs_bucket._upload_file("b", p, n, None) for p, n in files],
+        )
+        _timed(
+            "upload_many",
+            lambda: bucket.upload_many(files, max_workers=args.workers),
+        )
+        _timed(
+            "download_many",
+            lambda: bucket.download_many(
+                [(name, path) for path, name in files], max_workers=args.workers
+            ),
+        )
+        print(f"{args.large_mb}MiB object, {args.bandwidth_mb:.0f}MiB/s per request")
+        _timed(
+            "serial upload",
+            lambda: gcs_bucket._upload_file("b", large, "large", None),
+        )
+        _timed(
+            "upload_composite",
+            lambda: bucket.upload_composite(
+                large, "large", chunk_size=16 * 1024 * 1024, max_workers=args.workers
+            ),
+        )
+        _timed(
+            "serial download",
+            lambda: gcs_bucket._download_file("b", "large", large, None),
+        )
+        _timed(
+            "download_sliced",
+            lambda: bucket.download_sliced(
+                "large", large, slice_size=16 * 1024 * 1024, max_workers=args.workers
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Times dependency graph queries over a large synthetic state.
+
+Every resource depends on ``--fanout`` earlier resources, so the state has
+about ``--resources * --fanout`` dependencies. Impact queries are compared with
+finding dependents by scanning the dependency lists of every resource, as
+walking forward edges only requires.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.graph_benchmark --resources 20000 --fanout 5
+"""
+import argparse
+import random
+import time
+
+from terrabridge.graph import DependencyGraph
+from terrabridge.parser import _ResourceKey
+
+
+def _resources(count: int, fanout: int) -> dict:
+    rng = random.Random(0)
+    resources = {}
+    for i in range(count):
+        dependencies = {
+            f"null_resource.r{rng.randrange(i)}" for _ in range(fanout if i else 0)
+        }
+        resources[_ResourceKey(f"r{i}", None)] = {
+            "type": "null_resource",
+            "attributes": {},
+            "dependencies": sorted(dependencies),
+        }
+    return resources
+
+
+def _scan_dependents(resources: dict, address: str) -> list:
+    # Finds dependents by scanning every resource for each one visited.
+    affected = []
+    seen = {address}
+    queue = [address]
+    while queue:
+        current = queue.pop()
+        for key, resource in resources.items():
+            dependent = f"null_resource.{key.resource_name}"
+            if dependent not in seen and current in resource["dependencies"]:
+                seen.add(dependent)
+                affected.append(dependent)
+                queue.append(dependent)
+    return affected
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:10.1f}ms")
+    return result
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--resources", type=int, default=20000)
+    argparser.add_argument("--fanout", type=int, default=5)
+    args = argparser.parse_args()
+
+    resources = _resources(args.resources, args.fanout)
+    edges = sum(len(r["dependencies"]) for r in resources.values())
+    print(f"{args.resources} resources, {edges} dependencies")
+
+    graph = _timed("build graph", lambda: DependencyGraph(resources))
+    _timed("topological order", graph.topological_order)
+    root = "null_resource.r0"
+    affected = _timed("all_dependents(root)", lambda: graph.all_dependents(root))
+    changed = [f"null_resource.r{i}" for i in range(0, args.resources, 100)]
+    _timed(f"impact({len(changed)} resources)", lambda: graph.impact(changed))
+
+    # Scanning is quadratic, only run it on a leaf-ward resource that affects a
+    # few hundred others.
+    target = next(
+        address
+        for address in reversed(graph.addresses)
+        if 100 <= len(graph.all_dependents(address)) <= 1000
+    )
+    count = len(graph.all_dependents(target))
+    print(f"root affects {len(affected)} resources, the target {count}")
+    _timed("all_dependents(target)", lambda: graph.all_dependents(target))
+    scanned = _timed(
+        "scan dependents(target)", lambda: _scan_dependents(resources, target)
+    )
+    assert sorted(scanned) == sorted(graph.all_dependents(target))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measures the overhead of sending resources to process pool tasks.
+
+Compares resources pickled as references with pickling their full attribute
+dict, which is what pickle did before. The bucket carries ``--labels`` labels
+to stand in for resources with large attributes, such as BigQuery tables with
+wide schemas.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.pickle_benchmark --tasks 5000 --labels 500
+"""
+import argparse
+import json
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from terrabridge.gcp import GCSBucket
+
+
+def _restore(cls, state):
+    resource = cls.__new__(cls)
+    resource.__dict__.update(state)
+    return resource
+
+
+class FullBucket(GCSBucket):
+    def __reduce__(self):
+        return (_restore, (type(self), self.__dict__))
+
+
+def _task(bucket):
+    return len(bucket.url)
+
+
+def _state(labels: int) -> dict:
+    return {
+        "version": 4,
+        "serial": 1,
+        "resources": [
+            {
+                "mode": "managed",
+                "type": "google_storage_bucket",
+                "name": "bucket",
+                "instances": [
+                    {
+                        "attributes": {
+                            "id": "bucket",
+                            "name": "bucket",
+                            "project": "project",
+                            "url": "gs://bucket",
+                            "labels": {
+                                f"label_{i}": "value" * 4 for i in range(labels)
+                            },
+                        }
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--tasks", type=int, default=5000)
+    argparser.add_argument("--labels", type=int, default=500)
+    argparser.add_argument("--workers", type=int, default=4)
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "terraform.tfstate")
+        with open(state_file, "w") as f:
+            json.dump(_state(args.labels), f)
+
+        print(f"{args.tasks} tasks, {args.workers} workers, {args.labels} labels")
+        for label, cls in (
+            ("full dict (before)", FullBucket),
+            ("reference", GCSBucket),
+        ):
+            bucket = cls("bucket", state_file=state_file)
+            size = len(pickle.dumps(bucket))
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                # Starts the workers, which parse the state unless they forked with it.
+                list(executor.map(_task, [bucket] * args.workers * 4))
+                start = time.perf_counter()
+                list(executor.map(_task, [bucket] * args.tasks, chunksize=16))
+                elapsed = time.perf_counter() - start
+            print(
+                f"{label:<20} {size:8d} bytes/task "
+                f"{args.tasks / elapsed:10.0f} tasks/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Times attribute path queries over a large state.
+
+Compares ``select`` with looking every resource up through ``get_resource`` and
+parsing the path on every call, as code had to without compiled paths.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.query_benchmark --resources 20000
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+
+from terrabridge import parser
+from terrabridge.query import select
+
+PATH = "lifecycle_rule[0].action[0].type"
+
+
+def _state(resources: int) -> dict:
+    return {
+        "version": 4,
+        "resources": [
+            {
+                "mode": "managed",
+                "type": "google_storage_bucket" if i % 2 else "google_pubsub_topic",
+                "name": f"resource_{i}",
+                "instances": [
+                    {
+                        "attributes": {
+                            "id": f"resource-{i}",
+                            "project": "project",
+                            "lifecycle_rule": [
+                                {
+                                    "action": [{"type": "Delete"}],
+                                    "condition": [{"age": i % 365}],
+                                }
+                            ],
+                        }
+                    }
+                ],
+            }
+            for i in range(resources)
+        ],
+    }
+
+
+def _parse_and_get(attributes, path):
+    value = attributes
+    for part in path.split("."):
+        match = re.fullmatch(r"(\w+)((?:\[\d+\])*)", part)
+        value = value[match[1]]
+        for index in re.findall(r"\[(\d+)\]", match[2]):
+            value = value[int(index)]
+    return value
+
+
+def _timed(label: str, count: int, fn, repeat: int = 5) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:8.1f}ms {count / best:12.0f} resources/s")
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--resources", type=int, default=20000)
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "terraform.tfstate")
+        with open(state_file, "w") as f:
+            json.dump(_state(args.resources), f)
+        parser._parse_terraform_state(state_file)
+        names = [f"resource_{i}" for i in range(args.resources)]
+        buckets = args.resources // 2
+
+        def by_hand():
+            results = {}
+            for name in names:
+                resource = parser.get_resource(name, None, state_file)
+                if resource["type"] == "google_storage_bucket":
+                    results[name] = _parse_and_get(resource["attributes"], PATH)
+            return results
+
+        print(f"{args.resources} resources, {buckets} buckets, path {PATH}")
+        _timed("parse path per resource", buckets, by_hand)
+        _timed(
+            "select",
+            buckets,
+            lambda: select("google_storage_bucket", PATH, state_file=state_file),
+        )
+        assert len(select("google_storage_bucket", PATH, state_file=state_file)) == (
+            len(by_hand())
+        )
+
+
+if __name__ == "__main__":
+    main()
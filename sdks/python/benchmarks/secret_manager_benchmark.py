@@ -0,0 +1,70 @@
+"""Compares serial and batched secret access against a latency-injecting fake.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.secret_manager_benchmark --secrets 40 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from terrabridge.gcp import secret_manager
+from terrabridge.gcp.secret_manager import (
+    SecretManagerSecret,
+    afetch_secrets,
+    fetch_secrets,
+)
+
+
+class FakeClient:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def access_secret_version(self, name: str):
+        time.sleep(self.latency)
+        return SimpleNamespace(payload=SimpleNamespace(data=name.encode()))
+
+
+class FakeAsyncClient:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def access_secret_version(self, name: str):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(payload=SimpleNamespace(data=name.encode()))
+
+
+def _timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    print(f"{label:<16} {time.perf_counter() - start:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--secrets", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--state-file", default="tests/data/terraform.tfstate")
+    args = parser.parse_args()
+
+    secrets = [
+        SecretManagerSecret("secret", state_file=args.state_file)
+        for _ in range(args.secrets)
+    ]
+    client = FakeClient(args.latency)
+    async_client = FakeAsyncClient(args.latency)
+    secret_manager._get_client = lambda: client
+    secret_manager._get_async_client = lambda: async_client
+
+    async def run_async():
+        await afetch_secrets(secrets)
+
+    print(f"{args.secrets} secrets, {args.latency * 1000:.0f}ms per request")
+    _timed("serial", lambda: [secret.version() for secret in secrets])
+    _timed("fetch_secrets", lambda: fetch_secrets(secrets))
+    _timed("afetch_secrets", lambda: asyncio.run(run_async()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Compares one-message-at-a-time SQS and SNS calls with the batched helpers.
+
+A minimal in-memory SQS speaking the JSON protocol stands in for SQS, and a
+local moto server stands in for SNS. Clients talk to both over HTTP, so request
+signing, serialization and connection reuse are included, and every request
+sleeps for ``--latency`` seconds to stand in for the network round trip.
+moto's own SQS is not used because its cost per request grows with the number
+of messages in the queue. Requires ``moto[server]``.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.sqs_benchmark --messages 2000 --latency 0.02
+"""
+import argparse
+import collections
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from moto.server import ThreadedMotoServer
+
+from terrabridge.aws import SNSTopic, SQSQueue
+
+
+class FakeSQS:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.visible = collections.deque()
+        self.in_flight = {}
+
+    def _send(self, body: str) -> dict:
+        message = {
+            "MessageId": str(uuid.uuid4()),
+            "Body": body,
+            "MD5OfBody": hashlib.md5(body.encode()).hexdigest(),
+        }
+        with self.lock:
+            self.visible.append(message)
+        return message
+
+    def SendMessage(self, request):
+        message = self._send(request["MessageBody"])
+        return {
+            "MessageId": message["MessageId"],
+            "MD5OfMessageBody": message["MD5OfBody"],
+        }
+
+    def SendMessageBatch(self, request):
+        successful = []
+        for entry in request["Entries"]:
+            message = self._send(entry["MessageBody"])
+            successful.append(
+                {
+                    "Id": entry["Id"],
+                    "MessageId": message["MessageId"],
+                    "MD5OfMessageBody": message["MD5OfBody"],
+                }
+            )
+        return {"Successful": successful, "Failed": []}
+
+    def ReceiveMessage(self, request):
+        messages = []
+        with self.lock:
+            while self.visible and len(messages) < request.get(
+                "MaxNumberOfMessages", 1
+            ):
+                message = dict(self.visible.popleft(), ReceiptHandle=str(uuid.uuid4()))
+                self.in_flight[message["ReceiptHandle"]] = message
+                messages.append(message)
+        return {"Messages": messages}
+
+    def DeleteMessage(self, request):
+        with self.lock:
+            self.in_flight.pop(request["ReceiptHandle"], None)
+        return {}
+
+    def DeleteMessageBatch(self, request):
+        with self.lock:
+            for entry in request["Entries"]:
+                self.in_flight.pop(entry["ReceiptHandle"], None)
+        return {"Successful": [{"Id": entry["Id"]} for entry in request["Entries"]]}
+
+
+def serve_sqs() -> tuple:
+    sqs = FakeSQS()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            operation = self.headers["X-Amz-Target"].split(".")[-1]
+            body = json.dumps(getattr(sqs, operation)(request)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-amz-json-1.0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://localhost:{server.server_address[1]}"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count / elapsed:8.0f} messages/s")
+
+
+def _drain(queue: SQSQueue) -> None:
+    for messages in queue.receive_batches(wait_time_seconds=0, stop_when_empty=True):
+        queue.delete_many(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--state-file", default="tests/data/aws.tfstate")
+    args = parser.parse_args()
+
+    sqs_server, sqs_url = serve_sqs()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    port = _free_port()
+    sns_server = ThreadedMotoServer(ip_address="localhost", port=port, verbose=False)
+    sns_server.start()
+    os.environ["AWS_ENDPOINT_URL_SQS"] = sqs_url
+    os.environ["AWS_ENDPOINT_URL_SNS"] = f"http://localhost:{port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    queue = SQSQueue("queue", state_file=args.state_file)
+    topic = SNSTopic("topic", state_file=args.state_file)
+    topic.client().create_topic(Name=topic.name)
+    for client in (queue.client(), topic.client()):
+        client.meta.events.register(
+            "before-send", lambda **kwargs: time.sleep(args.latency)
+        )
+    bodies = [f"message {i}" for i in range(args.messages)]
+    serial = bodies[: max(1, args.messages // 10)]
+    print(f"{args.messages} messages, {args.latency * 1000:.0f}ms per request")
+
+    def send_serial():
+        for body in serial:
+            queue.send(body)
+
+    def receive_serial():
+        for _ in serial:
+            (message,) = queue.receive()
+            queue.delete(message["ReceiptHandle"])
+
+    _timed("serial send", len(serial), send_serial)
+    _timed("serial receive + delete", len(serial), receive_serial)
+    _timed("send_many", args.messages, lambda: queue.send_many(bodies))
+    _timed("receive_batches + delete", args.messages, lambda: _drain(queue))
+
+    queue.send_many(bodies)
+    _timed(
+        "consume(pollers=4)",
+        args.messages,
+        lambda: queue.consume(
+            lambda message: None, wait_time_seconds=0, stop_when_empty=True
+        ),
+    )
+
+    def publish_serial():
+        for body in serial:
+            topic.publish(body)
+
+    _timed("serial publish", len(serial), publish_serial)
+    _timed("publish_batch", args.messages, lambda: topic.publish_batch(bodies))
+    sns_server.stop()
+    sqs_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Compares full state downloads with compressed and conditional fetches.
+
+A local moto server stands in for S3. Every S3 request sleeps for ``--latency``
+seconds to stand in for the network round trip, and downloads are slowed to
+``--bandwidth-mb`` MB/s.
+
+Run from ``sdks/python``::
+
+    python -m benchmarks.state_fetch_benchmark --resources 20000 --latency 0.02 --bandwidth-mb 100
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import socket
+import time
+
+import fsspec
+import s3fs
+from moto.server import ThreadedMotoServer
+
+from terrabridge import parser, sources
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _state(resources: int) -> bytes:
+    return json.dumps(
+        {
+            "version": 4,
+            "resources": [
+                {
+                    "mode": "managed",
+                    "type": "google_storage_bucket",
+                    "name": f"bucket_{i}",
+                    "instances": [
+                        {
+                            "attributes": {
+                                "id": f"bucket-{i}",
+                                "name": f"bucket-{i}",
+                                "project": "project",
+                                "url": f"gs://bucket-{i}",
+                                "labels": {f"label_{j}": "value" for j in range(20)},
+                            }
+                        }
+                    ],
+                }
+                for i in range(resources)
+            ],
+        }
+    ).encode()
+
+
+def _timed(label: str, fn, repeat: int = 3) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        parser.tf_state_cache.clear()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {best * 1000:8.0f}ms")
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--resources", type=int, default=20000)
+    argparser.add_argument("--latency", type=float, default=0.02)
+    argparser.add_argument("--bandwidth-mb", type=float, default=100)
+    args = argparser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    port = _free_port()
+    server = ThreadedMotoServer(ip_address="localhost", port=port, verbose=False)
+    server.start()
+    fsspec.config.conf["s3"] = {
+        "endpoint_url": f"http://localhost:{port}",
+        "key": "testing",
+        "secret": "testing",
+    }
+    call_s3 = s3fs.S3FileSystem._call_s3
+    requests = 0
+
+    latency = args.latency
+    bandwidth = args.bandwidth_mb * 2**20
+
+    async def slow_call_s3(self, method, *akwarglist, **kwargs):
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(latency)
+        response = await call_s3(self, method, *akwarglist, **kwargs)
+        if method == "get_object":
+            await asyncio.sleep(response["ContentLength"] / bandwidth)
+        return response
+
+    s3fs.S3FileSystem._call_s3 = slow_call_s3
+
+    fs = sources._s3_filesystem()
+    fs.mkdir("states")
+    data = _state(args.resources)
+    fs.pipe_file("states/terraform.tfstate", data)
+    fs.pipe_file("states/terraform.tfstate.gz", gzip.compress(data))
+    print(
+        f"{args.resources} resources, {len(data) / 2**20:.1f}MB state "
+        f"({len(gzip.compress(data)) / 2**20:.1f}MB gzipped), "
+        f"{args.latency * 1000:.0f}ms per request, {args.bandwidth_mb:.0f}MB/s"
+    )
+
+    def old():
+        fs.invalidate_cache()
+        path = "s3://states/terraform.tfstate"
+        with fs.open(path) as f:
+            parser._load_state(path, f.read(), None)
+
+    def counted(label, fn, repeat=3):
+        nonlocal requests
+        requests = 0
+        _timed(label, fn, repeat)
+        print(f"{'':<36} {requests // repeat:8d} requests")
+
+    counted("fs.open + read (before)", old)
+    counted(
+        "whole-object read",
+        lambda: parser._parse_terraform_state("s3://states/terraform.tfstate"),
+    )
+    counted(
+        "whole-object read, gzip",
+        lambda: parser._parse_terraform_state("s3://states/terraform.tfstate.gz"),
+    )
+
+    parser.refresh_state("s3://states/terraform.tfstate")
+    requests = 0
+    start = time.perf_counter()
+    assert not parser.refresh_state("s3://states/terraform.tfstate")
+    elapsed = time.perf_counter() - start
+    print(f"{'refresh_state, unchanged':<36} {elapsed * 1000:8.0f}ms")
+    print(f"{'':<36} {requests:8d} requests")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
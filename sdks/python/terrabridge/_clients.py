@@ -0,0 +1,101 @@
+"""Process wide client caches shared by the GCP and AWS resources."""
+import atexit
+import os
+import threading
+from typing import Any, Callable, Hashable, Iterable
+
+
+def freeze(value: Any) -> Hashable:
+    """Turns client options into a hashable cache key, comparing them by value.
+
+    Raises:
+        TypeError: If an option can neither be hashed nor frozen by value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable option objects are compared by value. Their ids could be
+        # reused by another object once they are garbage collected.
+        if hasattr(value, "__dict__"):
+            return (type(value), freeze(vars(value)))
+        raise TypeError(
+            f"Client options must be hashable, got {type(value).__name__}."
+        ) from None
+    return value
+
+
+def close_all(clients: Iterable[Any], close: Callable[[Any], None]) -> None:
+    """Closes every client even if some fail, raising the first error at the end."""
+    errors = []
+    for client in clients:
+        try:
+            close(client)
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+class ProcessCache:
+    """Base class of the caches holding clients for the current process.
+
+    Clients must never be shared across processes: a child process drops the
+    clients inherited from its parent and creates new ones on first use.
+    Subclasses create their empty client containers in :meth:`_clear` and call
+    :meth:`_check_pid` before using them.
+
+    Attributes:
+        pid (int): The id of the process the clients were created in.
+    """
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        # Factories may get other clients from the cache, so the lock is
+        # reentrant.
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+    def _check_pid(self) -> None:
+        if self.pid != os.getpid():
+            self._reset()
+
+    def _reset(self) -> None:
+        # Inherited clients share sockets and threads with the parent, closing
+        # them here could break the parent, so they are dropped instead. The
+        # lock may have been held by another thread at fork time.
+        self.pid = os.getpid()
+        self._lock = threading.RLock()
+        self._clear()
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def register(cache: ProcessCache) -> None:
+    """Closes a process wide cache at exit and resets it in forked children."""
+
+    def close_at_exit() -> None:
+        try:
+            cache.close()
+        except Exception:
+            # The interpreter is shutting down, there is nothing left to recover.
+            pass
+
+    atexit.register(close_at_exit)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: cache._reset())
@@ -0,0 +1,8 @@
+# ruff: noqa
+from .batching import BatchError
+from .clients import ClientCache, close_clients, set_max_pool_connections
+from .dynamodb import DynamoDBTable
+from .s3_bucket import S3Bucket
+from .secrets_manager import SecretsManagerSecret
+from .sns import SNSTopic
+from .sqs import SQSQueue
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from terrabridge.base import Resource
+
+
+class AWSResource(Resource):
+    """Base class for all AWS resources.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the resource.
+        region (str): The region the resource belongs to. Read from the state if
+            available, otherwise from the ARN. None if neither has one, in which
+            case clients use the default region.
+    """
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.id: str = self._attributes["id"]
+        self.arn: Optional[str] = self._attributes.get("arn")
+        self.region: Optional[str] = self._attributes.get("region") or None
+        if self.region is None and self.arn:
+            # arn:partition:service:region:account-id:resource
+            self.region = self.arn.split(":")[3] or None
@@ -0,0 +1,123 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Limits shared by the SQS and SNS batch APIs.
+MAX_BATCH_MESSAGES = 10
+MAX_BATCH_BYTES = 256 * 1024
+
+_RETRY_INITIAL = 0.1
+_RETRY_MAXIMUM = 10.0
+
+
+class BatchError(Exception):
+    """Raised when some entries of a batch request failed.
+
+    Every batch is attempted before the error is raised, so the entries that
+    are not in ``failed`` succeeded.
+
+    Attributes:
+        failed (List[Dict[str, Any]]): The ``Failed`` responses of the entries
+            that did not succeed, with ``Id`` set to the entry's index in the
+            request.
+    """
+
+    def __init__(self, failed: List[Dict[str, Any]]) -> None:
+        self.failed = failed
+        first = failed[0]
+        super().__init__(
+            f"{len(failed)} batch entries failed, first failure: entry "
+            f"{first['Id']}: {first.get('Code')}: {first.get('Message')}"
+        )
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter keeps concurrent senders from retrying in lock step.
+    return random.uniform(0, min(_RETRY_MAXIMUM, _RETRY_INITIAL * 2**attempt))
+
+
+def _entry_size(entry: Dict[str, Any], body_key: str) -> int:
+    size = len(entry[body_key].encode("utf-8"))
+    size += len(entry.get("Subject", "").encode("utf-8"))
+    for name, value in entry.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8")) + len(value["DataType"].encode("utf-8"))
+        size += len(value.get("StringValue", "").encode("utf-8"))
+        size += len(value.get("BinaryValue", b""))
+    return size
+
+
+def _pack(
+    entries: Sequence[Dict[str, Any]],
+    body_key: str,
+    max_messages: int = MAX_BATCH_MESSAGES,
+    max_bytes: int = MAX_BATCH_BYTES,
+) -> Iterator[List[int]]:
+    """Packs entries into batches, yielding the indexes of each batch."""
+    batch: List[int] = []
+    batch_bytes = 0
+    for i, entry in enumerate(entries):
+        size = _entry_size(entry, body_key)
+        if size > max_bytes:
+            raise ValueError(
+                f"Entry {i} is {size} bytes, larger than the {max_bytes} byte limit."
+            )
+        if batch and (len(batch) == max_messages or batch_bytes + size > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(i)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def _run_batches(
+    call: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+    entries: Sequence[Dict[str, Any]],
+    batches: List[List[int]],
+    *,
+    max_concurrency: int,
+    retries: int,
+) -> List[Optional[Dict[str, Any]]]:
+    """Sends batches concurrently and returns the successful entry per index.
+
+    Entries that failed on the server are retried with backoff, entries the
+    server rejected as the sender's fault are not. Every batch is attempted,
+    then the first request error or a :class:`BatchError` is raised.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    failed: List[Dict[str, Any]] = []
+
+    def run(batch: List[int]) -> Optional[Exception]:
+        pending = batch
+        for attempt in range(retries + 1):
+            try:
+                response = call([dict(entries[i], Id=str(i)) for i in pending])
+            except Exception as e:
+                return e
+            for success in response.get("Successful", []):
+                results[int(success["Id"])] = success
+            pending = []
+            for failure in response.get("Failed", []):
+                if failure.get("SenderFault") or attempt == retries:
+                    failed.append(failure)
+                else:
+                    pending.append(int(failure["Id"]))
+            if not pending:
+                return None
+            time.sleep(_backoff(attempt))
+        return None
+
+    if len(batches) <= 1 or max_concurrency <= 1:
+        errors = [run(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(batches))
+        ) as executor:
+            errors = list(executor.map(run, batches))
+    for error in errors:
+        if error is not None:
+            raise error
+    if failed:
+        raise BatchError(sorted(failed, key=lambda failure: int(failure["Id"])))
+    return results
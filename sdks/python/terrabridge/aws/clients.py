@@ -0,0 +1,169 @@
+from typing import Any, Dict, Hashable, Optional
+
+from terrabridge._clients import ProcessCache, close_all, freeze, register
+
+try:
+    import boto3
+    from botocore.config import Config
+except ImportError:
+    boto3 = None
+    Config = None
+
+# botocore defaults to 10 connections per client, which is exhausted as soon as
+# a thread pool fans out requests to the same service.
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+
+
+def _check_installed():
+    if boto3 is None:
+        raise ImportError(
+            "boto3 is not installed. "
+            "Please install it with `pip install terrabridge[aws]`."
+        )
+
+
+class ClientCache(ProcessCache):
+    """Shares boto3 clients across all resources in the process.
+
+    Creating a boto3 client loads and parses the service model and builds a new
+    connection pool, which costs far more than most API calls. Clients are
+    thread safe, so one client is kept per service, region, profile and config,
+    and every resource using it shares its connection pool. Sessions are not
+    thread safe, so clients are created under a lock.
+
+    The cache is fork safe: a child process never reuses a client inherited from
+    its parent, new clients are created on first use after ``os.fork()``.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws.clients import ClientCache
+
+        with ClientCache(max_pool_connections=100) as cache:
+            s3 = cache.get("s3", region_name="us-east-1")
+
+    Attributes:
+        max_pool_connections (int): The size of the connection pool of new
+            clients.
+        pid (int): The id of the process the clients were created in.
+    """
+
+    def __init__(self, max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS):
+        self.max_pool_connections = max_pool_connections
+        super().__init__()
+
+    def _clear(self) -> None:
+        self._sessions: Dict[Optional[str], Any] = {}
+        self._clients: Dict[Hashable, Any] = {}
+
+    def session(self, profile_name: Optional[str] = None):
+        """Returns the shared boto3 session of a profile.
+
+        Parameters:
+            profile_name: The AWS profile, defaults to the default credential
+                chain.
+
+        Returns:
+            The shared ``boto3.session.Session``.
+        """
+        _check_installed()
+        self._check_pid()
+        with self._lock:
+            session = self._sessions.get(profile_name)
+            if session is None:
+                session = boto3.session.Session(profile_name=profile_name)
+                self._sessions[profile_name] = session
+            return session
+
+    def get(
+        self,
+        service: str,
+        region_name: Optional[str] = None,
+        *,
+        profile_name: Optional[str] = None,
+        **config,
+    ):
+        """Returns the shared client for a service, creating it if needed.
+
+        Parameters:
+            service: The boto3 service name, for example ``"s3"``.
+            region_name: The region of the client, defaults to the session's
+                region.
+            profile_name: The AWS profile, defaults to the default credential
+                chain.
+            **config: Options of ``botocore.config.Config`` overriding the
+                defaults, clients with different options are not shared.
+
+        Returns:
+            The shared client.
+        """
+        self._check_pid()
+        key = (service, region_name, profile_name, freeze(config))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.session(profile_name).client(
+                        service,
+                        region_name=region_name,
+                        config=Config(
+                            **{
+                                "max_pool_connections": self.max_pool_connections,
+                                "tcp_keepalive": True,
+                                "retries": {"mode": "standard"},
+                                **config,
+                            }
+                        ),
+                    )
+                    self._clients[key] = client
+        return client
+
+    def close(self) -> None:
+        """Closes all clients and removes them from the cache.
+
+        Every client is closed even if some fail, the first error is raised at
+        the end.
+        """
+        self._check_pid()
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clear()
+        close_all(reversed(clients), lambda client: client.close())
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+cache = ClientCache()
+"""The cache shared by all terrabridge AWS resources."""
+
+
+def get_client(service: str, region_name: Optional[str] = None, **config):
+    """Returns a client from the default cache, see :meth:`ClientCache.get`."""
+    return cache.get(service, region_name, **config)
+
+
+def set_max_pool_connections(size: int) -> None:
+    """Sets the connection pool size of the shared boto3 clients.
+
+    Only clients created afterwards use the new size, call it before the first
+    resource is used or follow it with :func:`close_clients`.
+
+    Parameters:
+        size: The maximum number of connections each client keeps open.
+    """
+    cache.max_pool_connections = size
+
+
+def close_clients() -> None:
+    """Closes all clients in the default cache.
+
+    Resources create new clients the next time they are used, so this is safe to
+    call at any point.
+    """
+    cache.close()
+
+
+register(cache)
@@ -0,0 +1,482 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from terrabridge.aws.base import AWSResource
+from terrabridge.aws.batching import BatchError, _backoff
+from terrabridge.aws.clients import _check_installed, get_client
+
+try:
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+except ImportError:
+    TypeDeserializer = TypeSerializer = None
+
+_serializer = TypeSerializer() if TypeSerializer is not None else None
+_deserializer = TypeDeserializer() if TypeDeserializer is not None else None
+
+
+def _serialize(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _deserialize(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
+
+# The limits of BatchGetItem and BatchWriteItem.
+_MAX_BATCH_GET = 100
+_MAX_BATCH_WRITE = 25
+
+_DONE = object()
+
+
+def _chunks(values: List[Any], size: int) -> List[List[Any]]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def _run_chunks(fn, chunks: List[Any], max_concurrency: int) -> list:
+    if len(chunks) <= 1 or max_concurrency <= 1:
+        return [fn(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+        return list(executor.map(fn, chunks))
+
+
+class DynamoDBTable(AWSResource):
+    """Represents a DynamoDB Table
+
+    Parsed from the terraform resource: ``aws_dynamodb_table``. For all
+    available attributes, see the `Terraform documentation <https://registry.terraform.io/providers/hashicorp/aws/latest/docs/resources/dynamodb_table>`_.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Items are plain python dictionaries, they are converted to and from the
+    DynamoDB wire format with the boto3 type serializers.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws import DynamoDBTable
+
+        table = DynamoDBTable("table", state_file="s3://my-bucket/terraform.tfstate")
+        print(table.name)
+
+        table.put_item({"id": "1", "count": 2})
+        print(table.get_item({"id": "1"}))
+
+        table.batch_write([{"id": str(i)} for i in range(1000)])
+        items = table.batch_get([{"id": str(i)} for i in range(1000)])
+        for item in table.scan(segments=8):
+            print(item)
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the table.
+        region (str): The region the table belongs to.
+        name (str): The name of the table.
+        hash_key (str): The attribute name of the table's partition key.
+        range_key (str): The attribute name of the table's sort key, None if the
+            table has none.
+    """
+
+    _terraform_type = "aws_dynamodb_table"
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.name: str = self._attributes["name"]
+        self.hash_key: str = self._attributes["hash_key"]
+        self.range_key: Optional[str] = self._attributes.get("range_key") or None
+
+    def client(self):
+        """Returns the shared DynamoDB client for the table's region.
+
+        Requires ``terrabridge[aws]`` to be installed.
+        """
+        return get_client("dynamodb", self.region)
+
+    def get_item(
+        self, key: Dict[str, Any], consistent_read: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Reads an item from the table.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            key: The primary key of the item.
+            consistent_read: Whether to use a strongly consistent read.
+
+        Returns:
+            The item, or None if the table has no item with the key.
+        """
+        _check_installed()
+        response = self.client().get_item(
+            TableName=self.name, Key=_serialize(key), ConsistentRead=consistent_read
+        )
+        item = response.get("Item")
+        return None if item is None else _deserialize(item)
+
+    def put_item(self, item: Dict[str, Any], **kwargs) -> None:
+        """Writes an item to the table, replacing any item with the same key.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            item: The item to write, it must include the primary key.
+            kwargs: Additional arguments passed to ``put_item``, for example
+                ``ConditionExpression``.
+        """
+        _check_installed()
+        self.client().put_item(TableName=self.name, Item=_serialize(item), **kwargs)
+
+    def _key_attributes(self) -> Tuple[str, ...]:
+        if self.range_key is None:
+            return (self.hash_key,)
+        return (self.hash_key, self.range_key)
+
+    def _key_id(self, item: Dict[str, Any]) -> Hashable:
+        # Keys are compared as deserialized values, so 1 and 1.0 are equal.
+        return tuple(
+            _deserializer.deserialize(item[name]) for name in self._key_attributes()
+        )
+
+    def _expression_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if "ExpressionAttributeValues" in kwargs:
+            kwargs["ExpressionAttributeValues"] = _serialize(
+                kwargs["ExpressionAttributeValues"]
+            )
+        return kwargs
+
+    def batch_get(
+        self,
+        keys: Iterable[Dict[str, Any]],
+        *,
+        consistent_read: bool = False,
+        max_concurrency: int = 8,
+        retries: int = 8,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Reads many items with as few requests as possible.
+
+        Keys are deduplicated and split into requests of 100 keys, the limit of
+        ``batch_get_item``, which are sent concurrently. Keys the service did not
+        process, for example because of throttling or the 16MB response limit,
+        are requested again with jittered backoff.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            keys: The primary keys of the items.
+            consistent_read: Whether to use strongly consistent reads.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry unprocessed keys.
+
+        Returns:
+            The items in the same order as ``keys``, None for keys the table has
+            no item for.
+
+        Raises:
+            BatchError: If some keys were still unprocessed after ``retries``
+                retries.
+        """
+        _check_installed()
+        client = self.client()
+        keys = [_serialize(key) for key in keys]
+        unique: Dict[Hashable, Dict[str, Any]] = {}
+        for key in keys:
+            unique.setdefault(self._key_id(key), key)
+        found: Dict[Hashable, Dict[str, Any]] = {}
+        unprocessed: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+
+        def get(chunk: List[Dict[str, Any]]) -> None:
+            for attempt in range(retries + 1):
+                response = client.batch_get_item(
+                    RequestItems={
+                        self.name: {"Keys": chunk, "ConsistentRead": consistent_read}
+                    }
+                )
+                items = response.get("Responses", {}).get(self.name, [])
+                with lock:
+                    for item in items:
+                        found[self._key_id(item)] = item
+                chunk = (
+                    response.get("UnprocessedKeys", {}).get(self.name, {}).get("Keys")
+                )
+                if not chunk:
+                    return
+                if attempt < retries:
+                    time.sleep(_backoff(attempt))
+            with lock:
+                unprocessed.extend(chunk)
+
+        _run_chunks(
+            get, _chunks(list(unique.values()), _MAX_BATCH_GET), max_concurrency
+        )
+        if unprocessed:
+            ids = {self._key_id(key) for key in unprocessed}
+            raise BatchError(
+                [
+                    {"Id": str(i), "Code": "UnprocessedKeys", "Message": str(key)}
+                    for i, key in enumerate(keys)
+                    if self._key_id(key) in ids
+                ]
+            )
+        items = [found.get(self._key_id(key)) for key in keys]
+        return [None if item is None else _deserialize(item) for item in items]
+
+    def batch_write(
+        self,
+        items: Iterable[Dict[str, Any]] = (),
+        *,
+        deletes: Iterable[Dict[str, Any]] = (),
+        max_concurrency: int = 8,
+        retries: int = 8,
+    ) -> None:
+        """Writes and deletes many items with as few requests as possible.
+
+        Requests are split into batches of 25, the limit of
+        ``batch_write_item``, which are sent concurrently. Items the service did
+        not process are written again with jittered backoff. A batch may not
+        contain the same key twice and concurrent batches have no order, so
+        only the last write or delete of each key is sent, which leaves the
+        table as if they had been applied in order.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            table.batch_write(
+                [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}],
+                deletes=[{"id": "3"}],
+            )
+
+        Parameters:
+            items: The items to write, replacing any items with the same keys.
+            deletes: The primary keys of the items to delete. Deletes are
+                applied after the writes.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry unprocessed items.
+
+        Raises:
+            BatchError: If some items were still unprocessed after ``retries``
+                retries. The ``Id`` of each failure is the index of its item in
+                ``items``, or of its key in ``deletes`` plus the number of
+                items.
+        """
+        _check_installed()
+        client = self.client()
+        requests: Dict[Hashable, Dict[str, Any]] = {}
+        # The index of the request sent for each key, counting the items and
+        # then the deletes.
+        indexes: Dict[Hashable, int] = {}
+        index = -1
+        for index, item in enumerate(items):
+            item = _serialize(item)
+            key_id = self._key_id(item)
+            requests[key_id] = {"PutRequest": {"Item": item}}
+            indexes[key_id] = index
+        for index, key in enumerate(deletes, start=index + 1):
+            key = _serialize(key)
+            key_id = self._key_id(key)
+            requests[key_id] = {"DeleteRequest": {"Key": key}}
+            indexes[key_id] = index
+        unprocessed: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+
+        def write(chunk: List[Dict[str, Any]]) -> None:
+            for attempt in range(retries + 1):
+                response = client.batch_write_item(RequestItems={self.name: chunk})
+                chunk = response.get("UnprocessedItems", {}).get(self.name)
+                if not chunk:
+                    return
+                if attempt < retries:
+                    time.sleep(_backoff(attempt))
+            with lock:
+                unprocessed.extend(chunk)
+
+        _run_chunks(
+            write, _chunks(list(requests.values()), _MAX_BATCH_WRITE), max_concurrency
+        )
+        if unprocessed:
+            failed = []
+            for request in unprocessed:
+                if "PutRequest" in request:
+                    key_id = self._key_id(request["PutRequest"]["Item"])
+                else:
+                    key_id = self._key_id(request["DeleteRequest"]["Key"])
+                failed.append(
+                    {
+                        "Id": str(indexes[key_id]),
+                        "Code": "UnprocessedItems",
+                        "Message": str(request),
+                    }
+                )
+            raise BatchError(sorted(failed, key=lambda failure: int(failure["Id"])))
+
+    def _scan_pages(
+        self, segment: int, segments: int, kwargs: Dict[str, Any]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        client = self.client()
+        request = dict(kwargs, TableName=self.name)
+        if segments > 1:
+            request.update(Segment=segment, TotalSegments=segments)
+        while True:
+            response = client.scan(**request)
+            yield response.get("Items", [])
+            if "LastEvaluatedKey" not in response:
+                return
+            request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def scan(
+        self, *, segments: int = 1, max_buffered_pages: Optional[int] = None, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams all items of the table.
+
+        With ``segments`` greater than one the table is split into segments that
+        are scanned in parallel on a thread pool, which is how large tables are
+        read quickly. Pages are handed over through a bounded buffer, so memory
+        stays constant no matter the table size: scanning pauses while the
+        consumer falls behind. Items of different segments are interleaved.
+        Stopping iteration early stops the scan.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            for item in table.scan(
+                segments=8,
+                FilterExpression="age > :age",
+                ExpressionAttributeValues={":age": 21},
+            ):
+                print(item)
+
+        Parameters:
+            segments: The number of segments scanned in parallel.
+            max_buffered_pages: The maximum number of pages, of up to 1MB each,
+                fetched but not yet consumed. Defaults to twice ``segments``.
+            kwargs: Additional arguments passed to ``scan``, for example
+                ``FilterExpression``. ``ExpressionAttributeValues`` are given as
+                plain python values.
+
+        Yields:
+            The items of the table.
+        """
+        _check_installed()
+        kwargs = self._expression_kwargs(kwargs)
+        if segments <= 1:
+            for page in self._scan_pages(0, 1, kwargs):
+                for item in page:
+                    yield _deserialize(item)
+            return
+
+        pages: queue.Queue = queue.Queue(max_buffered_pages or 2 * segments)
+        stop = threading.Event()
+
+        def put(value) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def run(segment: int) -> None:
+            try:
+                for page in self._scan_pages(segment, segments, kwargs):
+                    if not put(page):
+                        return
+            except Exception as e:
+                put(e)
+            put(_DONE)
+
+        self.client()
+        executor = ThreadPoolExecutor(max_workers=segments)
+        try:
+            for segment in range(segments):
+                executor.submit(run, segment)
+            remaining = segments
+            while remaining:
+                page = pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in page:
+                        yield _deserialize(item)
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    async def ascan(
+        self, *, segments: int = 1, max_buffered_pages: Optional[int] = None, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streams all items of the table.
+
+        The asyncio version of :meth:`scan`. boto3 is synchronous, so requests
+        run on a thread pool with one thread per segment while the event loop
+        stays free.
+
+        Yields:
+            The items of the table.
+        """
+        _check_installed()
+        kwargs = self._expression_kwargs(kwargs)
+        loop = asyncio.get_running_loop()
+        pages: asyncio.Queue = asyncio.Queue(max_buffered_pages or 2 * segments)
+        executor = ThreadPoolExecutor(max_workers=segments)
+
+        async def run(segment: int) -> None:
+            try:
+                iterator = self._scan_pages(segment, segments, kwargs)
+                while True:
+                    page = await loop.run_in_executor(executor, next, iterator, _DONE)
+                    if page is _DONE:
+                        break
+                    await pages.put(page)
+            except Exception as e:
+                await pages.put(e)
+            await pages.put(_DONE)
+
+        self.client()
+        tasks = [asyncio.ensure_future(run(segment)) for segment in range(segments)]
+        try:
+            remaining = segments
+            while remaining:
+                page = await pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in page:
+                        yield _deserialize(item)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            executor.shutdown(wait=False)
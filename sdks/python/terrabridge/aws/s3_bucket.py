@@ -0,0 +1,80 @@
+from typing import Optional
+
+from terrabridge.aws.base import AWSResource
+from terrabridge.aws.clients import get_client
+
+
+class S3Bucket(AWSResource):
+    """Represents a S3 Bucket
+
+    Parsed from the terraform resource: ``aws_s3_bucket``. For all
+    available attributes, see the `Terraform documentation <https://registry.terraform.io/providers/hashicorp/aws/latest/docs/resources/s3_bucket>`_.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws import S3Bucket
+
+        bucket = S3Bucket("bucket", state_file="s3://my-bucket/terraform.tfstate")
+        print(bucket.bucket)
+
+        bucket.write("hello.txt", b"Hello, world!")
+        print(bucket.read("hello.txt"))
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the bucket.
+        region (str): The region the bucket belongs to.
+        bucket (str): The name of the bucket.
+        url (str): The url of the bucket (e.g. s3://BUCKET_NAME).
+    """
+
+    _terraform_type = "aws_s3_bucket"
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.bucket: str = self._attributes["bucket"]
+        self.url: str = f"s3://{self.bucket}"
+
+    def client(self):
+        """Returns the shared S3 client for the bucket's region.
+
+        Requires ``terrabridge[aws]`` to be installed.
+        """
+        return get_client("s3", self.region)
+
+    def read(self, key: str) -> bytes:
+        """Reads an object from the bucket.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            key: The key of the object in the bucket.
+
+        Returns:
+            The contents of the object.
+        """
+        return self.client().get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def write(self, key: str, data: bytes, **kwargs) -> None:
+        """Writes an object to the bucket.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            key: The key of the object in the bucket.
+            data: The contents of the object.
+            kwargs: Additional arguments passed to ``put_object``, for example
+                ``ContentType``.
+        """
+        self.client().put_object(Bucket=self.bucket, Key=key, Body=data, **kwargs)
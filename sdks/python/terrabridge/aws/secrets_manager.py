@@ -0,0 +1,69 @@
+from typing import Optional
+
+from terrabridge.aws.base import AWSResource
+from terrabridge.aws.clients import get_client
+
+
+class SecretsManagerSecret(AWSResource):
+    """Represents a Secrets Manager Secret
+
+    Parsed from the terraform resource: ``aws_secretsmanager_secret``. For all
+    available attributes, see the `Terraform documentation <https://registry.terraform.io/providers/hashicorp/aws/latest/docs/resources/secretsmanager_secret>`_.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws import SecretsManagerSecret
+
+        secret = SecretsManagerSecret("secret", state_file="s3://my-bucket/terraform.tfstate")
+        print(secret.name)
+
+        print(secret.version().decode("utf-8"))
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the secret.
+        region (str): The region the secret belongs to.
+        name (str): The name of the secret.
+    """
+
+    _terraform_type = "aws_secretsmanager_secret"
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.name: str = self._attributes["name"]
+
+    def client(self):
+        """Returns the shared Secrets Manager client for the secret's region.
+
+        Requires ``terrabridge[aws]`` to be installed.
+        """
+        return get_client("secretsmanager", self.region)
+
+    def version(self, version_stage: str = "AWSCURRENT") -> bytes:
+        """Fetches the secret value.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            version_stage: The staging label of the version to fetch.
+
+        Returns:
+            The secret value, string secrets are encoded as UTF-8.
+        """
+        response = self.client().get_secret_value(
+            SecretId=self.name, VersionStage=version_stage
+        )
+        if "SecretBinary" in response:
+            return response["SecretBinary"]
+        return response["SecretString"].encode("utf-8")
@@ -0,0 +1,119 @@
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from terrabridge.aws.base import AWSResource
+from terrabridge.aws.batching import _pack, _run_batches
+from terrabridge.aws.clients import get_client
+
+
+class SNSTopic(AWSResource):
+    """Represents a SNS Topic
+
+    Parsed from the terraform resource: ``aws_sns_topic``. For all
+    available attributes, see the `Terraform documentation <https://registry.terraform.io/providers/hashicorp/aws/latest/docs/resources/sns_topic>`_.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws import SNSTopic
+
+        topic = SNSTopic("topic", state_file="s3://my-bucket/terraform.tfstate")
+        print(topic.name)
+
+        topic.publish("Hello, world!")
+        topic.publish_batch(f"message {i}" for i in range(1000))
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the topic.
+        region (str): The region the topic belongs to.
+        name (str): The name of the topic.
+    """
+
+    _terraform_type = "aws_sns_topic"
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.name: str = self._attributes["name"]
+
+    def client(self):
+        """Returns the shared SNS client for the topic's region.
+
+        Requires ``terrabridge[aws]`` to be installed.
+        """
+        return get_client("sns", self.region)
+
+    def publish(self, message: str, subject: Optional[str] = None, **kwargs) -> str:
+        """Publishes a message to the topic.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            message: The message to publish.
+            subject: The subject of the message, used by email subscriptions.
+            kwargs: Additional arguments passed to ``publish``, for example
+                ``MessageAttributes``.
+
+        Returns:
+            The id of the message.
+        """
+        if subject is not None:
+            kwargs["Subject"] = subject
+        response = self.client().publish(TopicArn=self.arn, Message=message, **kwargs)
+        return response["MessageId"]
+
+    def publish_batch(
+        self,
+        messages: Iterable[Union[str, Dict[str, Any]]],
+        *,
+        max_concurrency: int = 8,
+        retries: int = 5,
+    ) -> List[str]:
+        """Publishes many messages to the topic with as few requests as possible.
+
+        Messages are packed into batches of up to 10 messages and 256KB, the
+        limits of ``publish_batch``, and the batches are sent concurrently.
+        Messages of FIFO topics are sent one batch at a time to keep their
+        order. Messages that failed on the server are retried. Every batch is
+        attempted, then the first error is raised.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            messages: The messages, or dicts of ``publish_batch`` entries such
+                as ``{"Message": "...", "Subject": "..."}`` without an ``Id``.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry a failed message.
+
+        Returns:
+            The ids of the messages, in the same order as ``messages``.
+
+        Raises:
+            BatchError: If some messages could not be published.
+        """
+        entries = [
+            {"Message": message} if isinstance(message, str) else message
+            for message in messages
+        ]
+        client = self.client()
+        if self.name.endswith(".fifo"):
+            max_concurrency = 1
+        results = _run_batches(
+            lambda batch: client.publish_batch(
+                TopicArn=self.arn, PublishBatchRequestEntries=batch
+            ),
+            entries,
+            list(_pack(entries, "Message")),
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+        return [result["MessageId"] for result in results]
@@ -0,0 +1,442 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from terrabridge.aws.base import AWSResource
+from terrabridge.aws.batching import (
+    MAX_BATCH_MESSAGES,
+    BatchError,
+    _pack,
+    _run_batches,
+)
+from terrabridge.aws.clients import get_client
+
+
+class _DeleteBuffer:
+    """Collects receipt handles of handled messages and deletes them in batches.
+
+    A batch is deleted once it is full or its oldest message has waited for
+    ``max_delay`` seconds, so a slow trickle of messages is still deleted well
+    within the visibility timeout. Batches are deleted on whichever thread
+    fills them, so failures are kept in ``errors`` for the consumer to raise
+    instead of being lost on that thread.
+    """
+
+    def __init__(self, queue: "SQSQueue", max_delay: float = 1.0) -> None:
+        self._queue = queue
+        self._max_delay = max_delay
+        self._lock = threading.Lock()
+        self._handles: List[str] = []
+        self._since = 0.0
+        self.deleted = 0
+        self.errors: List[Exception] = []
+
+    def add(self, receipt_handle: str) -> None:
+        with self._lock:
+            if not self._handles:
+                self._since = time.monotonic()
+            self._handles.append(receipt_handle)
+            if (
+                len(self._handles) < MAX_BATCH_MESSAGES
+                and time.monotonic() - self._since < self._max_delay
+            ):
+                return
+            handles, self._handles = self._handles, []
+        self._delete(handles)
+
+    def flush(self) -> None:
+        with self._lock:
+            handles, self._handles = self._handles, []
+        if handles:
+            self._delete(handles)
+
+    def _delete(self, handles: List[str]) -> None:
+        deleted = len(handles)
+        try:
+            self._queue.delete_many(handles)
+        except BatchError as e:
+            deleted -= len(e.failed)
+            error = e
+        except Exception as e:
+            deleted = 0
+            error = e
+        else:
+            error = None
+        with self._lock:
+            self.deleted += deleted
+            if error is not None:
+                self.errors.append(error)
+
+
+class SQSQueue(AWSResource):
+    """Represents a SQS Queue
+
+    Parsed from the terraform resource: ``aws_sqs_queue``. For all
+    available attributes, see the `Terraform documentation <https://registry.terraform.io/providers/hashicorp/aws/latest/docs/resources/sqs_queue>`_.
+
+    Some attributes are pulled up to be top-level attributes for convenience for type hints.
+    However all attributes that are available in the Terraform state file are available.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.aws import SQSQueue
+
+        queue = SQSQueue("queue", state_file="s3://my-bucket/terraform.tfstate")
+        print(queue.url)
+
+        queue.send("Hello, world!")
+        for message in queue.receive(max_messages=10, wait_time_seconds=20):
+            print(message["Body"])
+
+        queue.send_many(f"message {i}" for i in range(1000))
+        queue.consume(lambda message: print(message["Body"]), stop_when_empty=True)
+
+    Attributes:
+        id (str): The id of the resource.
+        arn (str): The ARN of the queue.
+        region (str): The region the queue belongs to.
+        name (str): The name of the queue.
+        url (str): The url of the queue.
+    """
+
+    _terraform_type = "aws_sqs_queue"
+
+    def __init__(
+        self,
+        resource_name: str,
+        *,
+        module_name: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ) -> None:
+        super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.name: str = self._attributes["name"]
+        self.url: str = self._attributes["url"]
+
+    def client(self):
+        """Returns the shared SQS client for the queue's region.
+
+        Requires ``terrabridge[aws]`` to be installed.
+        """
+        return get_client("sqs", self.region)
+
+    def send(self, body: str, **kwargs) -> str:
+        """Sends a message to the queue.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            body: The body of the message.
+            kwargs: Additional arguments passed to ``send_message``, for example
+                ``DelaySeconds`` or ``MessageAttributes``.
+
+        Returns:
+            The id of the message.
+        """
+        response = self.client().send_message(
+            QueueUrl=self.url, MessageBody=body, **kwargs
+        )
+        return response["MessageId"]
+
+    def receive(
+        self, max_messages: int = 1, wait_time_seconds: int = 0, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Receives messages from the queue.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            max_messages: The maximum number of messages to receive, at most 10.
+            wait_time_seconds: How long to wait for messages to arrive, at most
+                20. Waiting avoids paying for empty responses.
+            kwargs: Additional arguments passed to ``receive_message``.
+
+        Returns:
+            The messages received, possibly none.
+        """
+        response = self.client().receive_message(
+            QueueUrl=self.url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_time_seconds,
+            **kwargs,
+        )
+        return response.get("Messages", [])
+
+    def delete(self, receipt_handle: str) -> None:
+        """Deletes a received message from the queue.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            receipt_handle: The receipt handle of the message.
+        """
+        self.client().delete_message(QueueUrl=self.url, ReceiptHandle=receipt_handle)
+
+    def send_many(
+        self,
+        messages: Iterable[Union[str, Dict[str, Any]]],
+        *,
+        max_concurrency: int = 8,
+        retries: int = 5,
+    ) -> List[str]:
+        """Sends many messages to the queue with as few requests as possible.
+
+        Messages are packed into batches of up to 10 messages and 256KB, the
+        limits of ``send_message_batch``, and the batches are sent concurrently.
+        Messages of FIFO queues are sent one batch at a time to keep their
+        order. Messages that failed on the server are retried. Every batch is
+        attempted, then the first error is raised.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            messages: The message bodies, or dicts of ``send_message_batch``
+                entries such as ``{"MessageBody": "...", "DelaySeconds": 5}``
+                without an ``Id``.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry a failed message.
+
+        Returns:
+            The ids of the messages, in the same order as ``messages``.
+
+        Raises:
+            BatchError: If some messages could not be sent.
+        """
+        entries = [
+            {"MessageBody": message} if isinstance(message, str) else message
+            for message in messages
+        ]
+        client = self.client()
+        if self.url.endswith(".fifo"):
+            max_concurrency = 1
+        results = _run_batches(
+            lambda batch: client.send_message_batch(QueueUrl=self.url, Entries=batch),
+            entries,
+            list(_pack(entries, "MessageBody")),
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+        return [result["MessageId"] for result in results]
+
+    def receive_batches(
+        self,
+        *,
+        max_messages: int = MAX_BATCH_MESSAGES,
+        wait_time_seconds: int = 20,
+        stop_when_empty: bool = False,
+        **kwargs,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Long polls the queue, yielding each non-empty batch of messages.
+
+        Long polling waits up to ``wait_time_seconds`` for messages to arrive,
+        which avoids paying for empty responses and returns fuller batches.
+        Received messages must be deleted, for example with
+        :meth:`delete_many`, or they become visible again after the queue's
+        visibility timeout.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            for messages in queue.receive_batches(stop_when_empty=True):
+                process(messages)
+                queue.delete_many(messages)
+
+        Parameters:
+            max_messages: The maximum number of messages per batch, at most 10.
+            wait_time_seconds: How long each request waits for messages, at most
+                20.
+            stop_when_empty: Whether to stop once a request returns no messages.
+                Polls forever otherwise.
+            kwargs: Additional arguments passed to ``receive_message``, for
+                example ``VisibilityTimeout``.
+
+        Yields:
+            Batches of messages.
+        """
+        while True:
+            messages = self.receive(
+                max_messages=max_messages,
+                wait_time_seconds=wait_time_seconds,
+                **kwargs,
+            )
+            if messages:
+                yield messages
+            elif stop_when_empty:
+                return
+
+    def delete_many(
+        self,
+        messages: Iterable[Union[str, Dict[str, Any]]],
+        *,
+        max_concurrency: int = 8,
+        retries: int = 5,
+    ) -> None:
+        """Deletes many received messages with as few requests as possible.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Parameters:
+            messages: Receipt handles or the received messages.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry a failed deletion.
+
+        Raises:
+            BatchError: If some messages could not be deleted.
+        """
+        entries = [
+            {
+                "ReceiptHandle": (
+                    message if isinstance(message, str) else message["ReceiptHandle"]
+                )
+            }
+            for message in messages
+        ]
+        client = self.client()
+        _run_batches(
+            lambda batch: client.delete_message_batch(QueueUrl=self.url, Entries=batch),
+            entries,
+            list(_pack(entries, "ReceiptHandle")),
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+    def consume(
+        self,
+        handler: Callable[[Dict[str, Any]], Any],
+        *,
+        pollers: int = 4,
+        max_workers: int = 16,
+        max_in_flight: int = 100,
+        wait_time_seconds: int = 20,
+        stop: Optional[threading.Event] = None,
+        stop_when_empty: bool = False,
+        on_error: Optional[Callable[[Dict[str, Any], Exception], Any]] = None,
+        **kwargs,
+    ) -> int:
+        """Processes messages with concurrent pollers and a pool of workers.
+
+        ``pollers`` threads long poll the queue and hand messages to
+        ``max_workers`` threads calling ``handler``. Messages are deleted in
+        batches once their handler returns. If the handler raises, the message
+        is left on the queue and delivered again after its visibility timeout.
+        If messages cannot be deleted, consuming stops and the error is raised
+        once the messages already received are handled.
+
+        At most ``max_in_flight`` messages are received but not yet handled.
+        Pollers only ask for as many messages as there is room for, so a slow
+        handler slows down polling instead of letting received messages wait
+        in memory until their visibility timeout expires.
+
+        Requires ``terrabridge[aws]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            queue.consume(handle, stop=stop)
+
+        Parameters:
+            handler: Called with each received message.
+            pollers: The number of threads polling the queue.
+            max_workers: The number of threads calling ``handler``.
+            max_in_flight: The maximum number of messages received but not yet
+                handled.
+            wait_time_seconds: How long each poll waits for messages, at most
+                20. Also bounds how long stopping takes.
+            stop: Stops consuming when set. Messages already received are
+                handled before returning.
+            stop_when_empty: Whether each poller stops once a poll returns no
+                messages, for example to drain a queue.
+            on_error: Called with the message and the error when ``handler``
+                raises. If it raises too, consuming stops and its error is
+                raised once the messages already received are handled.
+            kwargs: Additional arguments passed to ``receive_message``, for
+                example ``VisibilityTimeout``.
+
+        Returns:
+            The number of messages handled successfully and deleted.
+
+        Raises:
+            BatchError: If some handled messages could not be deleted.
+            Exception: Whatever ``on_error`` raised, if it raised.
+        """
+        if stop is None:
+            stop = threading.Event()
+        capacity = threading.BoundedSemaphore(max_in_flight)
+        deletes = _DeleteBuffer(self)
+        failed = threading.Event()
+        # Errors raised by on_error, nothing reads the results of the workers.
+        errors: List[Exception] = []
+
+        def work(message: Dict[str, Any]) -> None:
+            try:
+                handler(message)
+            except Exception as e:
+                if on_error is not None:
+                    try:
+                        on_error(message, e)
+                    except Exception as error:
+                        errors.append(error)
+                        failed.set()
+                return
+            finally:
+                capacity.release()
+            deletes.add(message["ReceiptHandle"])
+
+        def poll(executor: ThreadPoolExecutor) -> None:
+            try:
+                _poll(executor)
+            except Exception:
+                # Stop the other pollers, the error is raised once they return.
+                failed.set()
+                raise
+
+        def _poll(executor: ThreadPoolExecutor) -> None:
+            while not stop.is_set() and not failed.is_set() and not deletes.errors:
+                # Wait for room for one message, then take what else is free.
+                if not capacity.acquire(timeout=1):
+                    continue
+                reserved = 1
+                while reserved < MAX_BATCH_MESSAGES and capacity.acquire(False):
+                    reserved += 1
+                try:
+                    deletes.flush()
+                    messages = self.receive(
+                        max_messages=reserved,
+                        wait_time_seconds=wait_time_seconds,
+                        **kwargs,
+                    )
+                except Exception:
+                    for _ in range(reserved):
+                        capacity.release()
+                    raise
+                for _ in range(reserved - len(messages)):
+                    capacity.release()
+                for message in messages:
+                    executor.submit(work, message)
+                if not messages and stop_when_empty:
+                    return
+
+        self.client()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            with ThreadPoolExecutor(max_workers=pollers) as poller_executor:
+                futures = [
+                    poller_executor.submit(poll, executor) for _ in range(pollers)
+                ]
+            # The workers finish before the executor exits, the remaining
+            # deletes are flushed after them.
+        deletes.flush()
+        for future in futures:
+            future.result()
+        if errors:
+            raise errors[0]
+        if deletes.errors:
+            raise deletes.errors[0]
+        return deletes.deleted
@@ -1,7 +1,29 @@
-from typing import Optional
+from typing import Any, Optional, Type, TypeVar
 
 import terrabridge
-from terrabridge.parser import get_resource
+from terrabridge import parser
+from terrabridge.graph import _address
+from terrabridge.parser import _ResourceKey, get_resource
+from terrabridge.query import compile_path
+
+
+def _rehydrate(
+    cls: type,
+    resource_name: str,
+    module_name: Optional[str],
+    state_file: str,
+    serial: Optional[int],
+) -> "Resource":
+    """Recreates a pickled resource from the state cached in this process."""
+    if state_file in parser.tf_state_cache and serial is not None:
+        cached = parser._state_serials.get(state_file)
+        # The state this process parsed is older than the sender's.
+        if cached is None or cached < serial:
+            parser.refresh_state(state_file)
+    return cls(resource_name, module_name=module_name, state_file=state_file)
+
+
+_R = TypeVar("_R", bound="Resource")
 
 
 class Resource:
@@ -20,9 +42,9 @@ class Resource:
                 "state_file must be specified if terrabridge.state_file is not set."
             )
         self.resource_name = resource_name
-        resource = get_resource(
-            resource_name, module_name, state_file or terrabridge.state_file
-        )
+        self._module_name = module_name
+        self._state_file = state_file or terrabridge.state_file
+        resource = get_resource(resource_name, module_name, self._state_file)
         if resource["type"] != self._terraform_type:
             raise ValueError(
                 f"Resource {resource_name} is of type {resource['type']}, "
@@ -42,5 +64,60 @@ class Resource:
                     f"Resource {self.resource_name} does not have attribute {name}"
                 )
 
+    def _dependency(self, cls: Type[_R]) -> Optional[_R]:
+        """Returns the resource of type ``cls`` this resource depends on, if any."""
+        graph = parser.dependency_graph(self._state_file)
+        address = _address(
+            _ResourceKey(self.resource_name, self._module_name), self._terraform_type
+        )
+        for dependency in graph.dependencies(address):
+            if graph.resource_type(dependency) == cls._terraform_type:
+                key = graph.resource_key(dependency)
+                return cls(
+                    key.resource_name,
+                    module_name=key.module_name,
+                    state_file=self._state_file,
+                )
+        return None
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """Reads a nested attribute.
+
+        Example
+        -------
+        .. code:: python
+
+            instance = CloudSQLInstance("db", state_file="terraform.tfstate")
+            instance.get("settings[0].ip_configuration[0].private_network")
+
+        Parameters:
+            path: The attribute path, for example
+                ``lifecycle_rule[*].action[0].type``, see
+                :func:`terrabridge.query.compile_path`.
+            default: Returned if the path does not exist.
+
+        Returns:
+            The value at the path. A list of every match if the path contains
+            ``[*]``.
+        """
+        return compile_path(path)(self._attributes, default)
+
+    def __reduce__(self):
+        # Pickled as a reference to the resource in its state, so sending a
+        # resource to another process copies neither its attributes nor its
+        # clients. The receiving process reads the resource from its own copy
+        # of the state, parsing it on first use, and creates clients when they
+        # are first needed.
+        return (
+            _rehydrate,
+            (
+                type(self),
+                self.resource_name,
+                self._module_name,
+                self._state_file,
+                parser._state_serials.get(self._state_file),
+            ),
+        )
+
     def __str__(self) -> str:
         return str(self._attributes)
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from terrabridge import parser
+from terrabridge.graph import DependencyGraph
+from terrabridge.parser import _ResourceKey
+
+MAGIC = b"TFBUNDLE"
+FORMAT_VERSION = 2
+# The magic, the format version and the length of the JSON header.
+_PREAMBLE = struct.Struct("<8sHI")
+
+
+def _read_state(path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    data, _ = parser._fetch_state(path)
+    tf_state = json.loads(data)
+    source = {
+        "path": path,
+        "lineage": tf_state.get("lineage"),
+        "serial": tf_state.get("serial"),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    return tf_state, source
+
+
+def _select(
+    states: Dict[str, Dict[_ResourceKey, Dict[str, Any]]],
+    state_files: Sequence[str],
+    manifest: Optional[Dict[str, Any]],
+) -> List[Tuple[int, _ResourceKey, Dict[str, Any]]]:
+    if manifest is None:
+        return [
+            (i, key, resource)
+            for i, path in enumerate(state_files)
+            for key, resource in states[path].items()
+        ]
+    selected = []
+    for entry in manifest["resources"]:
+        path = entry.get("state_file", state_files[0])
+        if path not in states:
+            raise ValueError(
+                f"Manifest entry {entry} uses state file {path}, which is not "
+                f"being compiled. Compiled state files: {list(state_files)}"
+            )
+        key = _ResourceKey(entry["name"], entry.get("module"))
+        resource = states[path].get(key)
+        if resource is None:
+            raise ValueError(f"Resource {key} not found in {path}.")
+        if "type" in entry and entry["type"] != resource["type"]:
+            raise ValueError(
+                f"Resource {key} is of type {resource['type']}, but the manifest "
+                f"expects {entry['type']}."
+            )
+        attributes = entry.get("attributes")
+        if attributes is not None:
+            missing = [
+                name for name in attributes if name not in resource["attributes"]
+            ]
+            if missing:
+                raise ValueError(f"Resource {key} has no attributes {missing}.")
+            resource = dict(
+                resource,
+                attributes={name: resource["attributes"][name] for name in attributes},
+            )
+        selected.append((state_files.index(path), key, resource))
+    return selected
+
+
+def compile_bundle(
+    state_files: Sequence[str],
+    output: str,
+    manifest: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Compiles state files into a bundle for deployment.
+
+    The bundle contains only the resources and attributes the manifest
+    declares, so the full state never ships with the application. Its header
+    records the lineage, serial and hash of every state it was compiled from,
+    see :func:`check_bundle`, and the type and dependencies of every resource,
+    so the dependency graph is built without decoding the resources.
+
+    The manifest is a dict, usually read from a JSON file, listing the
+    resources to include. ``state_file`` defaults to the first state file, all
+    attributes are included if ``attributes`` is omitted. The attributes a
+    resource class reads when it is created, such as ``id`` and ``project`` for
+    GCP resources, must be included:
+
+    .. code:: json
+
+        {
+            "resources": [
+                {"name": "bucket", "attributes": ["id", "project", "name", "url"]},
+                {"name": "queue", "module": "worker", "state_file": "gs://b/worker.tfstate"}
+            ]
+        }
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.bundle import compile_bundle
+
+        compile_bundle(["gs://my-bucket/terraform.tfstate"], "terraform.tfb")
+
+    Parameters:
+        state_files: The state files to compile.
+        output: The path the bundle is written to.
+        manifest: The resources to include, all resources of all state files if
+            None.
+
+    Returns:
+        The header of the bundle.
+    """
+    states = {}
+    sources = []
+    for path in state_files:
+        tf_state, source = _read_state(path)
+        states[path] = parser._index_state(tf_state)
+        sources.append(source)
+
+    body = bytearray()
+    resources = []
+    for source_index, key, resource in _select(states, state_files, manifest):
+        blob = json.dumps(resource, separators=(",", ":")).encode("utf-8")
+        resources.append(
+            [
+                source_index,
+                key.module_name,
+                key.resource_name,
+                resource["type"],
+                resource["dependencies"] or [],
+                len(body),
+                len(blob),
+            ]
+        )
+        body += blob
+    header = {"sources": sources, "resources": resources}
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    # Written to a temporary file first, so a running application never maps a
+    # partially written bundle.
+    tmp = f"{output}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(body)
+    os.replace(tmp, output)
+    return header
+
+
+class _BundleState(Mapping):
+    """The resources of one state file in a bundle, decoded on first access."""
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        offsets: Dict[_ResourceKey, Tuple[int, int]],
+        edges: Dict[_ResourceKey, Dict[str, Any]],
+    ) -> None:
+        self._buffer = buffer
+        self._offsets = offsets
+        # The type and dependencies of every resource, from the header.
+        self._edges = edges
+        self._resources: Dict[_ResourceKey, Dict[str, Any]] = {}
+
+    def dependency_graph(self) -> DependencyGraph:
+        """Builds the dependency graph from the header, decoding no resource."""
+        return DependencyGraph(self._edges)
+
+    def __getitem__(self, key: _ResourceKey) -> Dict[str, Any]:
+        resource = self._resources.get(key)
+        if resource is None:
+            start, length = self._offsets[key]
+            resource = json.loads(self._buffer[start : start + length])
+            self._resources[key] = resource
+        return resource
+
+    def __iter__(self) -> Iterator[_ResourceKey]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+class Bundle:
+    """A compiled state bundle, see :func:`compile_bundle`.
+
+    The file is memory mapped and only its header is parsed when it is opened,
+    resources are decoded when they are first used. Nothing is fetched over
+    the network.
+
+    Attributes:
+        path (str): The path of the bundle.
+        sources (List[Dict[str, Any]]): The state files the bundle was compiled
+            from, with their ``path``, ``lineage``, ``serial`` and ``sha256``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _PREAMBLE.size:
+            raise ValueError(f"{path} is not a terrabridge bundle.")
+        magic, version, header_length = _PREAMBLE.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a terrabridge bundle.")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has bundle format {version}, but only format "
+                f"{FORMAT_VERSION} is supported. Compile it again."
+            )
+        start = _PREAMBLE.size
+        header = json.loads(self._buffer[start : start + header_length])
+        body = start + header_length
+        self.sources: List[Dict[str, Any]] = header["sources"]
+        offsets: List[Dict[_ResourceKey, Tuple[int, int]]] = [{} for _ in self.sources]
+        edges: List[Dict[_ResourceKey, Dict[str, Any]]] = [{} for _ in self.sources]
+        for entry in header["resources"]:
+            source_index, module, name, type_, dependencies, offset, length = entry
+            key = _ResourceKey(name, module)
+            offsets[source_index][key] = (body + offset, length)
+            edges[source_index][key] = {"type": type_, "dependencies": dependencies}
+        self._states = {
+            source["path"]: _BundleState(self._buffer, source_offsets, source_edges)
+            for source, source_offsets, source_edges in zip(
+                self.sources, offsets, edges
+            )
+        }
+
+    def state(self, path: str) -> Mapping[_ResourceKey, Dict[str, Any]]:
+        """Returns the resources of a state file the bundle was compiled from."""
+        return self._states[path]
+
+    def close(self) -> None:
+        """Unmaps the bundle.
+
+        Resources that were already used stay available.
+        """
+        self._buffer.close()
+
+
+def load_bundle(path: str) -> Bundle:
+    """Serves the state files compiled into a bundle from the bundle.
+
+    Resources keep using the path of their state file, for example
+    ``gs://my-bucket/terraform.tfstate``, but are read from the bundle instead
+    of downloading and parsing the state. The bundle is also loaded
+    automatically when the ``TERRABRIDGE_BUNDLE`` environment variable is set
+    to its path.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.bundle import load_bundle
+        from terrabridge.gcp import GCSBucket
+
+        load_bundle("terraform.tfb")
+        bucket = GCSBucket("bucket", state_file="gs://my-bucket/terraform.tfstate")
+
+    Parameters:
+        path: The path of the bundle.
+
+    Returns:
+        The loaded bundle.
+    """
+    bundle = Bundle(path)
+    for source in bundle.sources:
+        parser.tf_state_cache[source["path"]] = bundle.state(source["path"])
+        parser._state_versions[source["path"]] = None
+        parser._state_serials[source["path"]] = source["serial"]
+    return bundle
+
+
+def check_bundle(path: str) -> List[Dict[str, Any]]:
+    """Checks whether a bundle is up to date with the state files it came from.
+
+    Every source state is downloaded and its lineage, serial and hash are
+    compared with the ones recorded in the bundle.
+
+    Parameters:
+        path: The path of the bundle.
+
+    Returns:
+        The sources that changed since the bundle was compiled, with their
+        current ``lineage``, ``serial`` and ``sha256``. Empty if the bundle is
+        up to date.
+    """
+    bundle = Bundle(path)
+    try:
+        stale = []
+        for source in bundle.sources:
+            _, current = _read_state(source["path"])
+            if current != source:
+                stale.append(current)
+        return stale
+    finally:
+        bundle.close()
@@ -0,0 +1,107 @@
+"""The ``terrabridge`` command line tool.
+
+Usage::
+
+    terrabridge compile gs://my-bucket/terraform.tfstate -o terraform.tfb --manifest manifest.json
+    terrabridge check terraform.tfb
+    terraform providers schema -json | terrabridge generate - -o tf_types.py
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from terrabridge.bundle import check_bundle, compile_bundle
+from terrabridge.codegen import generate
+
+
+def _compile(args: argparse.Namespace) -> int:
+    manifest = None
+    if args.manifest is not None:
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+    header = compile_bundle(args.state_files, args.output, manifest)
+    print(
+        f"Wrote {len(header['resources'])} resources from "
+        f"{len(header['sources'])} state files to {args.output} "
+        f"({os.path.getsize(args.output)} bytes)."
+    )
+    return 0
+
+
+def _check(args: argparse.Namespace) -> int:
+    stale = check_bundle(args.bundle)
+    for source in stale:
+        print(
+            f"{source['path']} changed: lineage {source['lineage']}, "
+            f"serial {source['serial']}.",
+            file=sys.stderr,
+        )
+    if stale:
+        return 1
+    print(f"{args.bundle} is up to date.")
+    return 0
+
+
+def _generate(args: argparse.Namespace) -> int:
+    if args.schema == "-":
+        schema = json.load(sys.stdin)
+    else:
+        with open(args.schema) as f:
+            schema = json.load(f)
+    source = generate(schema, args.types)
+    with open(args.output, "w") as f:
+        f.write(source)
+    print(f"Wrote {args.output}.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argparser = argparse.ArgumentParser(prog="terrabridge")
+    subparsers = argparser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile state files into a bundle."
+    )
+    compile_parser.add_argument("state_files", nargs="+", metavar="STATE_FILE")
+    compile_parser.add_argument("-o", "--output", required=True)
+    compile_parser.add_argument(
+        "--manifest",
+        help="A JSON file listing the resources and attributes to include. "
+        "All resources are included if omitted.",
+    )
+    compile_parser.set_defaults(func=_compile)
+
+    check_parser = subparsers.add_parser(
+        "check",
+        help="Check whether a bundle is up to date with its state files. "
+        "Exits with 1 if a state changed.",
+    )
+    check_parser.add_argument("bundle")
+    check_parser.set_defaults(func=_check)
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        help="Generate typed resource classes from provider schemas.",
+    )
+    generate_parser.add_argument(
+        "schema",
+        help="The output of `terraform providers schema -json`, - for stdin.",
+    )
+    generate_parser.add_argument("-o", "--output", required=True)
+    generate_parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        help="A terraform type to generate a class for, may be repeated. "
+        "Defaults to the types terrabridge has classes for.",
+    )
+    generate_parser.set_defaults(func=_generate)
+
+    args = argparser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
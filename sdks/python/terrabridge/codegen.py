@@ -0,0 +1,346 @@
+"""Generates typed resource classes from terraform provider schemas.
+
+The input is the output of ``terraform providers schema -json``. Every
+generated class declares each attribute of its resource type in ``__slots__``
+with a type annotation, and reads all of them from the state once when it is
+created. Attribute access is then a plain slot lookup instead of going through
+``Resource.__getattr__``, and type checkers know every attribute.
+
+Generated classes extend the terrabridge class for their type, such as
+:class:`terrabridge.gcp.GCSBucket`, so its methods stay available. These base
+classes are not slotted, so instances keep a ``__dict__`` for what the base
+class stores, such as its clients. Nested blocks, such as the
+``lifecycle_rule`` blocks of a bucket, become classes of their own that only
+have slots.
+"""
+import ast
+import importlib
+import inspect
+import keyword
+import sys
+import textwrap
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from terrabridge.base import Resource
+
+_HEADER = '''\
+"""Typed terraform resources, generated by ``terrabridge generate``. Do not edit."""
+# ruff: noqa
+from typing import Any, Dict, List, Optional
+
+{imports}
+
+
+def _block(cls, value):
+    return None if value is None else cls(value)
+
+
+def _block_list(cls, value):
+    return None if value is None else [cls(v) for v in value]
+
+
+def _block_map(cls, value):
+    return None if value is None else {{k: cls(v) for k, v in value.items()}}
+'''
+
+_PRIMITIVES = {"string": "str", "number": "float", "bool": "bool", "dynamic": "Any"}
+
+
+def _resource_classes() -> Dict[str, type]:
+    """Maps terraform types to the terrabridge classes that handle them."""
+    importlib.import_module("terrabridge.gcp")
+    importlib.import_module("terrabridge.aws")
+    classes = {}
+    pending = list(Resource.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        pending.extend(cls.__subclasses__())
+        if (
+            cls.__module__.startswith("terrabridge.")
+            and cls._terraform_type is not None
+            and cls._terraform_type not in classes
+        ):
+            classes[cls._terraform_type] = cls
+    return classes
+
+
+def _import_path(cls: type) -> str:
+    # Prefer the public package, e.g. terrabridge.gcp over terrabridge.gcp.pubsub.
+    package = cls.__module__.rsplit(".", 1)[0]
+    if getattr(sys.modules.get(package), cls.__name__, None) is cls:
+        return package
+    return cls.__module__
+
+
+def _init_names(cls: type) -> Set[str]:
+    """Returns the attributes the __init__ methods of a class assign to self."""
+    names = set()
+    for klass in cls.__mro__:
+        init = klass.__dict__.get("__init__")
+        if init is None or not hasattr(init, "__code__"):
+            continue
+        function = ast.parse(textwrap.dedent(inspect.getsource(init))).body[0]
+        this = function.args.args[0].arg
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+                targets = [node.target]
+            else:
+                continue
+            for target in targets:
+                for element in ast.walk(target):
+                    if (
+                        isinstance(element, ast.Attribute)
+                        and isinstance(element.value, ast.Name)
+                        and element.value.id == this
+                    ):
+                        names.add(element.attr)
+    return names
+
+
+def _class_name(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_") if part)
+
+
+def _slots(names: Iterable[str]) -> List[str]:
+    items = [f'"{name}"' for name in names]
+    line = f"    __slots__ = ({', '.join(items)}{',' if len(items) == 1 else ''})"
+    if len(line) <= 88:
+        return [line]
+    return ["    __slots__ = ("] + [f"        {item}," for item in items] + ["    )"]
+
+
+def _assign(name: str, value: str) -> List[str]:
+    line = f"        self.{name} = {value}"
+    if len(line) <= 88 or "(" not in value:
+        return [line]
+    # Wraps helper calls the way black would.
+    helper, _, args = value.partition("(")
+    return [f"        self.{name} = {helper}(", f"            {args[:-1]}", "        )"]
+
+
+def _type_hint(type_: Any) -> str:
+    if isinstance(type_, str):
+        return _PRIMITIVES.get(type_, "Any")
+    kind = type_[0]
+    if kind in ("list", "set"):
+        return f"List[{_type_hint(type_[1])}]"
+    if kind == "map":
+        return f"Dict[str, {_type_hint(type_[1])}]"
+    if kind == "object":
+        return "Dict[str, Any]"
+    return "Any"
+
+
+def _docstring(summary: str, fields: List[Tuple[str, str, str]]) -> List[str]:
+    lines = ['    """' + summary, ""]
+    if fields:
+        lines.append("    Attributes:")
+    for name, hint, description in fields:
+        description = " ".join(description.split())
+        description = description.replace("\\", "\\\\").replace('"""', "'''")
+        entry = f"{name} ({hint}): {description}".rstrip(": ")
+        lines.extend(
+            textwrap.wrap(
+                entry,
+                width=88,
+                initial_indent=" " * 8,
+                subsequent_indent=" " * 12,
+                break_on_hyphens=False,
+            )
+        )
+    lines.append('    """')
+    lines.append("")
+    return lines
+
+
+class _Generator:
+    def __init__(self, resource_class_names: Set[str]) -> None:
+        self.classes: List[str] = []
+        self.names = set(resource_class_names)
+
+    def field_name(self, name: str, reserved: Set[str]) -> str:
+        while keyword.iskeyword(name) or name in reserved:
+            name += "_"
+        return name
+
+    def fields(
+        self, class_name: str, block: Dict[str, Any], reserved: Set[str]
+    ) -> List[Tuple[str, str, str, str, str]]:
+        """Returns the name, attribute, hint, description and value of every field."""
+        fields = []
+        for attribute, schema in sorted(block.get("attributes", {}).items()):
+            hint = "Any" if "type" not in schema else _type_hint(schema["type"])
+            value = f'a.get("{attribute}")'
+            fields.append((attribute, hint, schema.get("description", ""), value))
+        for attribute, block_type in sorted(block.get("block_types", {}).items()):
+            nested = self.block(f"{class_name}{_class_name(attribute)}", block_type)
+            mode = block_type.get("nesting_mode", "list")
+            if mode in ("single", "group"):
+                hint, helper = nested, "_block"
+            elif mode == "map":
+                hint, helper = f"Dict[str, {nested}]", "_block_map"
+            else:
+                hint, helper = f"List[{nested}]", "_block_list"
+            value = f'{helper}({nested}, a.get("{attribute}"))'
+            description = block_type["block"].get("description", "")
+            fields.append((attribute, hint, description, value))
+        return [
+            (self.field_name(attribute, reserved), attribute, hint, description, value)
+            for attribute, hint, description, value in fields
+        ]
+
+    def block(self, class_name: str, block_type: Dict[str, Any]) -> str:
+        while class_name in self.names:
+            class_name += "Block"
+        self.names.add(class_name)
+        fields = self.fields(class_name, block_type["block"], set())
+        lines = [f"class {class_name}:"]
+        lines += _docstring(
+            "A nested block, generated from the provider schema.",
+            [(name, hint, description) for name, _, hint, description, _ in fields],
+        )
+        lines += _slots(name for name, *_ in fields)
+        lines.append("")
+        for name, _, hint, _, _ in fields:
+            lines.append(f"    {name}: Optional[{hint}]")
+        lines.append("")
+        lines.append("    def __init__(self, a: Dict[str, Any]) -> None:")
+        for name, _, _, _, value in fields:
+            lines += _assign(name, value)
+        if not fields:
+            lines.append("        pass")
+        lines.append("")
+        lines.append("    def __repr__(self) -> str:")
+        lines.append(
+            '        fields = ", ".join(f"{name}={getattr(self, name)!r}" '
+            "for name in self.__slots__)"
+        )
+        lines.append('        return f"{type(self).__name__}({fields})"')
+        self.classes.append("\n".join(lines))
+        return class_name
+
+    def resource(self, terraform_type: str, schema: Dict[str, Any], base: type) -> str:
+        class_name = _class_name(terraform_type)
+        # Attributes that would shadow a method or class attribute of the base
+        # class get a trailing underscore, e.g. ``version_`` on secrets.
+        reserved = {name for name in dir(base) if not name.startswith("__")}
+        reserved.add("resource_name")
+        fields = self.fields(class_name, schema["block"], reserved)
+        set_by_base = _init_names(base)
+        lines = [f"class {class_name}({base.__name__}):"]
+        lines += _docstring(
+            f"A typed ``{terraform_type}``, generated from the provider schema.",
+            [(name, hint, description) for name, _, hint, description, _ in fields],
+        )
+        lines += _slots(name for name, *_ in fields)
+        lines.append(f'    _terraform_type = "{terraform_type}"')
+        lines.append("")
+        for name, _, hint, _, _ in fields:
+            lines.append(f"    {name}: Optional[{hint}]")
+        lines.append("")
+        lines.append("    def __init__(")
+        lines.append("        self,")
+        lines.append("        resource_name: str,")
+        lines.append("        *,")
+        lines.append("        module_name: Optional[str] = None,")
+        lines.append("        state_file: Optional[str] = None,")
+        lines.append("    ) -> None:")
+        lines.append(
+            "        super().__init__(resource_name, module_name=module_name, "
+            "state_file=state_file)"
+        )
+        lines.append("        a = self._attributes")
+        for name, attribute, _, _, value in fields:
+            # Values the base class already set, e.g. a region derived from an
+            # ARN, are kept.
+            if name == attribute and name in set_by_base:
+                continue
+            lines += _assign(name, value)
+        self.classes.append("\n".join(lines))
+        return class_name
+
+
+def generate(
+    schema: Dict[str, Any],
+    types: Optional[Iterable[str]] = None,
+) -> str:
+    """Generates a module of typed resource classes from provider schemas.
+
+    Example
+    -------
+    .. code:: python
+
+        import json
+        import subprocess
+
+        from terrabridge.codegen import generate
+
+        schema = json.loads(
+            subprocess.check_output(["terraform", "providers", "schema", "-json"])
+        )
+        with open("tf_types.py", "w") as f:
+            f.write(generate(schema))
+
+        # tf_types.py
+        bucket = GoogleStorageBucket("bucket", state_file="terraform.tfstate")
+        bucket.location
+
+    Parameters:
+        schema: The output of ``terraform providers schema -json``.
+        types: The terraform types to generate classes for. Defaults to the
+            types terrabridge has classes for, such as ``google_storage_bucket``.
+
+    Returns:
+        The source of the module.
+
+    Raises:
+        ValueError: If a requested type is not in the schema.
+    """
+    resource_schemas = {}
+    for provider in schema.get("provider_schemas", {}).values():
+        resource_schemas.update(provider.get("resource_schemas", {}))
+    known = _resource_classes()
+    if types is None:
+        types = [t for t in known if t in resource_schemas]
+    types = sorted(set(types))
+    missing = [t for t in types if t not in resource_schemas]
+    if missing:
+        raise ValueError(f"Resource types {missing} are not in the provider schema.")
+
+    from terrabridge.aws.base import AWSResource
+    from terrabridge.gcp.base import GCPResource
+
+    generator = _Generator({_class_name(t) for t in types})
+    imports: Dict[str, Set[str]] = {}
+    resource_classes = []
+    for terraform_type in types:
+        base = known.get(terraform_type)
+        if base is None:
+            attributes = resource_schemas[terraform_type]["block"].get("attributes", {})
+            if "id" in attributes and terraform_type.startswith("aws_"):
+                base = AWSResource
+            elif {"id", "project"} <= set(attributes):
+                base = GCPResource
+            else:
+                base = Resource
+        imports.setdefault(_import_path(base), set()).add(base.__name__)
+        class_name = generator.resource(
+            terraform_type, resource_schemas[terraform_type], base
+        )
+        resource_classes.append((terraform_type, class_name))
+
+    import_lines = [
+        f"from {module} import {', '.join(sorted(names))}"
+        for module, names in sorted(imports.items())
+    ]
+    source = [_HEADER.format(imports="\n".join(import_lines)).rstrip("\n")]
+    source.extend(generator.classes)
+    source.append(
+        "# Maps terraform types to their generated classes.\n"
+        "RESOURCE_TYPES = {\n"
+        + "".join(f'    "{t}": {name},\n' for t, name in resource_classes)
+        + "}"
+    )
+    return "\n\n\n".join(source) + "\n"
@@ -1,9 +1,23 @@
 # ruff: noqa
-from .bigquery import BigQueryDataset, BigQueryTable
+from .bigquery import BigQueryDataset, BigQueryTable, QueryCache
 from .bigtable import BigTableInstance, BigTableTable
-from .cloud_sql import CloudSQLDatabase, CloudSQLInstance, CloudSQLUser
-from .cloud_tasks import CloudTasksQueue
-from .gcs_bucket import GCSBucket
+from .clients import ClientRegistry, aclose_clients, close_clients
+from .cloud_sql import (
+    CloudSQLDatabase,
+    CloudSQLInstance,
+    CloudSQLUser,
+    POOL_PRESETS,
+    PoolMetrics,
+    PoolSettings,
+    ThreadedAsyncEngine,
+    adispose_engines,
+    awarmup_engine,
+    dispose_engines,
+    pool_metrics,
+    warmup_engine,
+)
+from .cloud_tasks import CloudTasksQueue, EnqueueError, task_id
+from .gcs_bucket import GCSBucket, TransferResult, set_http_pool_size
 from .pubsub import PubSubSubscription, PubSubTopic
 from .pubsub_lite import PubSubLiteSubscription, PubSubLiteTopic
-from .secret_manager import SecretManagerSecret
+from .secret_manager import SecretManagerSecret, afetch_secrets, fetch_secrets
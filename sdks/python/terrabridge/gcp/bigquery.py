@@ -1,6 +1,447 @@
-from typing import Optional
+import asyncio
+import datetime
+import decimal
+import functools
+import itertools
+import os
+import queue
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from terrabridge.gcp.base import GCPResource
+from terrabridge.gcp.clients import get_client
+
+if TYPE_CHECKING:
+    from terrabridge.gcp.gcs_bucket import GCSBucket
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:
+    api_exceptions = None
+try:
+    from google.cloud import bigquery as bigquery_client
+except ImportError:
+    bigquery_client = None
+try:
+    from google.cloud import bigquery_storage_v1 as bigquery_storage
+    from google.cloud.bigquery_storage_v1 import types as bigquery_storage_types
+except ImportError:
+    bigquery_storage = None
+    bigquery_storage_types = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+_cache_lock = threading.Lock()
+_caches: "weakref.WeakSet[QueryCache]" = weakref.WeakSet()
+
+
+def _check_installed():
+    if bigquery_storage is None:
+        raise ImportError(
+            "google-cloud-bigquery-storage is not installed. "
+            "Please install it with `pip install terrabridge[gcp]`."
+        )
+    if pyarrow is None:
+        raise ImportError(
+            "pyarrow is not installed. "
+            "Please install it with `pip install terrabridge[gcp]`."
+        )
+
+
+def _get_read_client():
+    _check_installed()
+    return get_client("bigquery_storage.read", bigquery_storage.BigQueryReadClient)
+
+
+def _get_write_client():
+    _check_installed()
+    return get_client("bigquery_storage.write", bigquery_storage.BigQueryWriteClient)
+
+
+def _get_client():
+    if bigquery_client is None:
+        raise ImportError(
+            "google-cloud-bigquery is not installed. "
+            "Please install it with `pip install terrabridge[gcp]`."
+        )
+    return get_client("bigquery", bigquery_client.Client)
+
+
+def _read_stream(client, stream: str, schema) -> Iterator["pyarrow.RecordBatch"]:
+    for response in client.read_rows(stream):
+        yield pyarrow.ipc.read_record_batch(
+            pyarrow.py_buffer(response.arrow_record_batch.serialized_record_batch),
+            schema,
+        )
+
+
+_DONE = object()
+
+
+def _read_streams(
+    client, streams: List[str], schema, max_queue_size: int
+) -> Iterator["pyarrow.RecordBatch"]:
+    # Each stream is read on its own thread. The bounded queue applies back
+    # pressure so at most ``max_queue_size`` batches are held in memory.
+    batches = queue.Queue(maxsize=max_queue_size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read(stream: str) -> None:
+        try:
+            for batch in _read_stream(client, stream, schema):
+                if not put(batch):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    threads = [
+        threading.Thread(target=read, args=(stream,), daemon=True) for stream in streams
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = batches.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+# Modes accepted by ``BigQueryTable.write`` mapped to the write stream type. The
+# default stream is shared by all writers and needs no setup or commit.
+_WRITE_MODES = ("default", "committed", "pending")
+# AppendRows requests are limited to 10MB, leave room for the schema and framing.
+_MAX_REQUEST_BYTES = 8 * 1024 * 1024
+_ALREADY_EXISTS = 6
+_RETRY_INITIAL = 0.5
+_RETRY_MAXIMUM = 30.0
+_RETRYABLE_ERRORS = (
+    "Aborted",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+)
+
+
+def _retryable(error: Exception) -> bool:
+    return type(error).__name__ in _RETRYABLE_ERRORS
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter keeps parallel streams from retrying in lock step.
+    return random.uniform(0, min(_RETRY_MAXIMUM, _RETRY_INITIAL * 2**attempt))
+
+
+def _iter_chunks(
+    batches: Union["pyarrow.Table", "pyarrow.RecordBatch", Iterable[Any]],
+    max_request_bytes: int,
+) -> Iterator["pyarrow.RecordBatch"]:
+    if isinstance(batches, (pyarrow.Table, pyarrow.RecordBatch)):
+        batches = [batches]
+    for batch in batches:
+        if isinstance(batch, pyarrow.Table):
+            yield from _iter_chunks(batch.to_batches(), max_request_bytes)
+            continue
+        if batch.num_rows == 0:
+            continue
+        if batch.nbytes <= max_request_bytes:
+            yield batch
+            continue
+        rows = max(1, batch.num_rows * max_request_bytes // batch.nbytes)
+        for start in range(0, batch.num_rows, rows):
+            yield batch.slice(start, rows)
+
+
+class _AppendConnection:
+    """A single AppendRows connection, sending one request at a time."""
+
+    def __init__(self, client, stream: str) -> None:
+        self._requests = queue.Queue()
+        self._responses = client.append_rows(
+            iter(self._requests.get, None),
+            metadata=(("x-goog-request-params", f"write_stream={stream}"),),
+        )
+
+    def append(self, request):
+        self._requests.put(request)
+        try:
+            return next(self._responses)
+        except StopIteration:
+            raise api_exceptions.ServiceUnavailable("AppendRows stream closed")
+
+    def close(self) -> None:
+        self._requests.put(None)
+
+
+def _append_stream(
+    client,
+    stream: str,
+    schema: bytes,
+    chunks: queue.Queue,
+    use_offsets: bool,
+    retries: int,
+) -> int:
+    connection = None
+    rows = 0
+    try:
+        while True:
+            batch = chunks.get()
+            if batch is _DONE:
+                return rows
+            request = bigquery_storage_types.AppendRowsRequest(
+                write_stream=stream,
+                arrow_rows=bigquery_storage_types.AppendRowsRequest.ArrowData(
+                    writer_schema=bigquery_storage_types.ArrowSchema(
+                        serialized_schema=schema
+                    ),
+                    rows=bigquery_storage_types.ArrowRecordBatch(
+                        serialized_record_batch=batch.serialize().to_pybytes(),
+                        row_count=batch.num_rows,
+                    ),
+                ),
+            )
+            if use_offsets:
+                # Offsets make retries idempotent: a request that was already
+                # written is rejected with ALREADY_EXISTS instead of duplicated.
+                request.offset = rows
+            for attempt in itertools.count():
+                try:
+                    if connection is None:
+                        connection = _AppendConnection(client, stream)
+                    response = connection.append(request)
+                    code = response.error.code
+                    if code and not (use_offsets and code == _ALREADY_EXISTS):
+                        raise api_exceptions.from_grpc_status(
+                            response.error.code, response.error.message
+                        )
+                    break
+                except api_exceptions.GoogleAPICallError as e:
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    if attempt >= retries or not _retryable(e):
+                        raise
+                    time.sleep(_backoff(attempt))
+            rows += batch.num_rows
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+def _iter_async(aiterable: AsyncIterable[Any], loop) -> Iterator[Any]:
+    # Pulls items from an async iterable on ``loop`` while running in a thread.
+    iterator = aiterable.__aiter__()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(iterator.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+class QueryCache:
+    """A size bounded, least recently used cache of query results.
+
+    Results are keyed by the normalized SQL, the query parameters and the last
+    modification time of every table the query reads, so a cached result is
+    never served after one of its tables changes. Only use the cache for
+    deterministic queries, results of queries calling functions like
+    ``CURRENT_TIMESTAMP()`` are cached as well.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.gcp import BigQueryDataset, QueryCache
+
+        cache = QueryCache(max_bytes=512 * 1024 * 1024)
+        dataset = BigQueryDataset("dataset", state_file="gs://my-bucket/terraform.tfstate")
+        batches = dataset.query("SELECT * FROM users", cache=cache)
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached results. Results
+            larger than this are not cached.
+        hits (int): The number of queries served from the cache.
+        misses (int): The number of queries that were not in the cache.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, pyarrow.Table]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the cached results in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional["pyarrow.Table"]:
+        with self._lock:
+            table = self._entries.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key: Hashable, table: "pyarrow.Table") -> None:
+        if table.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._entries[key] = table
+            self._nbytes += table.nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+_default_cache = None
+
+
+def _get_default_cache() -> QueryCache:
+    global _default_cache
+    if _default_cache is None:
+        with _cache_lock:
+            if _default_cache is None:
+                _default_cache = QueryCache()
+    return _default_cache
+
+
+def _after_fork() -> None:
+    # The lock may have been held by another thread at fork time. Cached results
+    # are kept, like the parsed state they are cheap to share copy-on-write.
+    global _cache_lock
+    _cache_lock = threading.Lock()
+    for cache in _caches:
+        cache._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _parameter_type(value: Any) -> str:
+    # bool must be checked before int, and datetime before date.
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "FLOAT64"
+    if isinstance(value, decimal.Decimal):
+        return "NUMERIC"
+    if isinstance(value, str):
+        return "STRING"
+    if isinstance(value, bytes):
+        return "BYTES"
+    if isinstance(value, datetime.datetime):
+        return "DATETIME" if value.tzinfo is None else "TIMESTAMP"
+    if isinstance(value, datetime.date):
+        return "DATE"
+    if isinstance(value, datetime.time):
+        return "TIME"
+    raise ValueError(f"Unsupported query parameter type: {type(value).__name__}.")
+
+
+def _query_parameters(params: Optional[Dict[str, Any]]) -> list:
+    parameters = []
+    for name, value in (params or {}).items():
+        if isinstance(value, (list, tuple)):
+            if not value:
+                raise ValueError(
+                    f"Cannot infer the type of the empty array parameter {name!r}."
+                )
+            parameters.append(
+                bigquery_client.ArrayQueryParameter(
+                    name, _parameter_type(value[0]), list(value)
+                )
+            )
+        else:
+            parameters.append(
+                bigquery_client.ScalarQueryParameter(
+                    name, _parameter_type(value), value
+                )
+            )
+    return parameters
+
+
+def _cache_value(value: Any) -> Hashable:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _cache_batches(
+    batches: Iterator["pyarrow.RecordBatch"], cache: QueryCache, key: Hashable
+) -> Iterator["pyarrow.RecordBatch"]:
+    # Results are cached once fully read, unless they outgrow the cache.
+    collected = []
+    nbytes = 0
+    for batch in batches:
+        if collected is not None:
+            nbytes += batch.nbytes
+            if nbytes <= cache.max_bytes:
+                collected.append(batch)
+            else:
+                collected = None
+        yield batch
+    if collected is not None:
+        # Empty results are cached too, as a table without batches.
+        schema = collected[0].schema if collected else pyarrow.schema([])
+        cache.put(key, pyarrow.Table.from_batches(collected, schema=schema))
 
 
 class BigQueryDataset(GCPResource):
@@ -21,9 +462,13 @@ class BigQueryDataset(GCPResource):
         dataset = BigQueryDataset("dataset", state_file="gs://my-bucket/terraform.tfstate")
         print(dataset.id)
 
+        for batch in dataset.query("SELECT * FROM users", cache=True):
+            print(batch.num_rows)
+
     Attributes:
         project (str): The project the resource belongs to.
         id (str): The id of the resource.
+        dataset_id (str): The id of the dataset.
     """
 
     _terraform_type = "google_bigquery_dataset"
@@ -33,9 +478,107 @@ class BigQueryDataset(GCPResource):
         resource_name: str,
         *,
         module_name: Optional[str] = None,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
     ) -> None:
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
+        self.dataset_id: str = self._attributes["dataset_id"]
+
+    def _query_job_config(self, params: Optional[Dict[str, Any]], **job_config):
+        return bigquery_client.QueryJobConfig(
+            default_dataset=f"{self.project}.{self.dataset_id}",
+            query_parameters=_query_parameters(params),
+            **job_config,
+        )
+
+    def _cache_key(
+        self, client, sql: str, params: Optional[Dict[str, Any]], job_config: dict
+    ) -> Optional[Hashable]:
+        # A dry run is free and reports the tables the query reads, their
+        # modification times invalidate cached results when the data changes.
+        dry_run = client.query(
+            sql,
+            job_config=self._query_job_config(
+                params, **{**job_config, "dry_run": True, "use_query_cache": False}
+            ),
+        )
+        if dry_run.statement_type != "SELECT":
+            return None
+        modified = []
+        for reference in dry_run.referenced_tables:
+            table = client.get_table(reference)
+            modified.append((table.full_table_id, table.modified))
+        return (
+            self.project,
+            self.dataset_id,
+            _normalize_sql(sql),
+            tuple(sorted((k, _cache_value(v)) for k, v in (params or {}).items())),
+            tuple(sorted((k, repr(v)) for k, v in job_config.items())),
+            tuple(sorted(modified)),
+        )
+
+    def query(
+        self,
+        sql: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        cache: Union[bool, QueryCache] = False,
+        max_streams: Optional[int] = None,
+        **job_config,
+    ) -> Iterator["pyarrow.RecordBatch"]:
+        """Runs a query with this dataset as the default dataset.
+
+        Tables in ``sql`` can be referenced without the project and dataset.
+        Results are streamed as Arrow record batches with the BigQuery Storage
+        API, which is much faster than paging through rows for large results.
+
+        With ``cache`` enabled, results of ``SELECT`` queries are kept in a local
+        :class:`QueryCache` keyed by the normalized SQL, the parameters and the
+        modification time of the tables read. A cache hit still costs a free dry
+        run and a metadata lookup per table, but no query job or bytes billed.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            for batch in dataset.query(
+                "SELECT name FROM users WHERE age > @age", {"age": 21}, cache=True
+            ):
+                print(batch.num_rows)
+
+        Parameters:
+            sql: The GoogleSQL query to run.
+            params: Named query parameters, referenced as ``@name`` in the query.
+                Lists become array parameters.
+            cache: ``True`` to use the shared cache, or a :class:`QueryCache`.
+            max_streams: The maximum number of streams used to read the results.
+            **job_config: Additional arguments passed to
+                ``google.cloud.bigquery.QueryJobConfig``.
+
+        Returns:
+            An iterator of Arrow record batches.
+        """
+        client = _get_client()
+        read_client = _get_read_client()
+        if cache is True:
+            cache = _get_default_cache()
+        elif cache is False:
+            cache = None
+        key = None
+        if cache is not None:
+            key = self._cache_key(client, sql, params, job_config)
+            if key is not None:
+                table = cache.get(key)
+                if table is not None:
+                    return iter(table.to_batches())
+        job = client.query(sql, job_config=self._query_job_config(params, **job_config))
+        batches = job.result().to_arrow_iterable(
+            bqstorage_client=read_client, max_stream_count=max_streams
+        )
+        if key is None:
+            return batches
+        return _cache_batches(batches, cache, key)
 
 
 class BigQueryTable(GCPResource):
@@ -54,9 +597,14 @@ class BigQueryTable(GCPResource):
         print(table.id)
         print(table.dataset.id)
 
+        arrow_table = table.read_arrow(columns=["name"], max_streams=4)
+        table.write(arrow_table, mode="committed")
+
     Attributes:
         project (str): The project the resource belongs to.
         id (str): The id of the resource.
+        dataset_id (str): The id of the dataset the table belongs to.
+        table_id (str): The id of the table.
         dataset (BigQueryDataset): The dataset the table belongs to. Will only be
             populated if the dataset also exists in the state file.
     """
@@ -68,12 +616,363 @@ class BigQueryTable(GCPResource):
         resource_name: str,
         *,
         module_name: Optional[str] = None,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
     ) -> None:
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
-        self.dataset: Optional[BigQueryDataset] = None
-        for dependency in self._dependencies:
-            if dependency.startswith(BigQueryDataset._terraform_type):
-                self.dataset = BigQueryDataset(
-                    dependency.split(".")[1], state_file=state_file
+        self.dataset_id: str = self._attributes["dataset_id"]
+        self.table_id: str = self._attributes["table_id"]
+        self.dataset: Optional[BigQueryDataset] = self._dependency(BigQueryDataset)
+
+    def _table_path(self) -> str:
+        return (
+            f"projects/{self.project}/datasets/{self.dataset_id}"
+            f"/tables/{self.table_id}"
+        )
+
+    def _create_read_session(
+        self,
+        columns: Optional[Sequence[str]],
+        row_filter: Optional[str],
+        max_streams: int,
+    ):
+        client = _get_read_client()
+        session = client.create_read_session(
+            parent=f"projects/{self.project}",
+            read_session=bigquery_storage_types.ReadSession(
+                table=self._table_path(),
+                data_format=bigquery_storage_types.DataFormat.ARROW,
+                read_options=bigquery_storage_types.ReadSession.TableReadOptions(
+                    selected_fields=list(columns or []),
+                    row_restriction=row_filter or "",
+                ),
+            ),
+            max_stream_count=max_streams,
+        )
+        schema = pyarrow.ipc.read_schema(
+            pyarrow.py_buffer(session.arrow_schema.serialized_schema)
+        )
+        return client, session, schema
+
+    def iter_record_batches(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        row_filter: Optional[str] = None,
+        max_streams: int = 1,
+        max_queue_size: int = 16,
+    ) -> Iterator["pyarrow.RecordBatch"]:
+        """Reads the table as Arrow record batches using the BigQuery Storage API.
+
+        Batches are yielded as they arrive, so tables of any size can be processed
+        in constant memory. With ``max_streams`` greater than one the table is read
+        over several streams in parallel, and batches from different streams are
+        interleaved in no particular order.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            for batch in table.iter_record_batches(
+                columns=["name", "age"], row_filter="age > 21", max_streams=4
+            ):
+                print(batch.num_rows)
+
+        Parameters:
+            columns: The columns to read, defaults to all columns.
+            row_filter: A SQL boolean expression rows must match, for example
+                ``"age > 21"``.
+            max_streams: The maximum number of streams to read in parallel. The
+                server may create fewer streams for small tables.
+            max_queue_size: The maximum number of batches buffered in memory when
+                reading several streams.
+
+        Returns:
+            An iterator of Arrow record batches.
+        """
+        client, session, schema = self._create_read_session(
+            columns, row_filter, max_streams
+        )
+        streams = [stream.name for stream in session.streams]
+        if len(streams) == 1:
+            return _read_stream(client, streams[0], schema)
+        return _read_streams(client, streams, schema, max_queue_size)
+
+    def read_arrow(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        row_filter: Optional[str] = None,
+        max_streams: int = 1,
+    ) -> "pyarrow.Table":
+        """Reads the table into an Arrow table using the BigQuery Storage API.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Parameters:
+            columns: The columns to read, defaults to all columns.
+            row_filter: A SQL boolean expression rows must match.
+            max_streams: The maximum number of streams to read in parallel.
+
+        Returns:
+            An Arrow table.
+        """
+        client, session, schema = self._create_read_session(
+            columns, row_filter, max_streams
+        )
+        streams = [stream.name for stream in session.streams]
+        return pyarrow.Table.from_batches(
+            _read_streams(client, streams, schema, max_queue_size=16), schema=schema
+        )
+
+    def write(
+        self,
+        batches: Union["pyarrow.Table", "pyarrow.RecordBatch", Iterable[Any]],
+        *,
+        mode: str = "default",
+        max_streams: int = 1,
+        max_request_bytes: int = _MAX_REQUEST_BYTES,
+        retries: int = 5,
+    ) -> int:
+        """Writes Arrow data to the table using the BigQuery Storage Write API.
+
+        Batches are split into appends of at most ``max_request_bytes`` and sent
+        over ``max_streams`` connections in parallel. ``batches`` can be a lazy
+        iterator; it is only read as fast as the appends are acknowledged, so
+        memory stays bounded. Transient errors are retried with exponential
+        backoff.
+
+        The ``mode`` controls the delivery guarantee:
+
+        - ``"default"``: appends to the table's default stream. Rows are visible
+          immediately but may be duplicated if an append is retried.
+        - ``"committed"``: appends to new committed streams using offsets, so
+          retried appends are written exactly once.
+        - ``"pending"``: appends to new pending streams that are committed
+          atomically once every batch has been written. Nothing is visible if
+          the write fails.
+
+        The Arrow schema must match the table's columns. Requires
+        ``terrabridge[gcp]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            import pyarrow
+
+            batch = pyarrow.record_batch(
+                [pyarrow.array(["alice", "bob"]), pyarrow.array([30, 40])],
+                names=["name", "age"],
+            )
+            rows = table.write([batch], mode="committed", max_streams=4)
+
+        Parameters:
+            batches: An Arrow table, record batch or an iterable of either.
+            mode: One of ``"default"``, ``"committed"`` or ``"pending"``.
+            max_streams: The number of streams to write in parallel.
+            max_request_bytes: The maximum size of a single append.
+            retries: The number of times to retry a failed append.
+
+        Returns:
+            The number of rows written.
+        """
+        if mode not in _WRITE_MODES:
+            raise ValueError(f"mode must be one of {_WRITE_MODES}, got {mode!r}.")
+        client = _get_write_client()
+        chunks_iter = _iter_chunks(batches, max_request_bytes)
+        first = next(chunks_iter, None)
+        if first is None:
+            return 0
+        schema = first.schema
+        parent = self._table_path()
+        if mode == "default":
+            streams = [f"{parent}/streams/_default"] * max_streams
+        else:
+            stream_type = (
+                bigquery_storage_types.WriteStream.Type.COMMITTED
+                if mode == "committed"
+                else bigquery_storage_types.WriteStream.Type.PENDING
+            )
+            streams = [
+                client.create_write_stream(
+                    parent=parent,
+                    write_stream=bigquery_storage_types.WriteStream(type_=stream_type),
+                ).name
+                for _ in range(max_streams)
+            ]
+
+        # The bounded queue applies back pressure to the caller's iterator.
+        chunks = queue.Queue(maxsize=2 * max_streams)
+
+        def put(item, raise_errors: bool = True) -> None:
+            while True:
+                # Fail as soon as a stream fails rather than consuming the rest
+                # of the caller's iterator first.
+                for future in futures:
+                    if raise_errors and future.done() and future.exception():
+                        raise future.exception()
+                if all(future.done() for future in futures):
+                    if raise_errors:
+                        raise RuntimeError(
+                            "All write streams exited before every batch was written."
+                        )
+                    return
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        serialized_schema = schema.serialize().to_pybytes()
+        with ThreadPoolExecutor(max_workers=max_streams) as executor:
+            futures = [
+                executor.submit(
+                    _append_stream,
+                    client,
+                    stream,
+                    serialized_schema,
+                    chunks,
+                    mode != "default",
+                    retries,
                 )
+                for stream in streams
+            ]
+            try:
+                for batch in itertools.chain([first], chunks_iter):
+                    if not batch.schema.equals(schema):
+                        raise ValueError(
+                            "All batches must have the same schema, "
+                            f"expected {schema} got {batch.schema}."
+                        )
+                    put(batch)
+            finally:
+                for _ in futures:
+                    put(_DONE, raise_errors=False)
+            rows = sum(future.result() for future in futures)
+
+        if mode != "default":
+            for stream in streams:
+                client.finalize_write_stream(name=stream)
+        if mode == "pending":
+            response = client.batch_commit_write_streams(
+                bigquery_storage_types.BatchCommitWriteStreamsRequest(
+                    parent=parent, write_streams=streams
+                )
+            )
+            if response.stream_errors:
+                raise api_exceptions.Aborted(
+                    "Failed to commit write streams: "
+                    + "; ".join(error.error_message for error in response.stream_errors)
+                )
+        return rows
+
+    async def awrite(
+        self,
+        batches: Union[
+            "pyarrow.Table", "pyarrow.RecordBatch", Iterable[Any], AsyncIterable[Any]
+        ],
+        *,
+        mode: str = "default",
+        max_streams: int = 1,
+        max_request_bytes: int = _MAX_REQUEST_BYTES,
+        retries: int = 5,
+    ) -> int:
+        """Writes Arrow data to the table using the BigQuery Storage Write API.
+
+        The asyncio version of :meth:`write`. ``batches`` can also be an async
+        iterable, which is consumed on the running event loop while the appends
+        are sent from worker threads.
+
+        Example
+        -------
+        .. code:: python
+
+            async def batches():
+                async for rows in source:
+                    yield pyarrow.RecordBatch.from_pylist(rows)
+
+            rows = await table.awrite(batches(), mode="pending")
+
+        Parameters:
+            batches: An Arrow table, record batch or a sync or async iterable of
+                either.
+            mode: One of ``"default"``, ``"committed"`` or ``"pending"``.
+            max_streams: The number of streams to write in parallel.
+            max_request_bytes: The maximum size of a single append.
+            retries: The number of times to retry a failed append.
+
+        Returns:
+            The number of rows written.
+        """
+        loop = asyncio.get_running_loop()
+        if hasattr(batches, "__aiter__"):
+            batches = _iter_async(batches, loop)
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.write,
+                batches,
+                mode=mode,
+                max_streams=max_streams,
+                max_request_bytes=max_request_bytes,
+                retries=retries,
+            ),
+        )
+
+    def load_from_gcs(
+        self,
+        bucket: "GCSBucket",
+        paths: Union[str, Sequence[str]],
+        *,
+        source_format: str = "PARQUET",
+        write_disposition: str = "WRITE_APPEND",
+        wait: bool = True,
+        **job_config,
+    ):
+        """Loads files from a GCS bucket into the table with a BigQuery load job.
+
+        Load jobs are the cheapest way to ingest large files that are already in
+        GCS, they do not count against streaming quotas.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            from terrabridge.gcp import GCSBucket
+
+            bucket = GCSBucket("bucket", state_file="gs://my-bucket/terraform.tfstate")
+            job = table.load_from_gcs(bucket, "exports/*.parquet")
+            print(job.output_rows)
+
+        Parameters:
+            bucket: The bucket containing the files.
+            paths: A path or list of paths within the bucket, may contain a
+                ``*`` wildcard.
+            source_format: The format of the files, for example ``"PARQUET"``,
+                ``"AVRO"``, ``"CSV"`` or ``"NEWLINE_DELIMITED_JSON"``.
+            write_disposition: What to do if the table already has data, one of
+                ``"WRITE_APPEND"``, ``"WRITE_TRUNCATE"`` or ``"WRITE_EMPTY"``.
+            wait: Whether to wait for the job to finish.
+            **job_config: Additional arguments passed to
+                ``google.cloud.bigquery.LoadJobConfig``.
+
+        Returns:
+            The ``google.cloud.bigquery.LoadJob``.
+        """
+        client = _get_client()
+        if isinstance(paths, str):
+            paths = [paths]
+        job = client.load_table_from_uri(
+            [f"gs://{bucket.name}/{path.lstrip('/')}" for path in paths],
+            f"{self.project}.{self.dataset_id}.{self.table_id}",
+            job_config=bigquery_client.LoadJobConfig(
+                source_format=source_format,
+                write_disposition=write_disposition,
+                **job_config,
+            ),
+        )
+        if wait:
+            job.result()
+        return job
@@ -1,6 +1,147 @@
-from typing import Optional
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Iterator, Optional
 
 from terrabridge.gcp.base import GCPResource
+from terrabridge.gcp.clients import get_async_client, get_client
+
+try:
+    from google.cloud.bigtable import data as bigtable_data
+except ImportError:
+    bigtable_data = None
+
+_DONE = object()
+
+
+def _check_installed():
+    if bigtable_data is None:
+        raise ImportError(
+            "google-cloud-bigtable is not installed. "
+            "Please install it with `pip install terrabridge[gcp]`."
+        )
+
+
+def _create_table(project: str, instance_id: str, table_id: str):
+    # Data clients keep a pool of gRPC channels open and are thread safe, so
+    # one client per project is shared by all tables.
+    client = get_client("bigtable", bigtable_data.BigtableDataClient, project=project)
+    return client.get_table(instance_id, table_id)
+
+
+def _create_async_table(project: str, instance_id: str, table_id: str):
+    client = get_async_client(
+        "bigtable", bigtable_data.BigtableDataClientAsync, project=project
+    )
+    return client.get_table(instance_id, table_id)
+
+
+def _get_table(project: str, instance_id: str, table_id: str):
+    _check_installed()
+    return get_client(
+        "bigtable.table",
+        _create_table,
+        project=project,
+        instance_id=instance_id,
+        table_id=table_id,
+    )
+
+
+def _get_async_table(project: str, instance_id: str, table_id: str):
+    _check_installed()
+    return get_async_client(
+        "bigtable.table",
+        _create_async_table,
+        project=project,
+        instance_id=instance_id,
+        table_id=table_id,
+    )
+
+
+def _read_shards(table, queries, max_workers: int, max_queue_size: int) -> Iterator:
+    # Shards are read by a pool of threads. The bounded queue applies back
+    # pressure so at most ``max_queue_size`` rows are held in memory.
+    rows = queue.Queue(maxsize=max_queue_size)
+    shards = queue.Queue()
+    for query in queries:
+        shards.put(query)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                rows.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    query = shards.get_nowait()
+                except queue.Empty:
+                    break
+                for row in table.read_rows_stream(query):
+                    if not put(row):
+                        return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    threads = [
+        threading.Thread(target=read, daemon=True)
+        for _ in range(max(1, min(max_workers, len(queries))))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = rows.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+async def _aread_shards(
+    table, queries, max_concurrency: int, max_queue_size: int
+) -> AsyncIterator:
+    rows = asyncio.Queue(maxsize=max_queue_size)
+    shards = iter(queries)
+
+    async def read() -> None:
+        try:
+            for query in shards:
+                async for row in await table.read_rows_stream(query):
+                    await rows.put(row)
+            await rows.put(_DONE)
+        except Exception as e:
+            await rows.put(e)
+
+    tasks = [
+        asyncio.ensure_future(read())
+        for _ in range(max(1, min(max_concurrency, len(queries))))
+    ]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await rows.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 class BigTableInstance(GCPResource):
@@ -34,7 +175,7 @@ class BigTableInstance(GCPResource):
         resource_name: str,
         *,
         module_name: Optional[str] = None,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
     ) -> None:
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
         self.name: str = self._attributes["name"]
@@ -59,10 +200,17 @@ class BigTableTable(GCPResource):
         print(table.name)
         print(table.instance.name)
 
+        with table.mutations_batcher(flush_count=500) as batcher:
+            batcher.append(RowMutationEntry(b"row-key", [SetCell("cf", b"q", b"v")]))
+
+        for row in table.read_rows(max_workers=8):
+            print(row.row_key)
+
     Attributes:
         project (str): The project the resource belongs to.
         id (str): The id of the resource.
         name (str): The name of the table.
+        instance_name (str): The name of the instance the table belongs to.
         instance (BigTableInstance): The instance the table belongs to. Will only be
             populated if the instance also exists in the state file.
     """
@@ -74,13 +222,183 @@ class BigTableTable(GCPResource):
         resource_name: str,
         *,
         module_name: Optional[str] = None,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
     ) -> None:
         super().__init__(resource_name, state_file=state_file, module_name=module_name)
-        self.instance: Optional[BigTableInstance] = None
         self.name: str = self._attributes["name"]
-        for dependency in self._dependencies:
-            if dependency.startswith(BigTableInstance._terraform_type):
-                self.instance = BigTableInstance(
-                    dependency.split(".")[1], state_file=state_file
-                )
+        self.instance_name: str = self._attributes["instance_name"]
+        self.instance: Optional[BigTableInstance] = self._dependency(BigTableInstance)
+
+    def table(self) -> "bigtable_data.Table":
+        """Returns a data API table backed by a shared, pooled client.
+
+        Clients and tables are created once per project and reused, so calling
+        this repeatedly is cheap. The client connects to the Bigtable emulator
+        when ``BIGTABLE_EMULATOR_HOST`` is set.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Returns:
+            A ``google.cloud.bigtable.data.Table``.
+        """
+        return _get_table(self.project, self.instance_name, self.name)
+
+    async def atable(self) -> "bigtable_data.TableAsync":
+        """Returns an async data API table backed by a shared, pooled client.
+
+        The asyncio version of :meth:`table`, one client is kept per event loop.
+
+        Returns:
+            A ``google.cloud.bigtable.data.TableAsync``.
+        """
+        return _get_async_table(self.project, self.instance_name, self.name)
+
+    def mutations_batcher(
+        self,
+        flush_count: Optional[int] = 1000,
+        flush_bytes: int = 20 * 1024 * 1024,
+        flush_interval: Optional[float] = 5,
+        **kwargs,
+    ) -> "bigtable_data.MutationsBatcher":
+        """Returns a batcher that groups row mutations into bulk requests.
+
+        A batch is flushed when it holds ``flush_count`` mutations,
+        ``flush_bytes`` bytes or when ``flush_interval`` seconds have passed,
+        whichever comes first. Use it as a context manager to flush and close
+        it when done.
+
+        Example
+        -------
+        .. code:: python
+
+            from google.cloud.bigtable.data import RowMutationEntry, SetCell
+
+            with table.mutations_batcher(flush_count=500, flush_interval=1) as b:
+                for key, value in items:
+                    b.append(RowMutationEntry(key, [SetCell("cf", b"q", value)]))
+
+        Parameters:
+            flush_count: The number of mutations that triggers a flush, or
+                ``None`` for no limit.
+            flush_bytes: The size in bytes that triggers a flush.
+            flush_interval: The maximum number of seconds between flushes, or
+                ``None`` to only flush on size.
+            **kwargs: Additional arguments passed to
+                ``google.cloud.bigtable.data.Table.mutations_batcher``.
+
+        Returns:
+            A ``google.cloud.bigtable.data.MutationsBatcher``.
+        """
+        return self.table().mutations_batcher(
+            flush_interval=flush_interval,
+            flush_limit_mutation_count=flush_count,
+            flush_limit_bytes=flush_bytes,
+            **kwargs,
+        )
+
+    async def amutations_batcher(
+        self,
+        flush_count: Optional[int] = 1000,
+        flush_bytes: int = 20 * 1024 * 1024,
+        flush_interval: Optional[float] = 5,
+        **kwargs,
+    ) -> "bigtable_data.MutationsBatcherAsync":
+        """Returns an async batcher that groups row mutations into bulk requests.
+
+        The asyncio version of :meth:`mutations_batcher`.
+
+        Example
+        -------
+        .. code:: python
+
+            async with await table.amutations_batcher(flush_count=500) as b:
+                await b.append(RowMutationEntry(key, [SetCell("cf", b"q", value)]))
+
+        Returns:
+            A ``google.cloud.bigtable.data.MutationsBatcherAsync``.
+        """
+        table = await self.atable()
+        return table.mutations_batcher(
+            flush_interval=flush_interval,
+            flush_limit_mutation_count=flush_count,
+            flush_limit_bytes=flush_bytes,
+            **kwargs,
+        )
+
+    def read_rows(
+        self,
+        query: Optional["bigtable_data.ReadRowsQuery"] = None,
+        *,
+        max_workers: int = 1,
+        max_queue_size: int = 1000,
+    ) -> Iterator["bigtable_data.Row"]:
+        """Streams rows from the table.
+
+        With ``max_workers`` greater than one the query is split into shards at
+        the table's sampled row keys and the shards are read by a pool of
+        threads. Rows are yielded as they arrive, so rows from different shards
+        are interleaved and no longer sorted by key.
+
+        Example
+        -------
+        .. code:: python
+
+            from google.cloud.bigtable.data import ReadRowsQuery, RowRange
+
+            query = ReadRowsQuery(row_ranges=RowRange(b"user#", b"user$"))
+            for row in table.read_rows(query, max_workers=8):
+                print(row.row_key)
+
+        Parameters:
+            query: The rows to read, defaults to the whole table.
+            max_workers: The number of shards read in parallel.
+            max_queue_size: The maximum number of rows buffered in memory when
+                reading in parallel.
+
+        Returns:
+            An iterator of ``google.cloud.bigtable.data.Row``.
+        """
+        table = self.table()
+        query = query or bigtable_data.ReadRowsQuery()
+        if max_workers <= 1:
+            return iter(table.read_rows_stream(query))
+        queries = query.shard(table.sample_row_keys())
+        return _read_shards(table, queries, max_workers, max_queue_size)
+
+    async def aread_rows(
+        self,
+        query: Optional["bigtable_data.ReadRowsQuery"] = None,
+        *,
+        max_concurrency: int = 1,
+        max_queue_size: int = 1000,
+    ) -> AsyncIterator["bigtable_data.Row"]:
+        """Streams rows from the table.
+
+        The asyncio version of :meth:`read_rows`, shards are read by
+        ``max_concurrency`` concurrent tasks.
+
+        Example
+        -------
+        .. code:: python
+
+            async for row in table.aread_rows(max_concurrency=8):
+                print(row.row_key)
+
+        Parameters:
+            query: The rows to read, defaults to the whole table.
+            max_concurrency: The number of shards read concurrently.
+            max_queue_size: The maximum number of rows buffered in memory when
+                reading concurrently.
+
+        Returns:
+            An async iterator of ``google.cloud.bigtable.data.Row``.
+        """
+        table = await self.atable()
+        query = query or bigtable_data.ReadRowsQuery()
+        if max_concurrency <= 1:
+            async for row in await table.read_rows_stream(query):
+                yield row
+            return
+        queries = query.shard(await table.sample_row_keys())
+        async for row in _aread_shards(table, queries, max_concurrency, max_queue_size):
+            yield row
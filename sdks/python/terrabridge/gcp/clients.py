@@ -0,0 +1,212 @@
+import asyncio
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from terrabridge._clients import ProcessCache, close_all, freeze, register
+
+T = TypeVar("T")
+
+
+class ClientRegistry(ProcessCache):
+    """Shares Google Cloud clients across all resources in the process.
+
+    Clients are keyed by service name, credentials and client options, so all
+    resources using the same service share one client and with it one gRPC
+    channel or HTTP connection pool. Async clients are bound to the event loop
+    they were created on, so one is kept per loop.
+
+    The registry is fork safe: a child process never reuses a client inherited
+    from its parent, new clients are created on first use after ``os.fork()``.
+    Clients of the default registry are closed when the interpreter exits.
+
+    Example
+    -------
+    .. code:: python
+
+        from google.cloud import storage
+        from terrabridge.gcp.clients import ClientRegistry
+
+        with ClientRegistry() as registry:
+            client = registry.get("storage", storage.Client, project="my-project")
+
+    Attributes:
+        pid (int): The id of the process the clients were created in.
+    """
+
+    def _clear(self) -> None:
+        self._clients: Dict[Hashable, Any] = {}
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get(
+        self,
+        service: str,
+        factory: Callable[..., T],
+        *,
+        credentials: Any = None,
+        **options,
+    ) -> T:
+        """Returns the shared client for a service, creating it if needed.
+
+        Parameters:
+            service: The name of the service, clients of different services are
+                never shared.
+            factory: Creates the client, it is called with ``credentials`` if
+                given and the options as keyword arguments.
+            credentials: The credentials of the client, defaults to the
+                application default credentials.
+            **options: Options passed to ``factory``, clients with different
+                options are not shared.
+
+        Returns:
+            The shared client.
+        """
+        self._check_pid()
+        key = (service, credentials, freeze(options))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    if credentials is not None:
+                        options["credentials"] = credentials
+                    client = factory(**options)
+                    self._clients[key] = client
+        return client
+
+    def get_async(
+        self,
+        service: str,
+        factory: Callable[..., T],
+        *,
+        credentials: Any = None,
+        **options,
+    ) -> T:
+        """Returns the shared async client for a service on the running loop.
+
+        Takes the same parameters as :meth:`get`, but must be called from a
+        coroutine.
+
+        Returns:
+            The shared client for the running event loop.
+        """
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        clients = self._async_clients.setdefault(loop, {})
+        key = (service, credentials, freeze(options))
+        client = clients.get(key)
+        if client is None:
+            if credentials is not None:
+                options["credentials"] = credentials
+            client = factory(**options)
+            clients[key] = client
+        return client
+
+    def discard(
+        self, service: str, *, credentials: Any = None, **options
+    ) -> Optional[Any]:
+        """Removes a client from the registry without closing it.
+
+        The next call to :meth:`get` with the same arguments creates a new
+        client. The removed client is not closed since other threads may still
+        be using it, it is closed when garbage collected.
+
+        Parameters:
+            service: The name of the service.
+            credentials: The credentials the client was created with.
+            **options: The options the client was created with.
+
+        Returns:
+            The removed client, or ``None`` if there was none.
+        """
+        self._check_pid()
+        with self._lock:
+            return self._clients.pop((service, credentials, freeze(options)), None)
+
+    def close(self) -> None:
+        """Closes all clients and removes them from the registry.
+
+        Clients are closed in the reverse order they were created in. Async
+        clients cannot be closed outside their event loop, they are only removed
+        from the registry; use :meth:`aclose` to close them. Every client is
+        closed even if some fail, the first error is raised at the end.
+        """
+        self._check_pid()
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clear()
+        close_all(reversed(clients), _close)
+
+    async def aclose(self) -> None:
+        """Closes the async clients of the running event loop.
+
+        Every client is closed even if some fail, the first error is raised at
+        the end.
+        """
+        self._check_pid()
+        clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        errors = []
+        for client in reversed(list(clients.values())):
+            try:
+                if hasattr(client, "__aexit__"):
+                    await client.__aexit__(None, None, None)
+                elif hasattr(client, "close"):
+                    await client.close()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def __aenter__(self) -> "ClientRegistry":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+        self.close()
+
+
+def _close(client: Any) -> None:
+    if hasattr(client, "__exit__"):
+        client.__exit__(None, None, None)
+    elif hasattr(client, "close"):
+        client.close()
+
+
+registry = ClientRegistry()
+"""The registry shared by all terrabridge resources."""
+
+
+def get_client(
+    service: str, factory: Callable[..., T], *, credentials: Any = None, **options
+) -> T:
+    """Returns a client from the default registry, see :meth:`ClientRegistry.get`."""
+    return registry.get(service, factory, credentials=credentials, **options)
+
+
+def get_async_client(
+    service: str, factory: Callable[..., T], *, credentials: Any = None, **options
+) -> T:
+    """Returns an async client from the default registry.
+
+    See :meth:`ClientRegistry.get_async`.
+    """
+    return registry.get_async(service, factory, credentials=credentials, **options)
+
+
+def close_clients() -> None:
+    """Closes all clients in the default registry.
+
+    Resources create new clients the next time they are used, so this is safe to
+    call at any point, for example when a worker shuts down or before forking.
+    """
+    registry.close()
+
+
+async def aclose_clients() -> None:
+    """Closes the default registry's async clients of the running event loop."""
+    await registry.aclose()
+
+
+register(registry)
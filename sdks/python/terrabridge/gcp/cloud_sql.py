@@ -1,5 +1,20 @@
-from typing import Optional
+import asyncio
+import atexit
+import dataclasses
+import functools
+import hashlib
+import importlib.util
+import inspect
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+from terrabridge._clients import freeze
 from terrabridge.gcp.base import GCPResource
 
 try:
@@ -8,6 +23,12 @@ except ImportError:
     Connector = None
     IPTypes = None
     create_async_connector = None
+try:
+    from google.cloud.sql.connector.connector import (
+        ASYNC_DRIVERS as _CONNECTOR_ASYNC_DRIVERS,
+    )
+except ImportError:
+    _CONNECTOR_ASYNC_DRIVERS = ()
 try:
     import asyncpg
 except ImportError:
@@ -25,13 +46,484 @@ try:
 except ImportError:
     pytds = None
 try:
-    from sqlalchemy import Engine, create_engine
+    from sqlalchemy import Engine, create_engine, event, text
     from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 except ImportError:
     create_engine = None
     Engine = None
+    event = None
+    text = None
     create_async_engine = None
     AsyncEngine = None
+    AsyncAdaptedQueuePool = None
+    QueuePool = None
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool settings for engines returned by :class:`CloudSQLDatabase`.
+
+    These map directly to the pool arguments of ``sqlalchemy.create_engine``.
+
+    Attributes:
+        pool_size (int): The number of connections to keep open in the pool.
+        max_overflow (int): The number of connections to allow beyond ``pool_size``.
+        pool_timeout (float): Seconds to wait for a connection before giving up.
+        pool_recycle (int): Seconds after which a connection is replaced, or -1
+            to never recycle connections.
+        pool_pre_ping (bool): Whether to test connections for liveness on checkout.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+
+
+# Pool sizing presets that can be passed by name as the ``pool`` argument of
+# CloudSQLDatabase engines.
+POOL_PRESETS: Dict[str, PoolSettings] = {
+    # Small, mostly idle services such as Cloud Run instances with low
+    # concurrency. Connections are recycled before Cloud SQL's idle timeouts.
+    "serverless": PoolSettings(
+        pool_size=2, max_overflow=2, pool_recycle=1800, pool_pre_ping=True
+    ),
+    "default": PoolSettings(),
+    # Busy services that keep many requests in flight at once.
+    "high_concurrency": PoolSettings(
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    ),
+}
+
+
+# Process wide registry of Cloud SQL connectors and the engines built on top of
+# them. Each connector runs its own background refresh of certificates and
+# instance metadata, so we only ever want one per IP type (or per event loop for
+# async connectors). Async connectors, engines and pools are keyed by their
+# event loop so they go away with it.
+_registry_lock = threading.RLock()
+_connectors: Dict[Any, Any] = {}
+_engines: Dict[Tuple, Any] = {}
+_async_connectors: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+_async_engines: "weakref.WeakKeyDictionary[Any, Dict[Tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_asyncpg_pools: "weakref.WeakKeyDictionary[Any, Dict[Tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _resolve_pool(pool: Union[str, PoolSettings, None]) -> Optional[PoolSettings]:
+    if isinstance(pool, str):
+        try:
+            return POOL_PRESETS[pool]
+        except KeyError:
+            raise ValueError(
+                f"Unknown pool preset: {pool}. "
+                f"Available presets: {list(POOL_PRESETS.keys())}"
+            )
+    return pool
+
+
+def _pool_params(
+    pool: Optional[PoolSettings], engine_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    if pool is None:
+        return engine_params
+    return {**dataclasses.asdict(pool), **engine_params}
+
+
+def _get_connector(ip_type):
+    with _registry_lock:
+        if ip_type not in _connectors:
+            _connectors[ip_type] = Connector(ip_type)
+        return _connectors[ip_type]
+
+
+def _drop_closed_loops() -> None:
+    # Connectors keep a reference to their loop, so entries of loops that were
+    # closed without calling adispose_engines are never collected on their own.
+    for registry in (_async_connectors, _async_engines, _asyncpg_pools):
+        for loop in [loop for loop in registry.keys() if loop.is_closed()]:
+            registry.pop(loop, None)
+
+
+async def _get_async_connector():
+    loop = asyncio.get_running_loop()
+    if loop not in _async_connectors:
+        _drop_closed_loops()
+        connector = await create_async_connector()
+        if loop in _async_connectors:
+            # Another task created a connector while we were awaiting ours.
+            await connector.close_async()
+        else:
+            _async_connectors[loop] = connector
+    return _async_connectors[loop]
+
+
+def _async_mysql_driver() -> Optional[str]:
+    # The Cloud SQL connector can only open connections for the async drivers it
+    # knows about, so only use a native async MySQL driver if both the connector
+    # and the environment support it.
+    for driver in ("asyncmy", "aiomysql"):
+        if (
+            driver in _CONNECTOR_ASYNC_DRIVERS
+            and importlib.util.find_spec(driver) is not None
+        ):
+            return driver
+    return None
+
+
+def _buffered(result):
+    # Rows must be fetched on the worker thread, never on the event loop.
+    if result.returns_rows:
+        return result.freeze()()
+    return result
+
+
+class ThreadedAsyncConnection:
+    """An asyncio wrapper around a synchronous SQLAlchemy ``Connection``.
+
+    Returned by :meth:`ThreadedAsyncEngine.connect`. Every call runs on the
+    engine's worker threads and results are fully buffered before being returned.
+    """
+
+    def __init__(self, engine: "ThreadedAsyncEngine") -> None:
+        self.engine = engine
+        self.sync_connection = None
+
+    async def _run(self, fn: Callable, *args, **kwargs):
+        return await self.engine._run(fn, *args, **kwargs)
+
+    async def start(self) -> "ThreadedAsyncConnection":
+        """Checks out a connection from the pool."""
+        if self.sync_connection is None:
+            self.sync_connection = await self._run(self.engine.sync_engine.connect)
+        return self
+
+    async def execute(self, statement, parameters=None, **kwargs):
+        """Executes a statement and returns a buffered result."""
+        return await self._run(
+            lambda: _buffered(
+                self.sync_connection.execute(statement, parameters, **kwargs)
+            )
+        )
+
+    async def scalar(self, statement, parameters=None, **kwargs):
+        """Executes a statement and returns the first column of the first row."""
+        return await self._run(
+            self.sync_connection.scalar, statement, parameters, **kwargs
+        )
+
+    async def run_sync(self, fn: Callable, *args, **kwargs):
+        """Runs ``fn(sync_connection, *args, **kwargs)`` on a worker thread."""
+        return await self._run(fn, self.sync_connection, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_connection.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_connection.rollback)
+
+    async def close(self) -> None:
+        """Returns the connection to the pool."""
+        if self.sync_connection is not None:
+            await self._run(self.sync_connection.close)
+            self.sync_connection = None
+
+    async def __aenter__(self) -> "ThreadedAsyncConnection":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class _ThreadedBegin:
+    def __init__(self, engine: "ThreadedAsyncEngine") -> None:
+        self.connection = ThreadedAsyncConnection(engine)
+
+    async def __aenter__(self) -> ThreadedAsyncConnection:
+        return await self.connection.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.connection.commit()
+            else:
+                await self.connection.rollback()
+        finally:
+            await self.connection.close()
+
+
+class ThreadedAsyncEngine:
+    """An asyncio interface over a synchronous SQLAlchemy engine.
+
+    Returned by :meth:`CloudSQLDatabase.async_sqlalchemy_engine` for databases
+    that have no async driver supported by the Cloud SQL connector. Blocking calls
+    run on a dedicated thread pool, sized to match the engine's connection pool, so
+    the event loop is never blocked.
+
+    It mirrors the commonly used parts of ``sqlalchemy.ext.asyncio.AsyncEngine``:
+
+    .. code:: python
+
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT 1"))
+
+        async with engine.begin() as conn:
+            await conn.execute(insert(table).values(name="terrabridge"))
+
+    Attributes:
+        sync_engine (Engine): The wrapped synchronous engine.
+    """
+
+    def __init__(self, sync_engine: Engine, max_workers: int = 15) -> None:
+        self.sync_engine = sync_engine
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="terrabridge-sql"
+        )
+
+    async def _run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def connect(self) -> ThreadedAsyncConnection:
+        """Returns a connection that is checked out when entered or started."""
+        return ThreadedAsyncConnection(self)
+
+    def begin(self) -> _ThreadedBegin:
+        """Returns a context manager that commits on success and rolls back on error."""
+        return _ThreadedBegin(self)
+
+    async def dispose(self) -> None:
+        """Closes all pooled connections and stops the worker threads."""
+        await self._run(self.sync_engine.dispose)
+        self._executor.shutdown(wait=False)
+
+
+class PoolMetrics:
+    """Connection pool metrics for an engine returned by :class:`CloudSQLDatabase`.
+
+    Fetch the metrics for an engine with :func:`pool_metrics`.
+
+    Attributes:
+        checkouts (int): The number of connections checked out of the pool.
+        connects (int): The number of new database connections opened.
+        invalidations (int): The number of connections invalidated, for example
+            because they were disconnected or failed a pre-ping.
+    """
+
+    # Number of recent checkout latencies kept for percentiles.
+    _SAMPLES = 1024
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self._SAMPLES)
+        self._max_latency = 0.0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def _record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._latencies.append(seconds)
+            self._max_latency = max(self._max_latency, seconds)
+
+    def _record_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _record_invalidation(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns the current metrics.
+
+        Latencies are in seconds. ``checkout_latency_p50`` and
+        ``checkout_latency_p99`` are computed over the most recent checkouts,
+        and include the time spent opening a new connection when the pool had
+        none available.
+        """
+        pool = self._engine.pool
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "checkout_latency_max": self._max_latency,
+            }
+        for name, quantile in (("p50", 0.5), ("p99", 0.99)):
+            stats[f"checkout_latency_{name}"] = (
+                latencies[min(int(len(latencies) * quantile), len(latencies) - 1)]
+                if latencies
+                else 0.0
+            )
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+        return stats
+
+
+class _MeteredPoolMixin:
+    # Times checkouts, including opening new connections. The metrics object is
+    # carried over when the pool is recreated by ``engine.dispose()``.
+    _terrabridge_metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        conn = super()._do_get()
+        if self._terrabridge_metrics is not None:
+            self._terrabridge_metrics._record_checkout(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool._terrabridge_metrics = self._terrabridge_metrics
+        return pool
+
+
+if QueuePool is not None:
+
+    class _MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+        pass
+
+    class _MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+        pass
+
+
+# Metrics for every engine created by the registry, keyed by the sync engine.
+_pool_metrics: "weakref.WeakKeyDictionary[Engine, PoolMetrics]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _instrument(engine: Engine) -> PoolMetrics:
+    # Only the pools created by terrabridge are instrumented, engines created
+    # with a custom ``poolclass`` report empty metrics.
+    metrics = PoolMetrics(engine)
+    if isinstance(engine.pool, _MeteredPoolMixin):
+        engine.pool._terrabridge_metrics = metrics
+        event.listen(engine.pool, "connect", metrics._record_connect)
+        event.listen(engine.pool, "invalidate", metrics._record_invalidation)
+        event.listen(engine.pool, "soft_invalidate", metrics._record_invalidation)
+    _pool_metrics[engine] = metrics
+    return metrics
+
+
+def pool_metrics(
+    engine: Union[Engine, AsyncEngine, ThreadedAsyncEngine]
+) -> PoolMetrics:
+    """Returns the pool metrics of an engine returned by :class:`CloudSQLDatabase`.
+
+    Example
+    -------
+    .. code:: python
+
+        engine = database.sqlalchemy_engine(user)
+        print(pool_metrics(engine).snapshot())
+
+    Parameters:
+        engine: The engine to fetch metrics for.
+
+    Returns:
+        The engine's pool metrics.
+    """
+    try:
+        return _pool_metrics[getattr(engine, "sync_engine", engine)]
+    except KeyError:
+        raise ValueError("Engine was not created by a CloudSQLDatabase.")
+
+
+def warmup_engine(engine: Engine, n: Optional[int] = None) -> None:
+    """Opens and validates ``n`` pooled connections in parallel.
+
+    Connections are held open together so the pool keeps ``n`` distinct
+    connections, each validated with ``SELECT 1``, and are then returned to the
+    pool. ``n`` defaults to, and is capped at, the pool size since connections
+    beyond it are discarded when they are returned.
+
+    Parameters:
+        engine: The engine whose pool should be warmed up.
+        n: The number of connections to open.
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else None
+    if n is None or (size is not None and n > size):
+        n = size or 1
+    if n <= 0:
+        return
+
+    def checkout():
+        conn = engine.connect()
+        try:
+            conn.execute(text("SELECT 1"))
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="warmup") as executor:
+        futures = [executor.submit(checkout) for _ in range(n)]
+    errors = []
+    for future in futures:
+        if future.exception() is not None:
+            errors.append(future.exception())
+        else:
+            future.result().close()
+    if errors:
+        raise errors[0]
+
+
+async def awarmup_engine(
+    engine: Union[AsyncEngine, ThreadedAsyncEngine], n: Optional[int] = None
+) -> None:
+    """Opens and validates ``n`` pooled connections in parallel.
+
+    The asyncio version of :func:`warmup_engine`.
+
+    Parameters:
+        engine: The engine whose pool should be warmed up.
+        n: The number of connections to open.
+    """
+    if isinstance(engine, ThreadedAsyncEngine):
+        await engine._run(warmup_engine, engine.sync_engine, n)
+        return
+    pool = engine.sync_engine.pool
+    size = pool.size() if hasattr(pool, "size") else None
+    if n is None or (size is not None and n > size):
+        n = size or 1
+    if n <= 0:
+        return
+
+    async def checkout():
+        conn = await engine.connect().start()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+
+    results = await asyncio.gather(
+        *(checkout() for _ in range(n)), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    if errors:
+        raise errors[0]
 
 
 class CloudSQLInstance(GCPResource):
@@ -116,12 +608,9 @@ class CloudSQLUser(GCPResource):
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
         self.name = self._attributes["name"]
         self.password = self._attributes["password"]
-        self.cloud_sql_instance: Optional[CloudSQLInstance] = None
-        for dependency in self._dependencies:
-            if dependency.startswith(CloudSQLInstance._terraform_type):
-                self.cloud_sql_instance = CloudSQLInstance(
-                    dependency.split(".")[1], state_file=state_file
-                )
+        self.cloud_sql_instance: Optional[CloudSQLInstance] = self._dependency(
+            CloudSQLInstance
+        )
 
 
 class CloudSQLDatabase(GCPResource):
@@ -166,15 +655,37 @@ class CloudSQLDatabase(GCPResource):
     ) -> None:
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
         self.name: str = self._attributes["name"]
-        self.cloud_sql_instance: Optional[CloudSQLInstance] = None
-        for dependency in self._dependencies:
-            if dependency.startswith(CloudSQLInstance._terraform_type):
-                self.cloud_sql_instance = CloudSQLInstance(
-                    dependency.split(".")[1], state_file=state_file
-                )
+        self.cloud_sql_instance: Optional[CloudSQLInstance] = self._dependency(
+            CloudSQLInstance
+        )
+
+    def _engine_key(
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes,
+        driver: str,
+        pool: Optional[PoolSettings],
+        engine_params: Dict[str, Any],
+    ) -> Tuple:
+        # The password is part of the key so a rotated credential gets a new
+        # engine instead of one that can no longer authenticate.
+        return (
+            self.cloud_sql_instance.connection_name,
+            user.name,
+            hashlib.sha256(user.password.encode()).hexdigest(),
+            self.name,
+            ip_type,
+            driver,
+            pool,
+            freeze(engine_params),
+        )
 
     def sqlalchemy_engine(
-        self, user: CloudSQLUser, ip_type: IPTypes = IPTypes.PUBLIC, **engine_params
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
     ) -> Engine:
         """Returns a SQLAlchemy engine for the database.
 
@@ -185,9 +696,18 @@ class CloudSQLDatabase(GCPResource):
         * ``SQLSERVER``: ``pytds``
         * ``MYSQL``: ``pymysql``
 
+        Engines are cached for the lifetime of the process, keyed by the instance,
+        user and password, database, IP type, driver and engine settings, so
+        calling this from several places returns the same engine and connection
+        pool, and a rotated password gets a new engine. All engines
+        share a single Cloud SQL ``Connector`` per IP type. Call
+        :func:`dispose_engines` to release them early.
+
         Parameters:
             user: The user to connect to the database with.
             ip_type: The type of IP address to connect with and.
+            pool: Connection pool settings for the engine, or the name of one of
+                the :data:`POOL_PRESETS`.
             engine_params: Additional parameters to pass to the SQLAlchemy engine.
 
         Returns:
@@ -231,34 +751,70 @@ class CloudSQLDatabase(GCPResource):
             raise NotImplementedError(
                 f"Unknown database version: {self.cloud_sql_instance.database_version}"
             )
-        connector = Connector(ip_type)
+        pool = _resolve_pool(pool)
+        key = self._engine_key(user, ip_type, driver, pool, engine_params)
+        with _registry_lock:
+            engine = _engines.get(key)
+            if engine is not None:
+                return engine
+            _get_connector(ip_type)
 
-        def getconn() -> pytds.Connection:
-            conn = connector.connect(
-                self.cloud_sql_instance.connection_name,
-                driver,
-                user=user.name,
-                password=user.password,
-                db=self.name,
-            )
-            return conn
+            def getconn() -> pytds.Connection:
+                # The connector is looked up on every connect so engines keep
+                # working after a fork replaced it.
+                conn = _get_connector(ip_type).connect(
+                    self.cloud_sql_instance.connection_name,
+                    driver,
+                    user=user.name,
+                    password=user.password,
+                    db=self.name,
+                )
+                return conn
 
-        return create_engine(url, creator=getconn, *engine_params)
+            engine = create_engine(
+                url,
+                creator=getconn,
+                **_pool_params(pool, {"poolclass": _MeteredQueuePool, **engine_params}),
+            )
+            _instrument(engine)
+            _engines[key] = engine
+            return engine
 
     async def async_sqlalchemy_engine(
-        self, user: CloudSQLUser, ip_type: IPTypes = IPTypes.PUBLIC, **engine_params
-    ) -> AsyncEngine:
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> Union[AsyncEngine, ThreadedAsyncEngine]:
         """Returns a SQLAlchemy engine for the database.
 
-        Requires ``terrabridge[gcp]`` and ``sqlalchemy[asyncio]`` to be installed.
+        Requires ``terrabridge[gcp]`` and ``sqlalchemy[asyncio]`` to be installed, and
+        whatever driver is needed for the database version.
+
+        * ``POSTGRES``: ``asyncpg``
+        * ``MYSQL``: ``asyncmy`` or ``aiomysql`` when supported by the installed
+          Cloud SQL connector, otherwise ``pymysql``
+        * ``SQLSERVER``: ``pytds``
+
+        Drivers without native asyncio support are served by a
+        :class:`ThreadedAsyncEngine`, which runs the engine returned by
+        :meth:`sqlalchemy_engine` on a thread pool.
+
+        Engines are cached per event loop, keyed the same way as
+        :meth:`sqlalchemy_engine`, and share a single async Cloud SQL connector per
+        event loop. Call :func:`adispose_engines` before the loop shuts down to
+        release them.
 
         Parameters:
             user: The user to connect to the database with.
             ip_type: The type of IP address to connect with and.
+            pool: Connection pool settings for the engine, or the name of one of
+                the :data:`POOL_PRESETS`.
             engine_params: Additional parameters to pass to the SQLAlchemy engine.
 
         Returns:
-            A SQLAlchemy engine.
+            A SQLAlchemy engine, or a :class:`ThreadedAsyncEngine`.
         """
         if create_async_engine is None:
             raise ImportError(
@@ -270,10 +826,12 @@ class CloudSQLDatabase(GCPResource):
                 "google-cloud-sql-connector is not installed. "
                 "Please install it with `pip install terrabridge[gcp]`."
             )
-        connector = await create_async_connector()
 
         if self.cloud_sql_instance.database_version.startswith("MYSQL"):
-            raise NotImplementedError("async engine with mysql is not implemented")
+            driver = _async_mysql_driver()
+            if driver is None:
+                return self._threaded_async_engine(user, ip_type, pool, engine_params)
+            url = f"mysql+{driver}://"
         elif self.cloud_sql_instance.database_version.startswith("POSTGRES"):
             if asyncpg is None:
                 raise ImportError(
@@ -283,11 +841,27 @@ class CloudSQLDatabase(GCPResource):
             driver = "asyncpg"
             url = "postgresql+asyncpg://"
         elif self.cloud_sql_instance.database_version.startswith("SQLSERVER"):
-            raise NotImplementedError("async engine with sqlserver is not implemented")
+            return self._threaded_async_engine(user, ip_type, pool, engine_params)
+        else:
+            raise NotImplementedError(
+                f"Unknown database version: {self.cloud_sql_instance.database_version}"
+            )
 
-        # initialize Connector object for connections to Cloud SQL
-        async def getconn() -> asyncpg.Connection:
-            conn: asyncpg.Connection = await connector.connect_async(
+        pool = _resolve_pool(pool)
+        loop = asyncio.get_running_loop()
+        key = self._engine_key(user, ip_type, driver, pool, engine_params)
+        engine = _async_engines.get(loop, {}).get(key)
+        if engine is not None:
+            return engine
+        connector = await _get_async_connector()
+        # Another task may have built the engine while we awaited the connector.
+        engines = _async_engines.setdefault(loop, {})
+        engine = engines.get(key)
+        if engine is not None:
+            return engine
+
+        async def getconn():
+            conn = await connector.connect_async(
                 instance_connection_string=self.cloud_sql_instance.connection_name,
                 driver=driver,
                 user=user.name,
@@ -297,4 +871,247 @@ class CloudSQLDatabase(GCPResource):
             )
             return conn
 
-        return create_async_engine(url, async_creator=getconn, **engine_params)
+        engine = create_async_engine(
+            url,
+            async_creator=getconn,
+            **_pool_params(
+                pool, {"poolclass": _MeteredAsyncAdaptedQueuePool, **engine_params}
+            ),
+        )
+        _instrument(engine.sync_engine)
+        engines[key] = engine
+        return engine
+
+    def _threaded_async_engine(
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes,
+        pool: Union[str, PoolSettings, None],
+        engine_params: Dict[str, Any],
+    ) -> ThreadedAsyncEngine:
+        sync_engine = self.sqlalchemy_engine(user, ip_type, pool, **engine_params)
+        engines = _async_engines.setdefault(asyncio.get_running_loop(), {})
+        if sync_engine not in engines:
+            params = _pool_params(_resolve_pool(pool), engine_params)
+            max_workers = max(
+                params.get("pool_size", 5) + max(params.get("max_overflow", 10), 0), 1
+            )
+            engines[sync_engine] = ThreadedAsyncEngine(sync_engine, max_workers)
+        return engines[sync_engine]
+
+    async def asyncpg_pool(
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        *,
+        min_size: int = 10,
+        max_size: int = 10,
+        statement_cache_size: int = 100,
+        max_queries: int = 50000,
+        max_inactive_connection_lifetime: float = 300.0,
+        **pool_params,
+    ) -> "asyncpg.Pool":
+        """Returns a native ``asyncpg`` connection pool for a Postgres database.
+
+        Connections are opened through the Cloud SQL connector, skipping
+        SQLAlchemy entirely for latency critical code paths. Pools are cached per
+        event loop, keyed the same way as :meth:`sqlalchemy_engine`, and are closed
+        by :func:`adispose_engines`.
+
+        Requires ``terrabridge[gcp]`` and ``asyncpg>=0.30.0`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            pool = await database.asyncpg_pool(user, min_size=2, max_size=20)
+            async with pool.acquire() as conn:
+                print(await conn.fetchval("SELECT 1"))
+
+        Parameters:
+            user: The user to connect to the database with.
+            ip_type: The type of IP address to connect with and.
+            min_size: The number of connections the pool is initialized with.
+            max_size: The maximum number of connections in the pool.
+            statement_cache_size: The size of each connection's prepared
+                statement cache, 0 disables the cache.
+            max_queries: The number of queries after which a connection is closed
+                and replaced.
+            max_inactive_connection_lifetime: Seconds after which an idle
+                connection is closed, 0 keeps idle connections open.
+            pool_params: Additional parameters to pass to ``asyncpg.create_pool``.
+
+        Returns:
+            An ``asyncpg`` pool.
+        """
+        if asyncpg is None:
+            raise ImportError(
+                "asyncpg is not installed. Please install "
+                "it with `pip install asyncpg`."
+            )
+        if "connect" not in inspect.signature(asyncpg.create_pool).parameters:
+            raise ImportError(
+                "asyncpg>=0.30.0 is required for connection pools. Please upgrade "
+                "it with `pip install --upgrade asyncpg`."
+            )
+        if Connector is None:
+            raise ImportError(
+                "google-cloud-sql-connector is not installed. "
+                "Please install it with `pip install terrabridge[gcp]`."
+            )
+        if not self.cloud_sql_instance.database_version.startswith("POSTGRES"):
+            raise NotImplementedError(
+                "asyncpg pools are only supported for Postgres databases, got: "
+                f"{self.cloud_sql_instance.database_version}"
+            )
+        params = dict(
+            min_size=min_size,
+            max_size=max_size,
+            statement_cache_size=statement_cache_size,
+            max_queries=max_queries,
+            max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+            **pool_params,
+        )
+        loop = asyncio.get_running_loop()
+        key = self._engine_key(user, ip_type, "asyncpg", None, params)
+        pool = _asyncpg_pools.get(loop, {}).get(key)
+        if pool is not None:
+            return pool
+        connector = await _get_async_connector()
+
+        async def connect(*args, **connect_kwargs) -> asyncpg.Connection:
+            # asyncpg passes its own connection arguments (statement cache size,
+            # connection class, etc.) which we forward through the connector.
+            return await connector.connect_async(
+                instance_connection_string=self.cloud_sql_instance.connection_name,
+                driver="asyncpg",
+                user=user.name,
+                password=user.password,
+                db=self.name,
+                ip_type=ip_type,
+                **connect_kwargs,
+            )
+
+        pool = await asyncpg.create_pool(connect=connect, **params)
+        pools = _asyncpg_pools.setdefault(loop, {})
+        if key in pools:
+            # Another task created a pool while we were initializing ours.
+            await pool.close()
+        else:
+            pools[key] = pool
+        return pools[key]
+
+    def warmup(
+        self,
+        user: CloudSQLUser,
+        n: Optional[int] = None,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> Engine:
+        """Returns the engine from :meth:`sqlalchemy_engine` with a warm pool.
+
+        Opens and validates ``n`` connections in parallel so the first requests
+        after a deploy don't pay for the certificate fetch, TLS handshake and
+        database authentication. See :func:`warmup_engine`.
+
+        Parameters:
+            user: The user to connect to the database with.
+            n: The number of connections to open, defaults to the pool size.
+            ip_type: The type of IP address to connect with and.
+            pool: Connection pool settings for the engine, or the name of one of
+                the :data:`POOL_PRESETS`.
+            engine_params: Additional parameters to pass to the SQLAlchemy engine.
+
+        Returns:
+            A SQLAlchemy engine.
+        """
+        engine = self.sqlalchemy_engine(user, ip_type, pool, **engine_params)
+        warmup_engine(engine, n)
+        return engine
+
+    async def awarmup(
+        self,
+        user: CloudSQLUser,
+        n: Optional[int] = None,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> Union[AsyncEngine, ThreadedAsyncEngine]:
+        """Returns the engine from :meth:`async_sqlalchemy_engine` with a warm pool.
+
+        The asyncio version of :meth:`warmup`.
+
+        Parameters:
+            user: The user to connect to the database with.
+            n: The number of connections to open, defaults to the pool size.
+            ip_type: The type of IP address to connect with and.
+            pool: Connection pool settings for the engine, or the name of one of
+                the :data:`POOL_PRESETS`.
+            engine_params: Additional parameters to pass to the SQLAlchemy engine.
+
+        Returns:
+            A SQLAlchemy engine, or a :class:`ThreadedAsyncEngine`.
+        """
+        engine = await self.async_sqlalchemy_engine(
+            user, ip_type, pool, **engine_params
+        )
+        await awarmup_engine(engine, n)
+        return engine
+
+
+def dispose_engines() -> None:
+    """Disposes every cached SQLAlchemy engine and closes the shared connectors.
+
+    This is registered to run at interpreter exit, but can be called earlier to
+    release connections. Engines requested afterwards are created from scratch.
+    """
+    with _registry_lock:
+        engines = list(_engines.values())
+        connectors = list(_connectors.values())
+        _engines.clear()
+        _connectors.clear()
+    for engine in engines:
+        engine.dispose()
+    for connector in connectors:
+        connector.close()
+
+
+async def adispose_engines() -> None:
+    """Closes the async engines, asyncpg pools and connector of the running loop.
+
+    Call this before the event loop shuts down, for example in your application's
+    shutdown hook.
+    """
+    loop = asyncio.get_running_loop()
+    for engine in _async_engines.pop(loop, {}).values():
+        await engine.dispose()
+    for pool in _asyncpg_pools.pop(loop, {}).values():
+        await pool.close()
+    connector = _async_connectors.pop(loop, None)
+    if connector is not None:
+        await connector.close_async()
+
+
+def _after_fork() -> None:
+    # Connectors refresh certificates on a background thread that does not
+    # survive a fork, and pooled connections share sockets with the parent. The
+    # child drops both without closing them, which would affect the parent, and
+    # keeps the engines, which reconnect through new connectors on first use.
+    global _registry_lock
+    _registry_lock = threading.RLock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+        metrics = _pool_metrics.get(engine)
+        if metrics is not None:
+            metrics._lock = threading.Lock()
+    _connectors.clear()
+    # Event loops and their async engines do not survive a fork either.
+    _async_connectors.clear()
+    _async_engines.clear()
+    _asyncpg_pools.clear()
+
+
+atexit.register(dispose_engines)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
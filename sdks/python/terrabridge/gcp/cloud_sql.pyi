@@ -1,8 +1,56 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
 
+import asyncpg
 import sqlalchemy
 from google.cloud.sql.connector import IPTypes
 
+@dataclass(frozen=True)
+class PoolSettings:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+
+POOL_PRESETS: Dict[str, PoolSettings]
+
+class PoolMetrics:
+    checkouts: int
+    connects: int
+    invalidations: int
+
+    def snapshot(self) -> Dict[str, float]: ...
+
+class ThreadedAsyncConnection:
+    sync_connection: Optional[sqlalchemy.engine.base.Connection]
+
+    async def start(self) -> ThreadedAsyncConnection: ...
+    async def execute(
+        self, statement: Any, parameters: Any = None, **kwargs
+    ) -> sqlalchemy.engine.Result: ...
+    async def scalar(self, statement: Any, parameters: Any = None, **kwargs) -> Any: ...
+    async def run_sync(self, fn: Callable, *args, **kwargs) -> Any: ...
+    async def commit(self) -> None: ...
+    async def rollback(self) -> None: ...
+    async def close(self) -> None: ...
+    async def __aenter__(self) -> ThreadedAsyncConnection: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+
+class _ThreadedBegin:
+    async def __aenter__(self) -> ThreadedAsyncConnection: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+
+class ThreadedAsyncEngine:
+    sync_engine: sqlalchemy.engine.base.Engine
+
+    def __init__(
+        self, sync_engine: sqlalchemy.engine.base.Engine, max_workers: int = 15
+    ) -> None: ...
+    def connect(self) -> ThreadedAsyncConnection: ...
+    def begin(self) -> _ThreadedBegin: ...
+    async def dispose(self) -> None: ...
+
 class CloudSQLInstance:
     connection_name: str
     database_version: str
@@ -41,8 +89,61 @@ class CloudSQLDatabase:
         state_file: Optional[str] = None,
     ) -> None: ...
     def sqlalchemy_engine(
-        self, user: CloudSQLUser, ip_type: IPTypes = IPTypes.PUBLIC, **engine_params
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
     ) -> sqlalchemy.engine.base.Engine: ...
     async def async_sqlalchemy_engine(
-        self, user: CloudSQLUser, ip_type: IPTypes = IPTypes.PUBLIC, **engine_params
-    ) -> sqlalchemy.ext.asyncio.AsyncEngine: ...
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> Union[sqlalchemy.ext.asyncio.AsyncEngine, ThreadedAsyncEngine]: ...
+    async def asyncpg_pool(
+        self,
+        user: CloudSQLUser,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        *,
+        min_size: int = 10,
+        max_size: int = 10,
+        statement_cache_size: int = 100,
+        max_queries: int = 50000,
+        max_inactive_connection_lifetime: float = 300.0,
+        **pool_params,
+    ) -> asyncpg.Pool: ...
+    def warmup(
+        self,
+        user: CloudSQLUser,
+        n: Optional[int] = None,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> sqlalchemy.engine.base.Engine: ...
+    async def awarmup(
+        self,
+        user: CloudSQLUser,
+        n: Optional[int] = None,
+        ip_type: IPTypes = IPTypes.PUBLIC,
+        pool: Union[str, PoolSettings, None] = None,
+        **engine_params,
+    ) -> Union[sqlalchemy.ext.asyncio.AsyncEngine, ThreadedAsyncEngine]: ...
+
+def pool_metrics(
+    engine: Union[
+        sqlalchemy.engine.base.Engine,
+        sqlalchemy.ext.asyncio.AsyncEngine,
+        ThreadedAsyncEngine,
+    ]
+) -> PoolMetrics: ...
+def warmup_engine(
+    engine: sqlalchemy.engine.base.Engine, n: Optional[int] = None
+) -> None: ...
+async def awarmup_engine(
+    engine: Union[sqlalchemy.ext.asyncio.AsyncEngine, ThreadedAsyncEngine],
+    n: Optional[int] = None,
+) -> None: ...
+def dispose_engines() -> None: ...
+async def adispose_engines() -> None: ...
@@ -1,6 +1,126 @@
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from terrabridge.gcp.base import GCPResource
+from terrabridge.gcp.clients import get_async_client, get_client
+
+try:
+    from google.api_core import exceptions as api_exceptions
+    from google.cloud import tasks_v2
+except ImportError:
+    api_exceptions = None
+    tasks_v2 = None
+
+_RETRY_INITIAL = 0.5
+_RETRY_MAXIMUM = 30.0
+
+
+def _check_installed():
+    if tasks_v2 is None:
+        raise ImportError(
+            "google-cloud-tasks is not installed. "
+            "Please install it with `pip install terrabridge[gcp]`."
+        )
+
+
+def _get_client():
+    _check_installed()
+    return get_client("cloudtasks", tasks_v2.CloudTasksClient)
+
+
+def _get_async_client():
+    _check_installed()
+    return get_async_client("cloudtasks", tasks_v2.CloudTasksAsyncClient)
+
+
+def task_id(*parts: Union[str, bytes, int]) -> str:
+    """Returns a deterministic task id for the given parts.
+
+    Enqueueing two tasks with the same id fails with ``AlreadyExists`` for
+    about an hour after the first one completes, which makes ids derived from
+    the work item a cheap way to deduplicate tasks. The id is a hash, so ids are
+    spread evenly which avoids the latency penalty of sequential task names.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.gcp.cloud_tasks import task_id
+
+        queue.enqueue(url, payload, name=task_id("resize", image_id))
+
+    Parameters:
+        parts: The values identifying the work item.
+
+    Returns:
+        A valid task id.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class EnqueueError(Exception):
+    """Raised when some tasks of :meth:`CloudTasksQueue.enqueue_many` failed.
+
+    Every task is attempted before the error is raised, so the results tell
+    which tasks were created. Retrying only the failed tasks avoids creating
+    duplicates of unnamed tasks.
+
+    Attributes:
+        results (List[Any]): The outcome of every task in order, the created
+            task, ``None`` if a task with the same name already existed, or the
+            exception the task failed with.
+    """
+
+    def __init__(self, results: List[Any]) -> None:
+        self.results = results
+        index, error = self.errors[0]
+        super().__init__(
+            f"{len(self.errors)} of {len(results)} tasks failed, first failure: "
+            f"task {index}: {error!r}"
+        )
+
+    @property
+    def errors(self) -> List[Tuple[int, BaseException]]:
+        """The index and exception of every failed task."""
+        return [
+            (i, result)
+            for i, result in enumerate(self.results)
+            if isinstance(result, BaseException)
+        ]
+
+
+def _raise_failures(results: List[Any]) -> None:
+    for result in results:
+        if isinstance(result, BaseException):
+            raise EnqueueError(results) from result
+
+
+def _retryable(error: Exception, named: bool) -> bool:
+    if isinstance(error, api_exceptions.ResourceExhausted):
+        return True
+    # Other transient errors may have created the task, so retrying them is only
+    # safe for named tasks where a duplicate fails with AlreadyExists.
+    return named and isinstance(
+        error, (api_exceptions.ServiceUnavailable, api_exceptions.DeadlineExceeded)
+    )
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter keeps concurrent senders from retrying in lock step.
+    return random.uniform(0, min(_RETRY_MAXIMUM, _RETRY_INITIAL * 2**attempt))
 
 
 class CloudTasksQueue(GCPResource):
@@ -21,6 +141,8 @@ class CloudTasksQueue(GCPResource):
         queue = CloudTasksQueue("queue", state_file="gs://my-bucket/terraform.tfstate")
         print(queue.name)
 
+        queue.enqueue("https://worker.example.com/run", {"job": 1})
+
     Attributes:
         project (str): The project the resource belongs to.
         id (str): The id of the resource.
@@ -34,7 +156,258 @@ class CloudTasksQueue(GCPResource):
         resource_name: str,
         *,
         module_name: Optional[str] = None,
-        state_file: Optional[str] = None
+        state_file: Optional[str] = None,
     ) -> None:
         super().__init__(resource_name, module_name=module_name, state_file=state_file)
         self.name = self._attributes["name"]
+
+    def _task(
+        self,
+        url: str,
+        payload: Union[bytes, str, Dict[str, Any], List[Any], None] = None,
+        *,
+        name: Optional[str] = None,
+        http_method: str = "POST",
+        headers: Optional[Dict[str, str]] = None,
+        schedule_time: Optional[datetime] = None,
+        service_account_email: Optional[str] = None,
+    ) -> "tasks_v2.Task":
+        headers = dict(headers or {})
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        elif isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        http_request = tasks_v2.HttpRequest(
+            url=url,
+            http_method=tasks_v2.HttpMethod[http_method.upper()],
+            headers=headers,
+            body=payload or b"",
+        )
+        if service_account_email is not None:
+            http_request.oidc_token = tasks_v2.OidcToken(
+                service_account_email=service_account_email
+            )
+        task = tasks_v2.Task(http_request=http_request)
+        if name is not None:
+            task.name = f"{self.id}/tasks/{name}"
+        if schedule_time is not None:
+            task.schedule_time = schedule_time
+        return task
+
+    def enqueue(
+        self,
+        url: str,
+        payload: Union[bytes, str, Dict[str, Any], List[Any], None] = None,
+        *,
+        name: Optional[str] = None,
+        http_method: str = "POST",
+        headers: Optional[Dict[str, str]] = None,
+        schedule_time: Optional[datetime] = None,
+        service_account_email: Optional[str] = None,
+        retries: int = 5,
+    ) -> Optional["tasks_v2.Task"]:
+        """Creates an HTTP task on the queue.
+
+        Quota errors are retried with jittered exponential backoff. For named
+        tasks other transient errors are retried as well, since a duplicate is
+        rejected by the queue.
+
+        Requires ``terrabridge[gcp]`` to be installed.
+
+        Example
+        -------
+        .. code:: python
+
+            queue.enqueue(
+                "https://worker.example.com/resize",
+                {"image_id": image_id},
+                name=task_id("resize", image_id),
+            )
+
+        Parameters:
+            url: The URL the task is sent to.
+            payload: The request body. Dicts and lists are sent as JSON.
+            name: The task id, see :func:`task_id`. Tasks are deduplicated by id.
+            http_method: The HTTP method of the request.
+            headers: Additional HTTP headers of the request.
+            schedule_time: When the task should run, defaults to immediately.
+            service_account_email: A service account used to attach an OIDC
+                token to the request.
+            retries: The number of times to retry a failed request.
+
+        Returns:
+            The created task, or ``None`` if a task with the same name already
+            exists.
+        """
+        client = _get_client()
+        task = self._task(
+            url,
+            payload,
+            name=name,
+            http_method=http_method,
+            headers=headers,
+            schedule_time=schedule_time,
+            service_account_email=service_account_email,
+        )
+        for attempt in range(retries + 1):
+            try:
+                return client.create_task(parent=self.id, task=task)
+            except api_exceptions.AlreadyExists:
+                if name is None:
+                    raise
+                return None
+            except api_exceptions.GoogleAPICallError as e:
+                if attempt >= retries or not _retryable(e, name is not None):
+                    raise
+                time.sleep(_backoff(attempt))
+
+    def enqueue_many(
+        self,
+        tasks: Iterable[Dict[str, Any]],
+        *,
+        max_concurrency: int = 32,
+        retries: int = 5,
+    ) -> List[Optional["tasks_v2.Task"]]:
+        """Creates many HTTP tasks on the queue concurrently.
+
+        Tasks are read from ``tasks`` as requests complete, so at most
+        ``max_concurrency`` of them are in flight and large generators are
+        never fully buffered. Every task is attempted, if some fail an
+        :class:`EnqueueError` holding the outcome of every task is raised once
+        all tasks have been sent.
+
+        Example
+        -------
+        .. code:: python
+
+            queue.enqueue_many(
+                {
+                    "url": "https://worker.example.com/resize",
+                    "payload": {"image_id": image_id},
+                    "name": task_id("resize", image_id),
+                }
+                for image_id in image_ids
+            )
+
+        Parameters:
+            tasks: Keyword arguments for :meth:`enqueue`, one dict per task. A
+                ``retries`` key overrides ``retries`` for its task.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry a failed request.
+
+        Returns:
+            The created tasks in order, ``None`` for tasks that already existed.
+
+        Raises:
+            EnqueueError: If some tasks could not be created.
+        """
+        _get_client()
+        window = threading.BoundedSemaphore(max_concurrency)
+
+        def enqueue(kwargs):
+            try:
+                return self.enqueue(**{"retries": retries, **kwargs})
+            except Exception as e:
+                return e
+            finally:
+                window.release()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for kwargs in tasks:
+                window.acquire()
+                futures.append(executor.submit(enqueue, kwargs))
+        results = [future.result() for future in futures]
+        _raise_failures(results)
+        return results
+
+    async def aenqueue(
+        self,
+        url: str,
+        payload: Union[bytes, str, Dict[str, Any], List[Any], None] = None,
+        *,
+        name: Optional[str] = None,
+        http_method: str = "POST",
+        headers: Optional[Dict[str, str]] = None,
+        schedule_time: Optional[datetime] = None,
+        service_account_email: Optional[str] = None,
+        retries: int = 5,
+    ) -> Optional["tasks_v2.Task"]:
+        """Creates an HTTP task on the queue.
+
+        The asyncio version of :meth:`enqueue`.
+
+        Returns:
+            The created task, or ``None`` if a task with the same name already
+            exists.
+        """
+        client = _get_async_client()
+        task = self._task(
+            url,
+            payload,
+            name=name,
+            http_method=http_method,
+            headers=headers,
+            schedule_time=schedule_time,
+            service_account_email=service_account_email,
+        )
+        for attempt in range(retries + 1):
+            try:
+                return await client.create_task(parent=self.id, task=task)
+            except api_exceptions.AlreadyExists:
+                if name is None:
+                    raise
+                return None
+            except api_exceptions.GoogleAPICallError as e:
+                if attempt >= retries or not _retryable(e, name is not None):
+                    raise
+                await asyncio.sleep(_backoff(attempt))
+
+    async def aenqueue_many(
+        self,
+        tasks: Iterable[Dict[str, Any]],
+        *,
+        max_concurrency: int = 32,
+        retries: int = 5,
+    ) -> List[Optional["tasks_v2.Task"]]:
+        """Creates many HTTP tasks on the queue concurrently.
+
+        The asyncio version of :meth:`enqueue_many`.
+
+        Example
+        -------
+        .. code:: python
+
+            await queue.aenqueue_many(
+                {"url": url, "payload": item, "name": task_id(item["id"])}
+                for item in items
+            )
+
+        Parameters:
+            tasks: Keyword arguments for :meth:`aenqueue`, one dict per task. A
+                ``retries`` key overrides ``retries`` for its task.
+            max_concurrency: The maximum number of requests in flight.
+            retries: The number of times to retry a failed request.
+
+        Returns:
+            The created tasks in order, ``None`` for tasks that already existed.
+
+        Raises:
+            EnqueueError: If some tasks could not be created.
+        """
+        window = asyncio.Semaphore(max_concurrency)
+
+        async def enqueue(kwargs):
+            try:
+                return await self.aenqueue(**{"retries": retries, **kwargs})
+            finally:
+                window.release()
+
+        pending = []
+        for kwargs in tasks:
+            await window.acquire()
+            pending.append(asyncio.ensure_future(enqueue(kwargs)))
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        _raise_failures(results)
+        return results
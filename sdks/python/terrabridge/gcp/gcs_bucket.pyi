@@ -1,11 +1,21 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import IO, Callable, Iterable, List, Optional, Tuple
 
 from google.cloud import storage
 
+def set_http_pool_size(size: Optional[int]) -> None: ...
+@dataclass
+class TransferResult:
+    name: str
+    path: str
+    bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[BaseException] = None
+
 class GCSBucket:
-    _client: storage.Client
     url: str
     name: str
+    metadata_ttl: float
 
     def __init__(
         self,
@@ -14,4 +24,49 @@ class GCSBucket:
         module_name: Optional[str] = None,
         state_file: Optional[str] = None,
     ) -> None: ...
-    def bucket(self) -> storage.Bucket: ...
+    def bucket(self, fetch_metadata: bool = True) -> storage.Bucket: ...
+    def open(
+        self, path: str, mode: str = "rb", *, block_size: Optional[int] = None, **kwargs
+    ) -> IO[bytes]: ...
+    def read_range(self, path: str, start: int, end: int) -> bytes: ...
+    def read_range_into(self, path: str, start: int, buffer) -> int: ...
+    def upload_many(
+        self,
+        files: Iterable[Tuple[str, str]],
+        *,
+        max_workers: int = 8,
+        worker_type: str = "thread",
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[Callable[[TransferResult], None]] = None,
+        raise_exception: bool = False,
+    ) -> List[TransferResult]: ...
+    def download_many(
+        self,
+        blobs: Iterable[Tuple[str, str]],
+        *,
+        max_workers: int = 8,
+        worker_type: str = "thread",
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[Callable[[TransferResult], None]] = None,
+        raise_exception: bool = False,
+    ) -> List[TransferResult]: ...
+    def download_sliced(
+        self,
+        name: str,
+        path: str,
+        *,
+        slice_size: int = ...,
+        max_workers: int = 8,
+        worker_type: str = "thread",
+        on_progress: Optional[Callable[[TransferResult], None]] = None,
+    ) -> TransferResult: ...
+    def upload_composite(
+        self,
+        path: str,
+        name: str,
+        *,
+        chunk_size: int = ...,
+        max_workers: int = 8,
+        worker_type: str = "thread",
+        on_progress: Optional[Callable[[TransferResult], None]] = None,
+    ) -> TransferResult: ...
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from terrabridge.gcp.base import GCPResource
+from terrabridge.gcp.clients import get_client
 
 try:
     from google.cloud import pubsub_v1
@@ -32,7 +33,6 @@ class PubSubTopic(GCPResource):
         name (str): The name of the pub/sub topic.
     """
 
-    _publisher = None
     _terraform_type = "google_pubsub_topic"
 
     def __init__(
@@ -55,9 +55,8 @@ class PubSubTopic(GCPResource):
                 "google-cloud-pubsub is not installed. "
                 "Please install it with `pip install terrabridge[gcp]`."
             )
-        if self._publisher is None:
-            self._publisher = pubsub_v1.PublisherClient()
-        return self._publisher.publish(
+        publisher = get_client("pubsub.publisher", pubsub_v1.PublisherClient)
+        return publisher.publish(
             topic=self.id, data=message, ordering_key=ordering_key, **attributes
         )
 
@@ -1,6 +1,7 @@
 from typing import Dict, Optional
 
 from terrabridge.gcp.base import GCPResource
+from terrabridge.gcp.clients import get_client
 
 try:
     from google.cloud import pubsublite
@@ -35,7 +36,6 @@ class PubSubLiteTopic(GCPResource):
     """
 
     _terraform_type = "google_pubsub_lite_topic"
-    _publisher = None
 
     def __init__(
         self,
@@ -59,9 +59,10 @@ class PubSubLiteTopic(GCPResource):
                 "google-cloud-pubsub is not installed. "
                 "Please install it with `pip install terrabridge[gcp]`."
             )
-        if self._publisher is None:
-            self._publisher = pubsublite.PublisherServiceClient()
-        return self._publisher.publish(
+        publisher = get_client(
+            "pubsublite.publisher", pubsublite.PublisherServiceClient
+        )
+        return publisher.publish(
             topic=self.id,
             data=message,
             ordering_key=ordering_key,
@@ -0,0 +1,163 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping
+
+
+def _address(key: Any, terraform_type: str) -> str:
+    if key.module_name is None:
+        return f"{terraform_type}.{key.resource_name}"
+    return f"{key.module_name}.{terraform_type}.{key.resource_name}"
+
+
+class DependencyGraph:
+    """The dependencies between the resources of a state.
+
+    Resources are identified by their terraform address, for example
+    ``google_sql_database_instance.db`` or
+    ``module.storage.google_storage_bucket.bucket``. Edges are stored as
+    adjacency lists in both directions, so every query runs in time linear in
+    the resources and dependencies it visits. Dependencies on resources that
+    are not in the state, such as data sources, are left out.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.parser import dependency_graph
+
+        graph = dependency_graph("gs://my-bucket/terraform.tfstate")
+        # Everything that depends on the instance, directly or not.
+        graph.all_dependents("google_sql_database_instance.db")
+
+    Parameters:
+        resources: The resources of the state by key, as stored by the parser.
+    """
+
+    def __init__(self, resources: Mapping[Any, Dict[str, Any]]) -> None:
+        self._addresses: List[str] = []
+        self._keys: List[Any] = []
+        self._types: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for key, resource in resources.items():
+            address = _address(key, resource["type"])
+            self._ids[address] = len(self._addresses)
+            self._addresses.append(address)
+            self._keys.append(key)
+            self._types.append(resource["type"])
+        self._forward: List[List[int]] = [[] for _ in self._addresses]
+        self._reverse: List[List[int]] = [[] for _ in self._addresses]
+        for node, resource in enumerate(resources.values()):
+            seen = set()
+            for dependency in resource["dependencies"] or ():
+                target = self._ids.get(dependency)
+                if target is None or target in seen:
+                    continue
+                seen.add(target)
+                self._forward[node].append(target)
+                self._reverse[target].append(node)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._ids
+
+    def _id(self, address: str) -> int:
+        try:
+            return self._ids[address]
+        except KeyError:
+            raise ValueError(f"Resource {address} is not in the state.")
+
+    @property
+    def addresses(self) -> List[str]:
+        """The addresses of all resources, in state order."""
+        return list(self._addresses)
+
+    def resource_type(self, address: str) -> str:
+        """Returns the terraform type of a resource."""
+        return self._types[self._id(address)]
+
+    def resource_key(self, address: str) -> Any:
+        """Returns the key the parser stores a resource under."""
+        return self._keys[self._id(address)]
+
+    def dependencies(self, address: str) -> List[str]:
+        """Returns the resources a resource depends on directly."""
+        return [self._addresses[i] for i in self._forward[self._id(address)]]
+
+    def dependents(self, address: str) -> List[str]:
+        """Returns the resources that depend on a resource directly."""
+        return [self._addresses[i] for i in self._reverse[self._id(address)]]
+
+    def _closure(self, starts: Iterable[str], edges: List[List[int]]) -> List[str]:
+        visited = [False] * len(self._addresses)
+        queue = deque()
+        for address in starts:
+            node = self._id(address)
+            if not visited[node]:
+                visited[node] = True
+                queue.append(node)
+        start_count = len(queue)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbour in edges[node]:
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    queue.append(neighbour)
+        return [self._addresses[i] for i in order[start_count:]]
+
+    def all_dependencies(self, address: str) -> List[str]:
+        """Returns the resources a resource depends on, directly or transitively.
+
+        Closer dependencies come first.
+        """
+        return self._closure([address], self._forward)
+
+    def all_dependents(self, address: str) -> List[str]:
+        """Returns the resources that depend on a resource, directly or transitively.
+
+        Closer dependents come first.
+        """
+        return self._closure([address], self._reverse)
+
+    def impact(self, addresses: Iterable[str]) -> List[str]:
+        """Returns the resources affected by a change to any of ``addresses``.
+
+        These are the resources that depend on any of them, directly or
+        transitively, excluding the changed resources themselves. A single
+        traversal covers all changed resources, so the cost is linear in the
+        size of the graph however many resources changed.
+
+        Parameters:
+            addresses: The addresses of the changed resources.
+
+        Returns:
+            The affected resources, closer dependents first.
+        """
+        return self._closure(addresses, self._reverse)
+
+    def topological_order(self) -> List[str]:
+        """Returns all resources ordered so that dependencies come first.
+
+        Useful to create resources in bulk, each after the resources it depends
+        on.
+
+        Raises:
+            ValueError: If the dependencies contain a cycle.
+        """
+        # The number of dependencies of each resource not ordered yet.
+        remaining = [len(edges) for edges in self._forward]
+        queue = deque(node for node, count in enumerate(remaining) if count == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in self._reverse[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if len(order) != len(self._addresses):
+            cycle = [self._addresses[i] for i, count in enumerate(remaining) if count]
+            raise ValueError(f"The dependencies of {cycle} contain a cycle.")
+        return [self._addresses[i] for i in order]
@@ -1,15 +1,36 @@
+import gzip
 import json
+import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
-
-import gcsfs
-import s3fs
-from fsspec.implementations.local import LocalFileSystem
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import terrabridge
+from terrabridge.graph import DependencyGraph
+from terrabridge.sources import get_state_source
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-# Maps a terraform state file to the resources contained in it.
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Maps a terraform state file to the resources contained in it. The cache is
+# deliberately kept across os.fork(): children of pre-fork servers share the
+# parsed state copy-on-write and never reparse it.
 tf_state_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+# Maps a terraform state file to the version it was parsed from, see
+# terrabridge.sources.StateSource.
+_state_versions: Dict[str, Optional[str]] = {}
+# Maps a terraform state file to the serial of the state it was parsed from.
+_state_serials: Dict[str, Optional[int]] = {}
+# Maps a terraform state file to the resources its dependency graph was built
+# from and the graph.
+_state_graphs: Dict[str, Tuple[Mapping[Any, Dict[str, Any]], DependencyGraph]] = {}
+# Whether the bundle named by TERRABRIDGE_BUNDLE was loaded, see
+# terrabridge.bundle.load_bundle.
+_env_bundle_loaded = False
 
 
 @dataclass(frozen=True)
@@ -25,6 +46,8 @@ class _ResourceKey:
 
 def get_resource(resource_name: str, module_name: Optional[str], tf_state_path: str):
     """Return the attributes of a resource."""
+    if tf_state_path not in tf_state_cache:
+        _load_env_bundle()
     if tf_state_path not in tf_state_cache:
         _parse_terraform_state(tf_state_path)
     try:
@@ -36,26 +59,174 @@ def get_resource(resource_name: str, module_name: Optional[str], tf_state_path:
         )
 
 
+def _load_env_bundle() -> None:
+    global _env_bundle_loaded
+    if _env_bundle_loaded:
+        return
+    _env_bundle_loaded = True
+    path = os.environ.get("TERRABRIDGE_BUNDLE")
+    if path:
+        from terrabridge.bundle import load_bundle
+
+        load_bundle(path)
+
+
+def _decompress(data: bytes) -> bytes:
+    if data.startswith(_GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImportError(
+                "zstandard is not installed, it is required to read zstd "
+                "compressed state files. Please install it with "
+                "`pip install zstandard`."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def _fetch_state(
+    tf_state_path: str, version: Optional[str] = None
+) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Downloads a state file unless it is still at ``version``.
+
+    Returns:
+        The decompressed contents and version of the state, or None if the state
+        has not changed since ``version``.
+    """
+    fetched = get_state_source(tf_state_path).fetch(tf_state_path, version)
+    if fetched is None:
+        return None
+    data, current = fetched
+    return _decompress(data), current
+
+
 def _parse_terraform_state(tf_state_path: str):
     """Parse a terraform state file and return a list of resources."""
-    if tf_state_path.startswith("gs://"):
-        token = None
-        if terrabridge._anon_state_file_creds:
-            token = "anon"
-        fs = gcsfs.GCSFileSystem(token=token)
-    elif tf_state_path.startswith("s3://"):
-        fs = s3fs.S3FileSystem(anon=terrabridge._anon_state_file_creds)
-    else:
-        fs = LocalFileSystem()
-    with fs.open(tf_state_path) as f:
-        tf_state = json.load(f)
-    if tf_state_path not in tf_state_cache:
-        tf_state_cache[tf_state_path] = {}
+    data, version = _fetch_state(tf_state_path)
+    _load_state(tf_state_path, data, version)
+
+
+def _index_state(tf_state: Dict[str, Any]) -> Dict[_ResourceKey, Dict[str, Any]]:
+    resources = {}
     for resource in tf_state["resources"]:
-        tf_state_cache[tf_state_path][
-            _ResourceKey(resource["name"], resource.get("module"))
-        ] = {
+        resources[_ResourceKey(resource["name"], resource.get("module"))] = {
             "attributes": resource["instances"][0].get("attributes", {}),
             "dependencies": resource["instances"][0].get("dependencies", {}),
             "type": resource["type"],
         }
+    return resources
+
+
+def _load_state(tf_state_path: str, data: bytes, version: Optional[str]) -> None:
+    tf_state = json.loads(data)
+    resources = _index_state(tf_state)
+    # Replaced in one assignment, so readers never see a partially parsed state.
+    tf_state_cache[tf_state_path] = resources
+    _state_versions[tf_state_path] = version
+    _state_serials[tf_state_path] = tf_state.get("serial")
+    _state_graphs[tf_state_path] = (resources, DependencyGraph(resources))
+
+
+def refresh_state(tf_state_path: Optional[str] = None) -> bool:
+    """Reloads a state file if it changed since it was parsed.
+
+    The state is only downloaded if it changed, how that is checked depends on
+    the state's source: fsspec sources fetch the object's metadata, HTTP sources
+    send a conditional request. Resources created from the
+    old state keep their attributes, create them again to pick up changes.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.parser import refresh_state
+
+        if refresh_state("gs://my-bucket/terraform.tfstate"):
+            bucket = GCSBucket("bucket", state_file="gs://my-bucket/terraform.tfstate")
+
+    Parameters:
+        tf_state_path: The state file, defaults to ``terrabridge.state_file``.
+
+    Returns:
+        Whether the state was (re)loaded.
+    """
+    tf_state_path = tf_state_path or terrabridge.state_file
+    if tf_state_path is None:
+        raise ValueError(
+            "tf_state_path must be specified if terrabridge.state_file is not set."
+        )
+    if tf_state_path not in tf_state_cache:
+        _parse_terraform_state(tf_state_path)
+        return True
+    fetched = _fetch_state(tf_state_path, _state_versions.get(tf_state_path))
+    if fetched is None:
+        return False
+    _load_state(tf_state_path, *fetched)
+    return True
+
+
+def state_changed(tf_state_path: Optional[str] = None) -> bool:
+    """Returns whether a state file changed since it was parsed.
+
+    A cheap probe that never downloads the state, for example to decide when to
+    call :func:`refresh_state` or to invalidate caches derived from the state.
+
+    Parameters:
+        tf_state_path: The state file, defaults to ``terrabridge.state_file``.
+
+    Returns:
+        Whether the state changed, True if it was never parsed.
+    """
+    tf_state_path = tf_state_path or terrabridge.state_file
+    if tf_state_path is None:
+        raise ValueError(
+            "tf_state_path must be specified if terrabridge.state_file is not set."
+        )
+    if tf_state_path not in tf_state_cache:
+        return True
+    return get_state_source(tf_state_path).changed(
+        tf_state_path, _state_versions.get(tf_state_path)
+    )
+
+
+def dependency_graph(tf_state_path: Optional[str] = None) -> DependencyGraph:
+    """Returns the dependency graph of a state file.
+
+    The graph is built when the state is parsed, and again whenever it is
+    reloaded, see :class:`terrabridge.graph.DependencyGraph`.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.parser import dependency_graph
+
+        graph = dependency_graph("gs://my-bucket/terraform.tfstate")
+        graph.dependents("google_sql_database_instance.db")
+
+    Parameters:
+        tf_state_path: The state file, defaults to ``terrabridge.state_file``.
+
+    Returns:
+        The dependency graph.
+    """
+    tf_state_path = tf_state_path or terrabridge.state_file
+    if tf_state_path is None:
+        raise ValueError(
+            "tf_state_path must be specified if terrabridge.state_file is not set."
+        )
+    if tf_state_path not in tf_state_cache:
+        _load_env_bundle()
+    if tf_state_path not in tf_state_cache:
+        _parse_terraform_state(tf_state_path)
+    resources = tf_state_cache[tf_state_path]
+    built = _state_graphs.get(tf_state_path)
+    # States loaded from bundles are not parsed, their graph is built on first
+    # use from the dependencies recorded in the bundle header, so no resource
+    # is decoded.
+    if built is None or built[0] is not resources:
+        build = getattr(resources, "dependency_graph", None)
+        graph = DependencyGraph(resources) if build is None else build()
+        built = _state_graphs[tf_state_path] = (resources, graph)
+    return built[1]
@@ -0,0 +1,195 @@
+"""Queries over the nested attributes of resources.
+
+Paths use terraform's attribute syntax, for example
+``settings[0].ip_configuration[0].private_network``. ``[*]`` matches every
+element of a list or every value of a map, and ``["key"]`` reads map keys that
+are not plain names, such as label keys with dots. Paths are compiled once
+and cached, so running the same query over many resources only walks the
+attributes.
+"""
+import functools
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import terrabridge
+from terrabridge import parser
+from terrabridge.graph import _address
+from terrabridge.parser import _ResourceKey
+
+_WILDCARD = object()
+_TOKEN = re.compile(
+    r"(?P<dot>\.)?(?:(?P<name>[A-Za-z0-9_\-]+)|\[(?P<index>-?\d+|\*)\]"
+    r'|\["(?P<key>[^"]*)"\])'
+)
+_MISSING = object()
+
+# Maps a state file to the state its index was built from and the keys of its
+# resources by type.
+_type_indexes: Dict[
+    str, Tuple[Mapping[_ResourceKey, Dict[str, Any]], Dict[str, List[_ResourceKey]]]
+] = {}
+
+
+def _parse(path: str) -> Tuple[Union[str, int, object], ...]:
+    steps = []
+    position = 0
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        # Names must be separated by dots, brackets may follow directly.
+        if (
+            match is None
+            or (match["name"] is not None and bool(match["dot"]) == (position == 0))
+            or (match["name"] is None and match["dot"])
+        ):
+            raise ValueError(f"Invalid attribute path {path!r} at position {position}.")
+        if match["name"] is not None:
+            steps.append(match["name"])
+        elif match["key"] is not None:
+            steps.append(match["key"])
+        elif match["index"] == "*":
+            steps.append(_WILDCARD)
+        else:
+            steps.append(int(match["index"]))
+        position = match.end()
+    if not steps:
+        raise ValueError("Attribute paths must not be empty.")
+    return tuple(steps)
+
+
+def _walk(value: Any, steps: Tuple[Any, ...], results: List[Any]) -> None:
+    for i, step in enumerate(steps):
+        if step is _WILDCARD:
+            if isinstance(value, Mapping):
+                value = value.values()
+            elif not isinstance(value, list):
+                return
+            for element in value:
+                _walk(element, steps[i + 1 :], results)
+            return
+        try:
+            value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return
+    results.append(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """Compiles an attribute path into a function reading it from attributes.
+
+    Compiled paths are cached, calling this again with the same path is a
+    dictionary lookup.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.query import compile_path
+
+        network = compile_path("settings[0].ip_configuration[0].private_network")
+        network(instance._attributes)
+
+    Parameters:
+        path: The attribute path, for example ``lifecycle_rule[*].action[0].type``.
+
+    Returns:
+        A function taking the attributes of a resource and an optional default.
+        Paths with ``[*]`` return a list of every match, other paths the value
+        at the path, or the default if the path does not exist.
+
+    Raises:
+        ValueError: If the path is not valid.
+    """
+    steps = _parse(path)
+    if _WILDCARD in steps:
+
+        def select_all(attributes: Any, default: Any = None) -> Any:
+            results: List[Any] = []
+            _walk(attributes, steps, results)
+            return results
+
+        return select_all
+
+    def select_one(attributes: Any, default: Any = None) -> Any:
+        value = attributes
+        try:
+            for step in steps:
+                value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return default
+        return value
+
+    return select_one
+
+
+def _resources_of_type(
+    tf_state_path: str, terraform_type: str
+) -> Tuple[Mapping[_ResourceKey, Dict[str, Any]], List[_ResourceKey]]:
+    if tf_state_path not in parser.tf_state_cache:
+        parser._load_env_bundle()
+    if tf_state_path not in parser.tf_state_cache:
+        parser._parse_terraform_state(tf_state_path)
+    resources = parser.tf_state_cache[tf_state_path]
+    indexed = _type_indexes.get(tf_state_path)
+    # Rebuilt whenever the state was reloaded, see parser.refresh_state.
+    if indexed is None or indexed[0] is not resources:
+        by_type: Dict[str, List[_ResourceKey]] = {}
+        for key, resource in resources.items():
+            by_type.setdefault(resource["type"], []).append(key)
+        indexed = _type_indexes[tf_state_path] = (resources, by_type)
+    return resources, indexed[1].get(terraform_type, [])
+
+
+def select(
+    terraform_type: str,
+    path: str,
+    *,
+    state_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Reads an attribute path from every resource of a type in a state.
+
+    The path is compiled once and the resources of the type are looked up in an
+    index built once per state, so selecting from thousands of resources only
+    costs walking their attributes.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.query import select
+
+        networks = select(
+            "google_sql_database_instance",
+            "settings[0].ip_configuration[0].private_network",
+            state_file="gs://my-bucket/terraform.tfstate",
+        )
+        # {"google_sql_database_instance.db": "projects/p/global/networks/vpc"}
+
+    Parameters:
+        terraform_type: The terraform type of the resources, for example
+            ``google_storage_bucket``.
+        path: The attribute path, see :func:`compile_path`.
+        state_file: The state file, defaults to ``terrabridge.state_file``.
+
+    Returns:
+        The values by resource address, for example
+        ``module.storage.google_storage_bucket.bucket``. Resources without the
+        path are left out. Paths with ``[*]`` map every resource to a list of
+        its matches.
+
+    Raises:
+        ValueError: If the path is not valid.
+    """
+    tf_state_path = state_file or terrabridge.state_file
+    if tf_state_path is None:
+        raise ValueError(
+            "state_file must be specified if terrabridge.state_file is not set."
+        )
+    accessor = compile_path(path)
+    resources, keys = _resources_of_type(tf_state_path, terraform_type)
+    results = {}
+    for key in keys:
+        value = accessor(resources[key]["attributes"], _MISSING)
+        if value is not _MISSING:
+            results[_address(key, terraform_type)] = value
+    return results
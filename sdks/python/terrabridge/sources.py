@@ -0,0 +1,329 @@
+import gzip
+import http.client
+import os
+import threading
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import fsspec
+import gcsfs
+import s3fs
+from fsspec.implementations.local import LocalFileSystem
+
+import terrabridge
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+# Credentials that are never sent to another origin than the one requested.
+_CREDENTIAL_HEADERS = ("authorization", "proxy-authorization", "cookie")
+
+
+class StateSource:
+    """Base class for the backends terraform state files are read from.
+
+    A source downloads state files and tells whether they changed. Every state
+    has a version token, such as an ETag, that changes whenever the state does,
+    so the parser can skip downloading and parsing a state it already has.
+
+    Register a source for the state paths it serves with
+    :func:`register_state_source`.
+    """
+
+    def fetch(
+        self, path: str, version: Optional[str] = None
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Downloads a state file unless it is still at ``version``.
+
+        Parameters:
+            path: The path of the state file.
+            version: The version of the copy the caller has, if any.
+
+        Returns:
+            The contents and version of the state, or None if the state is still
+            at ``version``. The version is None if the backend has none.
+        """
+        raise NotImplementedError
+
+    def version(self, path: str) -> Optional[str]:
+        """Returns the current version of a state file without downloading it.
+
+        Parameters:
+            path: The path of the state file.
+
+        Returns:
+            The version of the state, None if the backend has none.
+        """
+        raise NotImplementedError
+
+    def changed(self, path: str, version: Optional[str]) -> bool:
+        """Returns whether a state file changed since ``version``.
+
+        Parameters:
+            path: The path of the state file.
+            version: The version of the copy the caller has.
+        """
+        return version is None or self.version(path) != version
+
+
+def _fsspec_version(info: Dict) -> Optional[str]:
+    # GCS objects get a new generation and S3 objects a new ETag on every write,
+    # local files fall back to their modification time.
+    for key in ("generation", "ETag", "etag", "mtime"):
+        if info.get(key) is not None:
+            return f"{key}:{info[key]}:{info.get('size')}"
+    return None
+
+
+class FsspecStateSource(StateSource):
+    """Reads state files through an fsspec filesystem.
+
+    Used for ``gs://``, ``s3://`` and local state files, and for any other
+    protocol fsspec supports, such as ``az://``.
+
+    Example
+    -------
+    .. code:: python
+
+        import fsspec
+        from terrabridge.sources import FsspecStateSource, register_state_source
+
+        register_state_source(
+            "az://",
+            FsspecStateSource(lambda: fsspec.filesystem("az", account_name="acct")),
+        )
+
+    Parameters:
+        filesystem: Returns the filesystem to read with. Called for every read,
+            fsspec caches filesystem instances itself.
+    """
+
+    def __init__(self, filesystem: Callable[[], fsspec.AbstractFileSystem]) -> None:
+        self.filesystem = filesystem
+
+    def fetch(
+        self, path: str, version: Optional[str] = None
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        fs = self.filesystem()
+        # fsspec caches listings, which would hide changes to the object.
+        fs.invalidate_cache(path)
+        # Opening the file fetches its metadata with one small request. Without a
+        # cache the object is then read with a single request instead of
+        # fsspec's readahead blocks of a few MB each.
+        with fs.open(path, "rb", cache_type="none") as f:
+            current = _fsspec_version(getattr(f, "details", None) or fs.info(path))
+            if version is not None and current == version:
+                return None
+            return f.read(), current
+
+    def version(self, path: str) -> Optional[str]:
+        fs = self.filesystem()
+        fs.invalidate_cache(path)
+        return _fsspec_version(fs.info(path))
+
+
+class HTTPStateSource(StateSource):
+    """Reads state files over HTTP, for example from the terraform ``http`` backend.
+
+    Connections are kept alive and reused for every request to the same host,
+    one per thread. Requests carry ``If-None-Match`` with the ETag of the last
+    download, so an unchanged state costs a ``304 Not Modified`` response
+    instead of a download. Servers without ETags are versioned by their
+    ``X-Consul-Index`` or ``Last-Modified`` header, which makes Consul's
+    ``/v1/kv/<key>?raw`` endpoint usable as a source. Redirects are followed,
+    but ``headers`` and credentials are only sent to the scheme and host of the
+    requested URL, not to another host a redirect points to.
+
+    Example
+    -------
+    .. code:: python
+
+        from terrabridge.sources import HTTPStateSource, register_state_source
+
+        register_state_source(
+            "https://terraform.example.com/",
+            HTTPStateSource(headers={"Authorization": f"Bearer {token}"}),
+        )
+        bucket = GCSBucket(
+            "bucket", state_file="https://terraform.example.com/state/prod"
+        )
+
+    Parameters:
+        headers: Headers sent with every request, for example for
+            authentication.
+        timeout: The timeout of each request in seconds.
+    """
+
+    def __init__(
+        self, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0
+    ) -> None:
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self._local = threading.local()
+        _http_sources.add(self)
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get((scheme, netloc))
+        if connection is None:
+            cls = (
+                http.client.HTTPSConnection
+                if scheme == "https"
+                else http.client.HTTPConnection
+            )
+            connection = cls(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = connection
+        return connection
+
+    def _request(
+        self, method: str, url: str, headers: Dict[str, str]
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        origin = urlsplit(url)[:2]
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts[:2] != origin:
+                headers = self._strip_credentials(headers)
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            connection = self._connection(parts.scheme, parts.netloc)
+            try:
+                connection.request(method, target, headers=headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                # The server may have closed the idle keep-alive connection,
+                # retry once on a new one.
+                connection.close()
+                connection.request(method, target, headers=headers)
+                response = connection.getresponse()
+            # The body must be read completely before the connection is reused.
+            body = response.read()
+            if response.status not in _REDIRECTS:
+                return response, body
+            url = urljoin(url, response.headers["Location"])
+        raise ValueError(f"Too many redirects fetching {url}.")
+
+    def _strip_credentials(self, headers: Dict[str, str]) -> Dict[str, str]:
+        # The configured headers may carry custom credentials such as
+        # X-Vault-Token, so they are dropped along with the standard ones.
+        configured = {name.lower() for name in self.headers}
+        return {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in configured
+            and name.lower() not in _CREDENTIAL_HEADERS
+        }
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Accept-Encoding": "gzip", **self.headers}
+
+    @staticmethod
+    def _version(response: http.client.HTTPResponse) -> Optional[str]:
+        for header in ("ETag", "X-Consul-Index", "Last-Modified"):
+            value = response.headers.get(header)
+            if value is not None:
+                return f"{header}:{value}"
+        return None
+
+    @staticmethod
+    def _check(response: http.client.HTTPResponse, url: str) -> None:
+        if response.status >= 400:
+            raise ValueError(
+                f"Failed to fetch {url}: {response.status} {response.reason}"
+            )
+
+    def fetch(
+        self, path: str, version: Optional[str] = None
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        headers = self._headers()
+        if version is not None and version.startswith("ETag:"):
+            headers["If-None-Match"] = version[len("ETag:") :]
+        response, body = self._request("GET", path, headers)
+        if response.status == 304:
+            return None
+        self._check(response, path)
+        current = self._version(response)
+        if version is not None and current == version:
+            return None
+        if response.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body, current
+
+    def version(self, path: str) -> Optional[str]:
+        response, _ = self._request("HEAD", path, self._headers())
+        self._check(response, path)
+        return self._version(response)
+
+
+# Every HTTP source, their connections share their socket with the parent
+# after a fork.
+_http_sources: "weakref.WeakSet[HTTPStateSource]" = weakref.WeakSet()
+
+
+def _reset_http_sources() -> None:
+    for source in list(_http_sources):
+        source._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_http_sources)
+
+
+def _gcs_filesystem():
+    token = None
+    if terrabridge._anon_state_file_creds:
+        token = "anon"
+    return gcsfs.GCSFileSystem(token=token)
+
+
+def _s3_filesystem():
+    return s3fs.S3FileSystem(anon=terrabridge._anon_state_file_creds)
+
+
+_sources: Dict[str, StateSource] = {
+    "gs://": FsspecStateSource(_gcs_filesystem),
+    "s3://": FsspecStateSource(_s3_filesystem),
+    "http://": HTTPStateSource(),
+    "https://": HTTPStateSource(),
+}
+_local_source = FsspecStateSource(LocalFileSystem)
+
+
+def register_state_source(prefix: str, source: StateSource) -> None:
+    """Registers the source of all state files whose path starts with ``prefix``.
+
+    The source registered for the longest matching prefix is used, so a source
+    can be registered for a single host or bucket, for example with credentials,
+    while all other paths use the default for their protocol. Sources for
+    ``gs://``, ``s3://``, ``http://`` and ``https://`` are registered by
+    default, other protocols fsspec supports are read through fsspec and all
+    other paths are read from the local filesystem.
+
+    Parameters:
+        prefix: The prefix of the paths the source serves, for example
+            ``"https://terraform.example.com/"``.
+        source: The source.
+    """
+    _sources[prefix] = source
+
+
+def get_state_source(path: str) -> StateSource:
+    """Returns the source a state file is read from.
+
+    Parameters:
+        path: The path of the state file.
+    """
+    matches = [prefix for prefix in _sources if path.startswith(prefix)]
+    if matches:
+        return _sources[max(matches, key=len)]
+    protocol, separator, _ = path.partition("://")
+    if separator and protocol in fsspec.available_protocols():
+        source = FsspecStateSource(lambda: fsspec.filesystem(protocol))
+        _sources[f"{protocol}://"] = source
+        return source
+    return _local_source
@@ -0,0 +1,36 @@
+import os
+
+from terrabridge.aws.clients import ClientCache, cache, get_client
+
+
+def test_clients_are_shared():
+    s3 = get_client("s3", "us-east-1")
+
+    assert get_client("s3", "us-east-1") is s3
+    assert get_client("s3", "us-west-2") is not s3
+    assert get_client("sqs", "us-east-1") is not s3
+    assert get_client("s3", "us-east-1", read_timeout=5) is not s3
+    assert len(cache) == 4
+
+
+def test_client_config():
+    with ClientCache(max_pool_connections=7) as clients:
+        s3 = clients.get("s3", "us-east-1", connect_timeout=3)
+        config = s3.meta.config
+
+        assert config.max_pool_connections == 7
+        assert config.connect_timeout == 3
+        assert config.tcp_keepalive
+        assert len(clients) == 1
+    assert len(clients) == 0
+
+
+def test_clients_recreated_in_new_process():
+    clients = ClientCache()
+    s3 = clients.get("s3", "us-east-1")
+
+    # Simulate running in a forked child.
+    clients.pid = os.getpid() + 1
+
+    assert clients.get("s3", "us-east-1") is not s3
+    assert clients.pid == os.getpid()
@@ -0,0 +1,18 @@
+import moto
+import pytest
+
+from terrabridge.aws.clients import cache
+
+
+@pytest.fixture(autouse=True)
+def aws(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    # Clients created outside the mock would talk to AWS, so none may leak
+    # between tests.
+    cache._reset()
+    with moto.mock_aws():
+        yield
+    cache._reset()
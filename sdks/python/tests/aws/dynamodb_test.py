@@ -0,0 +1,191 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from terrabridge.aws import dynamodb
+from terrabridge.aws.batching import BatchError
+from terrabridge.aws.dynamodb import DynamoDBTable, _serialize
+
+
+def _create_table(table):
+    table.client().create_table(
+        TableName=table.name,
+        KeySchema=[
+            {"AttributeName": "pk", "KeyType": "HASH"},
+            {"AttributeName": "sk", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "N"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def test_dynamodb_table():
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+
+    assert table.name == "terrabridge-testing-table"
+    assert table.hash_key == "pk"
+    assert table.range_key == "sk"
+    assert table.region == "us-east-1"
+
+    _create_table(table)
+    table.put_item({"pk": "user", "sk": 1, "tags": ["a", "b"], "active": True})
+
+    assert table.get_item({"pk": "user", "sk": 1}, consistent_read=True) == {
+        "pk": "user",
+        "sk": Decimal(1),
+        "tags": ["a", "b"],
+        "active": True,
+    }
+    assert table.get_item({"pk": "user", "sk": 2}) is None
+
+
+def test_batch_write_and_get():
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    _create_table(table)
+
+    table.batch_write(
+        [{"pk": "user", "sk": i, "value": "old"} for i in range(120)]
+        + [{"pk": "user", "sk": 0, "value": "new"}],
+        deletes=[{"pk": "user", "sk": 1}],
+    )
+    items = table.batch_get(
+        [{"pk": "user", "sk": i} for i in range(150)]
+        + [{"pk": "user", "sk": Decimal("0.0")}]
+    )
+
+    assert len(items) == 151
+    assert items[0] == {"pk": "user", "sk": Decimal(0), "value": "new"}
+    assert items[1] is None
+    assert items[2] == {"pk": "user", "sk": Decimal(2), "value": "old"}
+    assert all(item is not None for item in items[2:120])
+    assert all(item is None for item in items[120:150])
+    assert items[150] == items[0]
+
+
+def test_batch_retries_unprocessed(monkeypatch):
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    writes = []
+    gets = []
+
+    def batch_write_item(RequestItems):
+        requests = RequestItems[table.name]
+        writes.append(len(requests))
+        if len(writes) == 1:
+            return {"UnprocessedItems": {table.name: requests[:3]}}
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(RequestItems):
+        keys = RequestItems[table.name]["Keys"]
+        gets.append(len(keys))
+        if len(gets) == 1:
+            return {
+                "Responses": {table.name: keys[:1]},
+                "UnprocessedKeys": {table.name: {"Keys": keys[1:]}},
+            }
+        return {"Responses": {table.name: keys}}
+
+    client = SimpleNamespace(
+        batch_write_item=batch_write_item, batch_get_item=batch_get_item
+    )
+    monkeypatch.setattr(table, "client", lambda: client)
+    monkeypatch.setattr(dynamodb, "_backoff", lambda attempt: 0)
+
+    table.batch_write([{"pk": "a", "sk": i} for i in range(10)])
+    assert writes == [10, 3]
+
+    keys = [{"pk": "a", "sk": i} for i in range(3)]
+    assert table.batch_get(keys) == [{"pk": "a", "sk": Decimal(i)} for i in range(3)]
+    assert gets == [3, 2]
+
+
+def test_batch_write_raises_when_still_unprocessed(monkeypatch):
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    client = SimpleNamespace(
+        batch_write_item=lambda RequestItems: {"UnprocessedItems": RequestItems}
+    )
+    monkeypatch.setattr(table, "client", lambda: client)
+    monkeypatch.setattr(dynamodb, "_backoff", lambda attempt: 0)
+
+    with pytest.raises(BatchError) as error:
+        table.batch_write([{"pk": "a", "sk": 1}], retries=2)
+    assert len(error.value.failed) == 1
+
+
+def test_batch_write_error_ids_are_request_indexes(monkeypatch):
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+
+    def batch_write_item(RequestItems):
+        # Only the item with sk 2 and the delete of sk 6 are never processed.
+        requests = [
+            request
+            for request in RequestItems[table.name]
+            if request.get("PutRequest", {}).get("Item", {}).get("sk") == {"N": "2"}
+            or request.get("DeleteRequest", {}).get("Key", {}).get("sk") == {"N": "6"}
+        ]
+        return {"UnprocessedItems": {table.name: requests}}
+
+    client = SimpleNamespace(batch_write_item=batch_write_item)
+    monkeypatch.setattr(table, "client", lambda: client)
+    monkeypatch.setattr(dynamodb, "_backoff", lambda attempt: 0)
+
+    with pytest.raises(BatchError) as error:
+        table.batch_write(
+            [{"pk": "a", "sk": i} for i in range(5)],
+            deletes=[{"pk": "a", "sk": i} for i in range(5, 8)],
+            retries=1,
+        )
+    assert [failure["Id"] for failure in error.value.failed] == ["2", "6"]
+
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_scan(segments):
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    _create_table(table)
+    table.batch_write({"pk": f"user-{i}", "sk": i} for i in range(200))
+
+    items = list(table.scan(segments=segments))
+    assert sorted(item["sk"] for item in items) == list(range(200))
+
+    filtered = table.scan(
+        segments=segments,
+        FilterExpression="sk < :limit",
+        ExpressionAttributeValues={":limit": 10},
+    )
+    assert sorted(item["sk"] for item in filtered) == list(range(10))
+
+
+def test_scan_stops_early(monkeypatch):
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    pages = []
+
+    def scan(**request):
+        pages.append(request["Segment"])
+        return {
+            "Items": [_serialize({"pk": "a", "sk": len(pages)})],
+            "LastEvaluatedKey": {"pk": {"S": "a"}},
+        }
+
+    monkeypatch.setattr(table, "client", lambda: SimpleNamespace(scan=scan))
+
+    items = table.scan(segments=2, max_buffered_pages=2)
+    assert next(items)["pk"] == "a"
+    items.close()
+    scanned = len(pages)
+    # The buffer bounds how far the scan runs ahead of the consumer.
+    assert scanned <= 6
+    assert len(pages) == scanned
+
+
+@pytest.mark.asyncio
+async def test_ascan():
+    table = DynamoDBTable("table", state_file="tests/data/aws.tfstate")
+    _create_table(table)
+    table.batch_write({"pk": f"user-{i}", "sk": i} for i in range(50))
+
+    items = [item async for item in table.ascan(segments=3)]
+
+    assert sorted(item["sk"] for item in items) == list(range(50))
@@ -0,0 +1,16 @@
+from terrabridge.aws.s3_bucket import S3Bucket
+
+
+def test_s3_bucket():
+    bucket = S3Bucket("bucket", state_file="tests/data/aws.tfstate")
+
+    assert bucket.id == "terrabridge-testing-bucket"
+    assert bucket.bucket == "terrabridge-testing-bucket"
+    assert bucket.arn == "arn:aws:s3:::terrabridge-testing-bucket"
+    assert bucket.region == "us-east-1"
+    assert bucket.url == "s3://terrabridge-testing-bucket"
+
+    bucket.client().create_bucket(Bucket=bucket.bucket)
+    bucket.write("hello.txt", b"Hello, world!")
+
+    assert bucket.read("hello.txt") == b"Hello, world!"
@@ -0,0 +1,17 @@
+from terrabridge.aws.secrets_manager import SecretsManagerSecret
+
+
+def test_secrets_manager_secret():
+    secret = SecretsManagerSecret("secret", state_file="tests/data/aws.tfstate")
+
+    assert secret.name == "terrabridge-testing-secret"
+    assert secret.region == "us-east-1"
+    assert secret.arn.startswith(
+        "arn:aws:secretsmanager:us-east-1:123456789012:secret:terrabridge-testing-secret"
+    )
+
+    secret.client().create_secret(Name=secret.name, SecretString="secret")
+    assert secret.version() == b"secret"
+
+    secret.client().put_secret_value(SecretId=secret.name, SecretBinary=b"\x00\x01")
+    assert secret.version() == b"\x00\x01"
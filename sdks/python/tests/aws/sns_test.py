@@ -0,0 +1,50 @@
+from terrabridge.aws.sns import SNSTopic
+from terrabridge.aws.sqs import SQSQueue
+
+
+def test_sns_topic():
+    topic = SNSTopic("topic", state_file="tests/data/aws.tfstate")
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+
+    assert topic.name == "terrabridge-testing-topic"
+    assert topic.arn == "arn:aws:sns:us-east-1:123456789012:terrabridge-testing-topic"
+    assert topic.id == topic.arn
+    assert topic.region == "us-east-1"
+
+    topic.client().create_topic(Name=topic.name)
+    queue.client().create_queue(QueueName=queue.name)
+    topic.client().subscribe(
+        TopicArn=topic.arn,
+        Protocol="sqs",
+        Endpoint=queue.arn,
+        Attributes={"RawMessageDelivery": "true"},
+    )
+
+    assert topic.publish("Hello, world!", subject="greeting")
+    (message,) = queue.receive()
+    assert message["Body"] == "Hello, world!"
+
+
+def test_publish_batch():
+    topic = SNSTopic("topic", state_file="tests/data/aws.tfstate")
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+    topic.client().create_topic(Name=topic.name)
+    queue.client().create_queue(QueueName=queue.name)
+    topic.client().subscribe(
+        TopicArn=topic.arn,
+        Protocol="sqs",
+        Endpoint=queue.arn,
+        Attributes={"RawMessageDelivery": "true"},
+    )
+
+    ids = topic.publish_batch(
+        [f"message {i}" for i in range(14)]
+        + [{"Message": "with subject", "Subject": "greeting"}]
+    )
+
+    assert len(set(ids)) == 15
+    batches = queue.receive_batches(wait_time_seconds=0, stop_when_empty=True)
+    bodies = [message["Body"] for batch in batches for message in batch]
+    assert sorted(bodies) == sorted(
+        [f"message {i}" for i in range(14)] + ["with subject"]
+    )
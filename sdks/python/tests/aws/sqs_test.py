@@ -0,0 +1,227 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from terrabridge.aws import batching
+from terrabridge.aws.batching import BatchError, _pack
+from terrabridge.aws import sqs
+from terrabridge.aws.sqs import SQSQueue
+
+
+def test_sqs_queue():
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+
+    assert queue.name == "terrabridge-testing-queue"
+    assert queue.region == "us-east-1"
+    assert (
+        queue.url
+        == "https://sqs.us-east-1.amazonaws.com/123456789012/terrabridge-testing-queue"
+    )
+
+    queue.client().create_queue(QueueName=queue.name)
+    message_id = queue.send("Hello, world!")
+    (message,) = queue.receive(max_messages=10)
+
+    assert message["MessageId"] == message_id
+    assert message["Body"] == "Hello, world!"
+
+    queue.delete(message["ReceiptHandle"])
+    attributes = queue.client().get_queue_attributes(
+        QueueUrl=queue.url, AttributeNames=["ApproximateNumberOfMessagesNotVisible"]
+    )
+    assert attributes["Attributes"]["ApproximateNumberOfMessagesNotVisible"] == "0"
+
+
+def _queue():
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+    queue.client().create_queue(QueueName=queue.name)
+    return queue
+
+
+def test_send_receive_delete_many():
+    queue = _queue()
+
+    ids = queue.send_many(
+        [f"message {i}" for i in range(24)]
+        + [{"MessageBody": "delayed", "DelaySeconds": 0}]
+    )
+    assert len(set(ids)) == 25
+
+    batches = list(queue.receive_batches(wait_time_seconds=0, stop_when_empty=True))
+    messages = [message for batch in batches for message in batch]
+    assert all(1 <= len(batch) <= 10 for batch in batches)
+    assert sorted(message["MessageId"] for message in messages) == sorted(ids)
+
+    queue.delete_many(messages[:5])
+    queue.delete_many([message["ReceiptHandle"] for message in messages[5:]])
+    attributes = queue.client().get_queue_attributes(
+        QueueUrl=queue.url, AttributeNames=["ApproximateNumberOfMessagesNotVisible"]
+    )
+    assert attributes["Attributes"]["ApproximateNumberOfMessagesNotVisible"] == "0"
+
+
+def test_pack_respects_count_and_size_limits():
+    small = [{"MessageBody": "x"} for _ in range(25)]
+    assert [len(batch) for batch in _pack(small, "MessageBody")] == [10, 10, 5]
+
+    large = [{"MessageBody": "x" * 100 * 1024} for _ in range(5)]
+    assert list(_pack(large, "MessageBody")) == [[0, 1], [2, 3], [4]]
+
+    with pytest.raises(ValueError):
+        list(_pack([{"MessageBody": "x" * (256 * 1024 + 1)}], "MessageBody"))
+
+
+def test_send_many_retries_server_failures(monkeypatch):
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+    calls = []
+
+    def send_message_batch(QueueUrl, Entries):
+        calls.append([entry["Id"] for entry in Entries])
+        if len(calls) == 1:
+            return {
+                "Successful": [{"Id": "0", "MessageId": "a"}],
+                "Failed": [{"Id": "1", "SenderFault": False, "Code": "InternalError"}],
+            }
+        return {
+            "Successful": [{"Id": entry["Id"], "MessageId": "b"} for entry in Entries]
+        }
+
+    client = SimpleNamespace(send_message_batch=send_message_batch)
+    monkeypatch.setattr(queue, "client", lambda: client)
+    monkeypatch.setattr(batching, "_backoff", lambda attempt: 0)
+
+    assert queue.send_many(["first", "second"]) == ["a", "b"]
+    assert calls == [["0", "1"], ["1"]]
+
+
+def test_send_many_raises_sender_faults(monkeypatch):
+    queue = SQSQueue("queue", state_file="tests/data/aws.tfstate")
+    client = SimpleNamespace(
+        send_message_batch=lambda QueueUrl, Entries: {
+            "Successful": [],
+            "Failed": [
+                {"Id": entry["Id"], "SenderFault": True, "Code": "InvalidMessage"}
+                for entry in Entries
+            ],
+        }
+    )
+    monkeypatch.setattr(queue, "client", lambda: client)
+
+    with pytest.raises(BatchError) as error:
+        queue.send_many(["a", "b"])
+    assert [failure["Id"] for failure in error.value.failed] == ["0", "1"]
+
+
+def test_consume(monkeypatch):
+    queue = _queue()
+    queue.send_many([str(i) for i in range(50)])
+    # moto's receive isn't atomic, concurrent pollers can occasionally get the
+    # same message. Real SQS has at-least-once delivery too, but this test
+    # counts exact deliveries.
+    client = queue.client()
+    receive_lock = threading.Lock()
+    receive_message = client.receive_message
+
+    def locked_receive_message(**kwargs):
+        with receive_lock:
+            return receive_message(**kwargs)
+
+    monkeypatch.setattr(client, "receive_message", locked_receive_message)
+    bodies = []
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def handler(message):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+            bodies.append(message["Body"])
+        if message["Body"] == "7":
+            raise ValueError("failed")
+
+    errors = []
+    handled = queue.consume(
+        handler,
+        pollers=2,
+        max_workers=16,
+        max_in_flight=3,
+        wait_time_seconds=0,
+        stop_when_empty=True,
+        on_error=lambda message, e: errors.append(message["Body"]),
+    )
+
+    assert handled == 49
+    assert sorted(bodies, key=int) == [str(i) for i in range(50)]
+    assert errors == ["7"]
+    assert max_running <= 3
+    attributes = queue.client().get_queue_attributes(
+        QueueUrl=queue.url, AttributeNames=["ApproximateNumberOfMessagesNotVisible"]
+    )
+    # Only the failed message is left, waiting to be delivered again.
+    assert attributes["Attributes"]["ApproximateNumberOfMessagesNotVisible"] == "1"
+
+
+def test_consume_raises_failed_deletes(monkeypatch):
+    queue = _queue()
+    queue.send_many([str(i) for i in range(5)])
+    delete_many = queue.delete_many
+    deleted = []
+
+    def failing_delete_many(messages, **kwargs):
+        delete_many(messages[1:], **kwargs)
+        deleted.extend(messages[1:])
+        raise BatchError([{"Id": "0", "SenderFault": True, "Code": "Invalid"}])
+
+    monkeypatch.setattr(queue, "delete_many", failing_delete_many)
+
+    with pytest.raises(BatchError):
+        queue.consume(
+            lambda message: None,
+            pollers=1,
+            wait_time_seconds=0,
+            stop_when_empty=True,
+        )
+
+    assert deleted
+
+
+def test_consume_raises_on_error_failures():
+    queue = _queue()
+    queue.send_many([str(i) for i in range(5)])
+
+    def handler(message):
+        if message["Body"] == "3":
+            raise ValueError("failed")
+
+    def on_error(message, e):
+        raise RuntimeError(f"could not report {message['Body']}")
+
+    with pytest.raises(RuntimeError, match="could not report 3"):
+        queue.consume(
+            handler,
+            pollers=1,
+            wait_time_seconds=0,
+            stop_when_empty=True,
+            on_error=on_error,
+        )
+
+
+def test_delete_buffer_counts_deleted_messages():
+    def delete_many(messages):
+        if "b" in messages:
+            raise BatchError([{"Id": "1", "SenderFault": True, "Code": "Invalid"}])
+
+    buffer = sqs._DeleteBuffer(SimpleNamespace(delete_many=delete_many))
+
+    buffer._delete(["a", "b", "c"])
+    buffer._delete(["d"])
+
+    assert buffer.deleted == 3
+    assert len(buffer.errors) == 1
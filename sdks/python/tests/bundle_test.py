@@ -0,0 +1,120 @@
+import json
+import shutil
+
+import pytest
+
+from terrabridge import cli, parser
+from terrabridge.bundle import Bundle, check_bundle, compile_bundle, load_bundle
+from terrabridge.gcp import CloudSQLDatabase, GCSBucket, PubSubTopic
+from terrabridge.parser import _ResourceKey
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    path = str(tmp_path / "terraform.tfstate")
+    shutil.copy("tests/data/terraform.tfstate", path)
+    yield path
+    parser.tf_state_cache.pop(path, None)
+
+
+def test_compile_and_load(tmp_path, state_file, monkeypatch):
+    output = str(tmp_path / "terraform.tfb")
+    manifest = {
+        "resources": [
+            {"name": "bucket", "attributes": ["id", "project", "name", "url"]},
+            {"name": "topic", "type": "google_pubsub_topic"},
+        ]
+    }
+    header = compile_bundle([state_file], output, manifest)
+    assert header["sources"][0]["serial"] == 29
+    assert header["sources"][0]["lineage"] == "e5ca0523-223a-9e41-49b9-430f7514ffdf"
+
+    def fetch(*args):
+        raise AssertionError("bundles are never fetched")
+
+    monkeypatch.setattr(parser, "_fetch_state", fetch)
+    bundle = load_bundle(output)
+
+    bucket = GCSBucket("bucket", state_file=state_file)
+    assert bucket.url == "gs://terrabridge-testing-terrabridge-testing"
+    assert set(bucket._attributes) == {"id", "project", "name", "url"}
+    assert PubSubTopic("topic", state_file=state_file).name == "example-topic"
+    with pytest.raises(ValueError):
+        GCSBucket("dataset", state_file=state_file)
+    bundle.close()
+
+
+def test_dependencies_decode_only_used_resources(tmp_path, state_file):
+    output = str(tmp_path / "terraform.tfb")
+    compile_bundle([state_file], output)
+    bundle = load_bundle(output)
+
+    database = CloudSQLDatabase("database", state_file=state_file)
+    assert database.cloud_sql_instance.name == "terrabridge-testing-instance"
+    # The graph is built from the header, only the database and its instance
+    # were decoded.
+    assert set(bundle.state(state_file)._resources) == {
+        _ResourceKey("database", None),
+        _ResourceKey("cloud_sql_instance", None),
+    }
+    assert parser.dependency_graph(state_file).dependents(
+        "google_sql_database_instance.cloud_sql_instance"
+    ) == ["google_sql_database.database", "google_sql_user.user"]
+    bundle.close()
+
+
+def test_compile_errors(tmp_path, state_file):
+    output = str(tmp_path / "terraform.tfb")
+    with pytest.raises(ValueError):
+        compile_bundle([state_file], output, {"resources": [{"name": "missing"}]})
+    with pytest.raises(ValueError):
+        compile_bundle(
+            [state_file],
+            output,
+            {"resources": [{"name": "bucket", "attributes": ["missing"]}]},
+        )
+    with pytest.raises(ValueError):
+        compile_bundle(
+            [state_file],
+            output,
+            {"resources": [{"name": "bucket", "type": "google_pubsub_topic"}]},
+        )
+
+    with open(state_file, "rb") as f:
+        with pytest.raises(ValueError):
+            Bundle(f.name)
+
+
+def test_env_bundle(tmp_path, state_file, monkeypatch):
+    output = str(tmp_path / "terraform.tfb")
+    compile_bundle([state_file], output)
+    parser.tf_state_cache.pop(state_file, None)
+    monkeypatch.setenv("TERRABRIDGE_BUNDLE", output)
+    monkeypatch.setattr(parser, "_env_bundle_loaded", False)
+
+    bucket = GCSBucket("bucket", state_file=state_file)
+    assert bucket.url == "gs://terrabridge-testing-terrabridge-testing"
+    assert parser._state_versions[state_file] is None
+
+
+def test_cli(tmp_path, state_file, capsys):
+    output = str(tmp_path / "terraform.tfb")
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"resources": [{"name": "bucket"}]}))
+
+    assert (
+        cli.main(["compile", state_file, "-o", output, "--manifest", str(manifest)])
+        == 0
+    )
+    assert "Wrote 1 resources from 1 state files" in capsys.readouterr().out
+    assert cli.main(["check", output]) == 0
+    assert check_bundle(output) == []
+
+    with open(state_file) as f:
+        state = json.load(f)
+    state["serial"] += 1
+    with open(state_file, "w") as f:
+        json.dump(state, f)
+
+    assert cli.main(["check", output]) == 1
+    assert "serial 30" in capsys.readouterr().err
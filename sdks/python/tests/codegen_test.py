@@ -0,0 +1,186 @@
+import importlib.util
+import json
+
+import pytest
+
+from terrabridge import cli, parser
+from terrabridge.codegen import _resource_classes, generate
+from terrabridge.gcp import GCSBucket
+from terrabridge.gcp.base import GCPResource
+
+STATE_FILE = "tests/data/terraform.tfstate"
+AWS_STATE_FILE = "tests/data/aws.tfstate"
+
+
+@pytest.fixture
+def schema():
+    with open("tests/data/providers_schema.json") as f:
+        return json.load(f)
+
+
+def _load(tmp_path, source, name="tf_types"):
+    path = tmp_path / f"{name}.py"
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generate_supported_types(tmp_path, schema):
+    tf_types = _load(tmp_path, generate(schema))
+    # Only types terrabridge has classes for are generated by default.
+    assert set(tf_types.RESOURCE_TYPES) == {
+        "google_pubsub_topic",
+        "google_storage_bucket",
+    }
+
+    bucket = tf_types.GoogleStorageBucket("bucket", state_file=STATE_FILE)
+    assert isinstance(bucket, GCSBucket)
+    assert bucket.url == "gs://terrabridge-testing-terrabridge-testing"
+    assert bucket.location == "US"
+    assert bucket.force_destroy is False
+    assert bucket.lifecycle_rule == []
+    assert bucket.timeouts is None
+    # Attributes live in slots, not in the instance dict.
+    assert "location" in type(bucket).__slots__
+    assert "location" not in bucket.__dict__
+
+    topic = tf_types.GooglePubsubTopic("topic", state_file=STATE_FILE)
+    assert topic.name == "example-topic"
+    assert topic.labels == {}
+
+
+def test_generate_nested_blocks(tmp_path, schema):
+    tf_types = _load(
+        tmp_path, generate(schema, ["google_storage_bucket", "google_compute_network"])
+    )
+    assert issubclass(tf_types.GoogleComputeNetwork, GCPResource)
+
+    state_file = str(tmp_path / "terraform.tfstate")
+    with open(state_file, "w") as f:
+        json.dump(
+            {
+                "version": 4,
+                "resources": [
+                    {
+                        "mode": "managed",
+                        "type": "google_storage_bucket",
+                        "name": "bucket",
+                        "instances": [
+                            {
+                                "attributes": {
+                                    "id": "b",
+                                    "name": "b",
+                                    "project": "p",
+                                    "url": "gs://b",
+                                    "lifecycle_rule": [
+                                        {
+                                            "action": [{"type": "Delete"}],
+                                            "condition": [
+                                                {"age": 30, "matches_prefix": ["tmp/"]}
+                                            ],
+                                        }
+                                    ],
+                                    "timeouts": {"create": "10m"},
+                                }
+                            }
+                        ],
+                    }
+                ],
+            },
+            f,
+        )
+    try:
+        bucket = tf_types.GoogleStorageBucket("bucket", state_file=state_file)
+        rule = bucket.lifecycle_rule[0]
+        assert rule.action[0].type == "Delete"
+        assert rule.condition[0].age == 30
+        assert rule.condition[0].matches_prefix == ["tmp/"]
+        assert bucket.timeouts.create == "10m"
+        # Nested blocks are fully slotted.
+        assert not hasattr(rule, "__dict__")
+        assert bucket.location is None
+    finally:
+        parser.tf_state_cache.pop(state_file, None)
+
+
+def test_generate_every_resource_class(tmp_path):
+    # A schema declaring every attribute the test states have, for every type
+    # terrabridge has a class for.
+    resources = {}
+    for state_file in (STATE_FILE, AWS_STATE_FILE):
+        with open(state_file) as f:
+            for resource in json.load(f)["resources"]:
+                resources.setdefault(resource["type"], (state_file, resource))
+    resource_schemas = {
+        terraform_type: {
+            "block": {
+                "attributes": {
+                    attribute: {"type": "dynamic"}
+                    for attribute in resource["instances"][0]["attributes"]
+                }
+            }
+        }
+        for terraform_type, (_, resource) in resources.items()
+    }
+    schema = {"provider_schemas": {"test": {"resource_schemas": resource_schemas}}}
+    tf_types = _load(tmp_path, generate(schema))
+
+    classes = _resource_classes()
+    assert set(tf_types.RESOURCE_TYPES) == set(classes)
+    try:
+        for terraform_type, generated in tf_types.RESOURCE_TYPES.items():
+            state_file, resource = resources[terraform_type]
+            typed = generated(resource["name"], state_file=state_file)
+            base = classes[terraform_type](resource["name"], state_file=state_file)
+            assert isinstance(typed, classes[terraform_type])
+            for name in generated.__slots__:
+                if not name.endswith("_"):
+                    assert getattr(typed, name) == getattr(base, name), name
+    finally:
+        parser.tf_state_cache.pop(STATE_FILE, None)
+        parser.tf_state_cache.pop(AWS_STATE_FILE, None)
+
+
+def test_generate_renames_reserved_names(tmp_path):
+    schema = {
+        "provider_schemas": {
+            "test": {
+                "resource_schemas": {
+                    "google_secret_manager_secret": {
+                        "block": {
+                            "attributes": {
+                                "id": {"type": "string"},
+                                "project": {"type": "string"},
+                                "version": {"type": "number"},
+                                "global": {"type": "bool"},
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    source = generate(schema)
+    assert '"version_"' in source
+    assert '"global_"' in source
+    _load(tmp_path, source)
+
+    with pytest.raises(ValueError):
+        generate(schema, ["google_storage_bucket"])
+
+
+def test_cli_generate(tmp_path):
+    output = tmp_path / "tf_types.py"
+    argv = [
+        "generate",
+        "tests/data/providers_schema.json",
+        "-o",
+        str(output),
+        "--type",
+        "google_compute_network",
+    ]
+    assert cli.main(argv) == 0
+    tf_types = _load(tmp_path, output.read_text(), name="cli_types")
+    assert list(tf_types.RESOURCE_TYPES) == ["google_compute_network"]
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+
+import pytest
+
+from terrabridge import parser
+from terrabridge.gcp import BigQueryTable, CloudSQLDatabase, GCSBucket
+from terrabridge.gcp.clients import get_client, registry
+
+STATE_FILE = "tests/data/terraform.tfstate"
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="requires the fork start method",
+)
+
+
+class _Client:
+    def __init__(self):
+        self.pid = os.getpid()
+
+
+def _no_reparse(path):
+    raise AssertionError(f"{path} was parsed again in a child process")
+
+
+def _read_resources(_):
+    bucket = GCSBucket("bucket", state_file=STATE_FILE)
+    table = BigQueryTable("table", state_file=STATE_FILE)
+    database = CloudSQLDatabase("database", state_file=STATE_FILE)
+    return bucket.url, table.table_id, database.name
+
+
+def _client_pid(_):
+    return get_client("fork-test", _Client).pid, os.getpid()
+
+
+@pytest.fixture(autouse=True)
+def parsed_state(monkeypatch):
+    # Parse the state in the parent, then make sure no child parses it again.
+    GCSBucket("bucket", state_file=STATE_FILE)
+    monkeypatch.setattr(parser, "_parse_terraform_state", _no_reparse)
+    yield
+    registry._reset()
+
+
+def _fork_pool():
+    return multiprocessing.get_context("fork").Pool(4)
+
+
+def test_children_share_parsed_state():
+    with _fork_pool() as pool:
+        results = pool.map(_read_resources, range(16))
+
+    assert results == [_read_resources(None)] * 16
+
+
+def test_children_recreate_clients():
+    parent = get_client("fork-test", _Client)
+
+    with _fork_pool() as pool:
+        results = pool.map(_client_pid, range(16))
+
+    assert all(client_pid == pid for client_pid, pid in results)
+    assert all(pid != os.getpid() for _, pid in results)
+    assert get_client("fork-test", _Client) is parent
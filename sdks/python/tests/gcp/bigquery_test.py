@@ -1,4 +1,13 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pyarrow
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from terrabridge.gcp import bigquery
 from terrabridge.gcp.bigquery import BigQueryDataset, BigQueryTable
+from terrabridge.gcp.gcs_bucket import GCSBucket
 
 
 def test_bigquery_dataset():
@@ -36,3 +45,398 @@ def test_type_mismatch():
     except ValueError:
         return
     assert False, "Expected ValueError"
+
+
+class _FakeReadClient:
+    def __init__(self, streams):
+        self.streams = streams
+        self.requests = []
+
+    def create_read_session(self, parent, read_session, max_stream_count):
+        self.requests.append((parent, read_session, max_stream_count))
+        return SimpleNamespace(
+            arrow_schema=SimpleNamespace(
+                serialized_schema=_SCHEMA.serialize().to_pybytes()
+            ),
+            streams=[SimpleNamespace(name=name) for name in self.streams],
+        )
+
+    def read_rows(self, name):
+        for batch in self.streams[name]:
+            yield SimpleNamespace(
+                arrow_record_batch=SimpleNamespace(
+                    serialized_record_batch=batch.serialize().to_pybytes()
+                )
+            )
+
+
+_SCHEMA = pyarrow.schema([("name", pyarrow.string()), ("age", pyarrow.int64())])
+
+
+def _batch(start, rows):
+    return pyarrow.record_batch(
+        [
+            pyarrow.array([f"user-{i}" for i in range(start, start + rows)]),
+            pyarrow.array(list(range(start, start + rows))),
+        ],
+        schema=_SCHEMA,
+    )
+
+
+@pytest.fixture
+def read_client(monkeypatch):
+    client = _FakeReadClient(
+        {
+            "stream-0": [_batch(0, 10), _batch(10, 10)],
+            "stream-1": [_batch(20, 5)],
+            "stream-2": [],
+        }
+    )
+    monkeypatch.setattr(bigquery, "_get_read_client", lambda: client)
+    return client
+
+
+def test_bigquery_table_iter_record_batches(read_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+
+    batches = list(
+        table.iter_record_batches(
+            columns=["name", "age"], row_filter="age > 1", max_streams=3
+        )
+    )
+
+    assert sorted(batch.num_rows for batch in batches) == [5, 10, 10]
+    parent, session, max_streams = read_client.requests[0]
+    assert parent == "projects/terrabridge-testing"
+    assert session.table == (
+        "projects/terrabridge-testing/datasets/"
+        "terrabridge_testing_dataset/tables/terrabridge-testing-table"
+    )
+    assert list(session.read_options.selected_fields) == ["name", "age"]
+    assert session.read_options.row_restriction == "age > 1"
+    assert max_streams == 3
+
+
+def test_bigquery_table_read_arrow(read_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+
+    arrow_table = table.read_arrow(max_streams=3)
+
+    assert arrow_table.schema == _SCHEMA
+    assert sorted(arrow_table.column("age").to_pylist()) == list(range(25))
+
+
+def test_bigquery_table_stream_error(read_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    read_client.streams["stream-1"] = None
+
+    with pytest.raises(TypeError):
+        list(table.iter_record_batches(max_streams=3))
+
+
+class _FakeWriteClient:
+    def __init__(self):
+        self.streams = []
+        self.appends = []
+        self.errors = []
+        self.finalized = []
+        self.committed = []
+
+    def create_write_stream(self, parent, write_stream):
+        name = f"{parent}/streams/stream-{len(self.streams)}"
+        self.streams.append((name, write_stream.type_))
+        return SimpleNamespace(name=name)
+
+    def append_rows(self, requests, metadata):
+        for request in requests:
+            if self.errors:
+                error = self.errors.pop(0)
+                if isinstance(error, Exception):
+                    raise error
+                yield SimpleNamespace(error=SimpleNamespace(code=error, message=""))
+                continue
+            self.appends.append(
+                (
+                    request.write_stream,
+                    request.offset,
+                    pyarrow.ipc.read_record_batch(
+                        pyarrow.py_buffer(
+                            request.arrow_rows.rows.serialized_record_batch
+                        ),
+                        pyarrow.ipc.read_schema(
+                            pyarrow.py_buffer(
+                                request.arrow_rows.writer_schema.serialized_schema
+                            )
+                        ),
+                    ),
+                )
+            )
+            yield SimpleNamespace(error=SimpleNamespace(code=0, message=""))
+
+    def finalize_write_stream(self, name):
+        self.finalized.append(name)
+
+    def batch_commit_write_streams(self, request):
+        self.committed.extend(request.write_streams)
+        return SimpleNamespace(stream_errors=[])
+
+
+@pytest.fixture
+def write_client(monkeypatch):
+    client = _FakeWriteClient()
+    monkeypatch.setattr(bigquery, "_get_write_client", lambda: client)
+    monkeypatch.setattr(bigquery, "_RETRY_INITIAL", 0)
+    return client
+
+
+def test_bigquery_table_write_default_stream(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    batch = _batch(0, 100)
+
+    rows = table.write(
+        [batch, _batch(100, 20)], max_streams=2, max_request_bytes=batch.nbytes // 4
+    )
+
+    assert rows == 120
+    assert len(write_client.appends) > 2
+    assert write_client.streams == []
+    assert {stream for stream, _, _ in write_client.appends} == {
+        f"{table._table_path()}/streams/_default"
+    }
+    assert all(offset is None for _, offset, _ in write_client.appends)
+    written = pyarrow.Table.from_batches([b for _, _, b in write_client.appends])
+    assert sorted(written.column("age").to_pylist()) == list(range(120))
+
+
+def test_bigquery_table_write_committed_retries(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    write_client.errors = [
+        api_exceptions.ServiceUnavailable("unavailable"),
+        # The retried append was already written before the connection dropped.
+        6,
+    ]
+
+    rows = table.write(
+        pyarrow.Table.from_batches([_batch(0, 10), _batch(10, 10), _batch(20, 10)]),
+        mode="committed",
+    )
+
+    assert rows == 30
+    ((stream, stream_type),) = write_client.streams
+    assert stream_type == bigquery.bigquery_storage_types.WriteStream.Type.COMMITTED
+    assert [offset for _, offset, _ in write_client.appends] == [10, 20]
+    assert write_client.finalized == [stream]
+    assert write_client.committed == []
+
+
+def test_bigquery_table_write_pending_commits(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+
+    rows = table.write(
+        (_batch(i * 10, 10) for i in range(10)), mode="pending", max_streams=3
+    )
+
+    assert rows == 100
+    streams = [name for name, _ in write_client.streams]
+    assert len(streams) == 3
+    assert sorted(write_client.committed) == sorted(streams)
+    for stream in streams:
+        offsets = [offset for name, offset, _ in write_client.appends if name == stream]
+        assert offsets == [i * 10 for i in range(len(offsets))]
+
+
+def test_bigquery_table_write_error_skips_commit(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    write_client.errors = [api_exceptions.InvalidArgument("bad schema")]
+
+    with pytest.raises(api_exceptions.InvalidArgument):
+        table.write([_batch(0, 10)], mode="pending")
+
+    assert write_client.committed == []
+
+
+def test_bigquery_table_write_error_stops_reading(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    write_client.errors = [api_exceptions.InvalidArgument("bad schema")]
+    read = []
+
+    def batches():
+        for i in range(1000):
+            read.append(i)
+            yield _batch(i, 1)
+
+    with pytest.raises(api_exceptions.InvalidArgument):
+        table.write(batches(), mode="committed")
+
+    assert len(read) < 1000
+
+
+@pytest.mark.asyncio
+async def test_bigquery_table_awrite(write_client):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+
+    async def batches():
+        for i in range(5):
+            yield _batch(i * 10, 10)
+
+    rows = await table.awrite(batches(), max_streams=2)
+
+    assert rows == 50
+    assert len(write_client.appends) == 5
+
+
+def test_bigquery_table_load_from_gcs(monkeypatch):
+    table = BigQueryTable(
+        resource_name="table", state_file="tests/data/terraform.tfstate"
+    )
+    bucket = GCSBucket(
+        resource_name="bucket", state_file="tests/data/terraform.tfstate"
+    )
+    client = MagicMock()
+    monkeypatch.setattr(bigquery, "_get_client", lambda: client)
+
+    job = table.load_from_gcs(bucket, ["a.parquet", "/b/*.parquet"])
+
+    assert job is client.load_table_from_uri.return_value
+    job.result.assert_called_once_with()
+    uris, destination = client.load_table_from_uri.call_args.args
+    assert uris == [
+        f"gs://{bucket.name}/a.parquet",
+        f"gs://{bucket.name}/b/*.parquet",
+    ]
+    assert destination == (
+        "terrabridge-testing.terrabridge_testing_dataset.terrabridge-testing-table"
+    )
+    job_config = client.load_table_from_uri.call_args.kwargs["job_config"]
+    assert job_config.source_format == "PARQUET"
+    assert job_config.write_disposition == "WRITE_APPEND"
+
+
+@pytest.fixture
+def query_client(monkeypatch, read_client):
+    client = MagicMock()
+    results = {
+        "SELECT name FROM users WHERE age > @age": [_batch(0, 10), _batch(10, 5)],
+        "SELECT name FROM users WHERE age > 200": [],
+    }
+    modified = {"value": 1}
+
+    def query(sql, job_config):
+        if job_config.dry_run:
+            return SimpleNamespace(
+                statement_type="SELECT",
+                referenced_tables=["terrabridge-testing.dataset.users"],
+            )
+        job = MagicMock()
+        job.result.return_value.to_arrow_iterable.return_value = iter(
+            results[" ".join(sql.split())]
+        )
+        return job
+
+    client.query.side_effect = query
+    client.get_table.side_effect = lambda reference: SimpleNamespace(
+        full_table_id=reference, modified=modified["value"]
+    )
+    client.modified = modified
+    monkeypatch.setattr(bigquery, "_get_client", lambda: client)
+    return client
+
+
+def _jobs(client):
+    return [
+        c for c in client.query.call_args_list if not c.kwargs["job_config"].dry_run
+    ]
+
+
+def test_bigquery_dataset_query(query_client):
+    dataset = BigQueryDataset(
+        resource_name="dataset", state_file="tests/data/terraform.tfstate"
+    )
+
+    batches = list(
+        dataset.query("SELECT name FROM users WHERE age > @age", {"age": 21})
+    )
+
+    assert [batch.num_rows for batch in batches] == [10, 5]
+    (job,) = _jobs(query_client)
+    job_config = job.kwargs["job_config"]
+    assert job_config.default_dataset.dataset_id == "terrabridge_testing_dataset"
+    (param,) = job_config.query_parameters
+    assert (param.name, param.type_, param.value) == ("age", "INT64", 21)
+
+
+def test_bigquery_dataset_query_cache(query_client):
+    dataset = BigQueryDataset(
+        resource_name="dataset", state_file="tests/data/terraform.tfstate"
+    )
+    cache = bigquery.QueryCache()
+    sql = "SELECT name FROM users WHERE age > @age"
+
+    first = pyarrow.Table.from_batches(dataset.query(sql, {"age": 21}, cache=cache))
+    second = pyarrow.Table.from_batches(
+        dataset.query(f"  {sql}\n", {"age": 21}, cache=cache)
+    )
+
+    assert first.equals(second)
+    assert len(_jobs(query_client)) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Different parameters and modified tables miss the cache.
+    list(dataset.query(sql, {"age": 30}, cache=cache))
+    query_client.modified["value"] = 2
+    list(dataset.query(sql, {"age": 21}, cache=cache))
+    assert len(_jobs(query_client)) == 3
+
+
+def test_bigquery_dataset_query_cache_empty_result(query_client):
+    dataset = BigQueryDataset(
+        resource_name="dataset", state_file="tests/data/terraform.tfstate"
+    )
+    cache = bigquery.QueryCache()
+    sql = "SELECT name FROM users WHERE age > 200"
+
+    # Job settings the cache key's dry run also sets are merged, not repeated.
+    assert list(dataset.query(sql, cache=cache, use_query_cache=False)) == []
+    assert list(dataset.query(sql, cache=cache, use_query_cache=False)) == []
+
+    assert len(_jobs(query_client)) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    dry_run = query_client.query.call_args.kwargs["job_config"]
+    assert dry_run.dry_run and not dry_run.use_query_cache
+
+
+def test_query_cache_eviction():
+    small = pyarrow.Table.from_batches([_batch(0, 10)])
+    cache = bigquery.QueryCache(max_bytes=small.nbytes * 2)
+
+    cache.put("a", small)
+    cache.put("b", small)
+    assert cache.get("a") is small
+    cache.put("c", small)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is small
+    assert cache.get("c") is small
+    assert cache.nbytes == small.nbytes * 2
+
+    cache.put("big", pyarrow.Table.from_batches([_batch(0, 100)]))
+    assert cache.get("big") is None
+    assert len(cache) == 2
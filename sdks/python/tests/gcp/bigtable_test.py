@@ -1,3 +1,16 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from google.cloud.bigtable.data import (
+    ReadRowsQuery,
+    RowMutationEntry,
+    RowRange,
+    SetCell,
+)
+
+from terrabridge.gcp import bigtable
 from terrabridge.gcp.bigtable import BigTableInstance, BigTableTable
 
 
@@ -26,3 +39,158 @@ def test_bigtable_table():
         "/terrabridge-bigtable-instance/tables/tf-table"
     )
     assert table.instance.project == "terrabridge-testing"
+
+
+def _in_range(key, row_range):
+    if row_range.start_key is not None:
+        if key < row_range.start_key or (
+            key == row_range.start_key and not row_range.start_is_inclusive
+        ):
+            return False
+    if row_range.end_key is not None:
+        if key > row_range.end_key or (
+            key == row_range.end_key and not row_range.end_is_inclusive
+        ):
+            return False
+    return True
+
+
+class _FakeTable:
+    def __init__(self, keys):
+        self.keys = keys
+        self.queries = []
+
+    def sample_row_keys(self):
+        return [(b"key-03", 0), (b"key-06", 0)]
+
+    def _rows(self, query):
+        self.queries.append(query)
+        return [
+            SimpleNamespace(row_key=key)
+            for key in self.keys
+            if any(_in_range(key, r) for r in query.row_ranges)
+        ]
+
+    def read_rows_stream(self, query):
+        return iter(self._rows(query))
+
+
+class _FakeAsyncTable(_FakeTable):
+    async def sample_row_keys(self):
+        return super().sample_row_keys()
+
+    async def read_rows_stream(self, query):
+        async def rows():
+            for row in self._rows(query):
+                yield row
+
+        return rows()
+
+
+_KEYS = [f"key-{i:02}".encode() for i in range(10)]
+
+
+def test_bigtable_table_shares_clients(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(bigtable.bigtable_data, "BigtableDataClient", client)
+    first = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    second = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+
+    assert first.table() is second.table()
+    client.assert_called_once_with(project="terrabridge-testing")
+    client.return_value.get_table.assert_called_once_with(
+        "terrabridge-bigtable-instance", "tf-table"
+    )
+
+
+def test_bigtable_table_mutations_batcher(monkeypatch):
+    table = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    data_table = MagicMock()
+    monkeypatch.setattr(bigtable, "_get_table", lambda *args: data_table)
+
+    batcher = table.mutations_batcher(flush_count=10, flush_bytes=1024)
+
+    assert batcher is data_table.mutations_batcher.return_value
+    data_table.mutations_batcher.assert_called_once_with(
+        flush_interval=5, flush_limit_mutation_count=10, flush_limit_bytes=1024
+    )
+
+
+def test_bigtable_table_read_rows_sharded(monkeypatch):
+    table = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    data_table = _FakeTable(_KEYS)
+    monkeypatch.setattr(bigtable, "_get_table", lambda *args: data_table)
+
+    rows = list(table.read_rows(max_workers=4, max_queue_size=2))
+
+    assert sorted(row.row_key for row in rows) == _KEYS
+    assert len(data_table.queries) == 3
+
+
+def test_bigtable_table_read_rows_error(monkeypatch):
+    table = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    data_table = _FakeTable(_KEYS)
+    data_table.read_rows_stream = MagicMock(side_effect=RuntimeError("boom"))
+    monkeypatch.setattr(bigtable, "_get_table", lambda *args: data_table)
+
+    with pytest.raises(RuntimeError):
+        list(table.read_rows(max_workers=2))
+
+
+@pytest.mark.asyncio
+async def test_bigtable_table_aread_rows_sharded(monkeypatch):
+    table = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    data_table = _FakeAsyncTable(_KEYS)
+    monkeypatch.setattr(bigtable, "_get_async_table", lambda *args: data_table)
+
+    rows = [row async for row in table.aread_rows(max_concurrency=2)]
+    assert sorted(row.row_key for row in rows) == _KEYS
+    assert len(data_table.queries) == 3
+
+    query = ReadRowsQuery(row_ranges=RowRange(start_key=b"key-08"))
+    rows = [row async for row in table.aread_rows(query)]
+    assert [row.row_key for row in rows] == _KEYS[8:]
+
+
+emulator = pytest.mark.skipif(
+    "BIGTABLE_EMULATOR_HOST" not in os.environ,
+    reason="requires the Bigtable emulator",
+)
+
+
+@pytest.fixture
+def emulator_table():
+    from google.cloud import bigtable as bigtable_admin
+    from google.cloud.bigtable import column_family
+
+    table = BigTableTable("bigtable_table", state_file="tests/data/terraform.tfstate")
+    admin = bigtable_admin.Client(project=table.project, admin=True)
+    admin_table = admin.instance(table.instance_name).table(table.name)
+    if admin_table.exists():
+        admin_table.delete()
+    admin_table.create(column_families={"cf": column_family.MaxVersionsGCRule(1)})
+    yield table
+    admin_table.delete()
+
+
+@emulator
+def test_bigtable_emulator_round_trip(emulator_table):
+    with emulator_table.mutations_batcher(flush_count=7) as batcher:
+        for key in _KEYS:
+            batcher.append(RowMutationEntry(key, [SetCell("cf", b"q", key)]))
+
+    rows = list(emulator_table.read_rows(max_workers=4))
+
+    assert sorted(row.row_key for row in rows) == _KEYS
+
+
+@emulator
+@pytest.mark.asyncio
+async def test_bigtable_emulator_async_round_trip(emulator_table):
+    async with await emulator_table.amutations_batcher(flush_count=7) as batcher:
+        for key in _KEYS:
+            await batcher.append(RowMutationEntry(key, [SetCell("cf", b"q", key)]))
+
+    rows = [row async for row in emulator_table.aread_rows(max_concurrency=4)]
+
+    assert sorted(row.row_key for row in rows) == _KEYS
@@ -0,0 +1,119 @@
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from terrabridge.gcp import clients
+from terrabridge.gcp.clients import ClientRegistry
+
+
+class _Client:
+    def __init__(self, **options):
+        self.options = options
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_registry_shares_clients():
+    registry = ClientRegistry()
+    credentials = object()
+
+    client = registry.get("storage", _Client, project="a")
+
+    assert registry.get("storage", _Client, project="a") is client
+    assert registry.get("storage", _Client, project="b") is not client
+    assert registry.get("pubsub", _Client, project="a") is not client
+    with_credentials = registry.get("storage", _Client, credentials=credentials)
+    assert with_credentials.options == {"credentials": credentials}
+    assert registry.get("storage", _Client, credentials=credentials) is (
+        with_credentials
+    )
+    assert registry.get("storage", _Client, options={"scopes": ["a"]}) is (
+        registry.get("storage", _Client, options={"scopes": ["a"]})
+    )
+    assert len(registry) == 5
+
+
+def test_registry_freezes_options_by_value():
+    class Options:
+        __hash__ = None
+
+        def __init__(self, endpoint):
+            self.endpoint = endpoint
+
+    registry = ClientRegistry()
+
+    client = registry.get("storage", _Client, options=Options("a"))
+
+    assert registry.get("storage", _Client, options=Options("a")) is client
+    assert registry.get("storage", _Client, options=Options("b")) is not client
+    with pytest.raises(TypeError):
+        registry.get("storage", _Client, options=bytearray(b"a"))
+
+
+def test_registry_discard():
+    registry = ClientRegistry()
+    client = registry.get("storage", _Client, project="a")
+
+    assert registry.discard("storage", project="a") is client
+    assert registry.discard("storage", project="a") is None
+    assert not client.closed
+    assert registry.get("storage", _Client, project="a") is not client
+
+
+def test_registry_close():
+    first = MagicMock()
+    first.__exit__.side_effect = RuntimeError("boom")
+    second = _Client()
+
+    with pytest.raises(RuntimeError):
+        with ClientRegistry() as registry:
+            registry.get("first", lambda: first)
+            registry.get("second", lambda: second)
+
+    first.__exit__.assert_called_once_with(None, None, None)
+    assert second.closed
+    assert len(registry) == 0
+    assert registry.get("second", _Client) is not second
+
+
+@pytest.mark.asyncio
+async def test_registry_async_clients():
+    client = MagicMock()
+    client.__aexit__ = AsyncMock()
+
+    async with ClientRegistry() as registry:
+        assert registry.get_async("service", lambda: client) is client
+        assert registry.get_async("service", MagicMock) is client
+
+    client.__aexit__.assert_awaited_once_with(None, None, None)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_registry_recreates_clients_after_fork():
+    parent = clients.get_client("service", _Client)
+    read, write = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            child = clients.get_client("service", _Client)
+            os.write(write, b"new" if child is not parent else b"shared")
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    assert os.read(read, 16) == b"new"
+    assert clients.get_client("service", _Client) is parent
+    assert not parent.closed
+
+
+def test_registry_detects_fork_without_hook(monkeypatch):
+    registry = ClientRegistry()
+    client = registry.get("service", _Client)
+    monkeypatch.setattr(registry, "pid", -1)
+
+    assert registry.get("service", _Client) is not client
+    assert registry.pid == os.getpid()
@@ -1,10 +1,37 @@
-from unittest.mock import ANY, patch
+import asyncio
+import sqlite3
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
-
-from terrabridge.gcp.cloud_sql import CloudSQLDatabase, CloudSQLInstance, CloudSQLUser
-
-# TODO: add tests for sqlalchemy_engine and async_sqlalchemy_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from terrabridge.gcp import cloud_sql
+from terrabridge.gcp.cloud_sql import (
+    POOL_PRESETS,
+    CloudSQLDatabase,
+    CloudSQLInstance,
+    CloudSQLUser,
+    PoolSettings,
+    ThreadedAsyncEngine,
+    adispose_engines,
+    _MeteredAsyncAdaptedQueuePool,
+    _MeteredQueuePool,
+    awarmup_engine,
+    dispose_engines,
+    pool_metrics,
+    warmup_engine,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    yield
+    cloud_sql._engines.clear()
+    cloud_sql._connectors.clear()
+    cloud_sql._async_engines.clear()
+    cloud_sql._async_connectors.clear()
+    cloud_sql._asyncpg_pools.clear()
 
 
 def test_cloud_sql_instance():
@@ -60,7 +87,7 @@ def test_cloud_sql_database_postgres_sqlalchemy():
         with patch("terrabridge.gcp.cloud_sql.Connector") as mock_connector:
             database.sqlalchemy_engine(user)
             mock_create_engine.assert_called_once_with(
-                "postgresql+pg8000://", creator=ANY
+                "postgresql+pg8000://", creator=ANY, poolclass=_MeteredQueuePool
             )
 
             creator = mock_create_engine.call_args.kwargs["creator"]
@@ -85,7 +112,9 @@ def test_cloud_sql_database_mysql_sqlalchemy():
     with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
         with patch("terrabridge.gcp.cloud_sql.Connector") as mock_connector:
             database.sqlalchemy_engine(user)
-            mock_create_engine.assert_called_once_with("mysql+pymysql://", creator=ANY)
+            mock_create_engine.assert_called_once_with(
+                "mysql+pymysql://", creator=ANY, poolclass=_MeteredQueuePool
+            )
 
             creator = mock_create_engine.call_args.kwargs["creator"]
             creator()
@@ -109,7 +138,9 @@ def test_cloud_sql_database_sqlserver_sqlalchemy():
     with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
         with patch("terrabridge.gcp.cloud_sql.Connector") as mock_connector:
             database.sqlalchemy_engine(user)
-            mock_create_engine.assert_called_once_with("mssql+pytds://", creator=ANY)
+            mock_create_engine.assert_called_once_with(
+                "mssql+pytds://", creator=ANY, poolclass=_MeteredQueuePool
+            )
 
             creator = mock_create_engine.call_args.kwargs["creator"]
             creator()
@@ -135,7 +166,9 @@ async def test_cloud_sql_database_postgres_async_sqlalchemy():
         ) as mock_connector:
             await database.async_sqlalchemy_engine(user)
             mock_create_engine.assert_called_once_with(
-                "postgresql+asyncpg://", async_creator=ANY
+                "postgresql+asyncpg://",
+                async_creator=ANY,
+                poolclass=_MeteredAsyncAdaptedQueuePool,
             )
 
             creator = mock_create_engine.call_args.kwargs["async_creator"]
@@ -150,6 +183,144 @@ async def test_cloud_sql_database_postgres_async_sqlalchemy():
             )
 
 
+def test_cloud_sql_database_engine_registry():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector") as mock_connector:
+            mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock()
+            pool = PoolSettings(pool_size=2, max_overflow=0)
+            engine = database.sqlalchemy_engine(user, pool=pool, echo=True)
+            assert database.sqlalchemy_engine(user, pool=pool, echo=True) is engine
+            mock_create_engine.assert_called_once_with(
+                "postgresql+pg8000://",
+                creator=ANY,
+                poolclass=_MeteredQueuePool,
+                pool_size=2,
+                max_overflow=0,
+                pool_timeout=30,
+                pool_recycle=-1,
+                pool_pre_ping=False,
+                echo=True,
+            )
+
+            # Different engine settings get their own engine, but share the
+            # connector.
+            assert database.sqlalchemy_engine(user) is not engine
+            mock_connector.assert_called_once()
+
+            dispose_engines()
+            engine.dispose.assert_called()
+            mock_connector.return_value.close.assert_called_once()
+            assert cloud_sql._engines == {}
+
+
+def test_cloud_sql_database_engine_registry_rotated_password():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector"):
+            mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock()
+            engine = database.sqlalchemy_engine(user)
+            user.password = "rotated"
+            assert database.sqlalchemy_engine(user) is not engine
+
+
+def test_cloud_sql_database_engine_registry_set_params():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector"):
+            mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock()
+            # Equal sets that iterate in a different order share the engine.
+            engine = database.sqlalchemy_engine(
+                user, execution_options={"tags": {1, 9}}
+            )
+            assert (
+                database.sqlalchemy_engine(user, execution_options={"tags": {9, 1}})
+                is engine
+            )
+            mock_create_engine.assert_called_once()
+
+
+def test_cloud_sql_after_fork_keeps_engines():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector") as mock_connector:
+            mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock()
+            parent_connector = MagicMock()
+            child_connector = MagicMock()
+            mock_connector.side_effect = [parent_connector, child_connector]
+            engine = database.sqlalchemy_engine(user)
+            creator = mock_create_engine.call_args.kwargs["creator"]
+
+            cloud_sql._after_fork()
+
+            engine.dispose.assert_called_once_with(close=False)
+            parent_connector.close.assert_not_called()
+            assert database.sqlalchemy_engine(user) is engine
+            creator()
+            parent_connector.connect.assert_not_called()
+            child_connector.connect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cloud_sql_database_async_engine_registry():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_async_engine") as mock_create_engine:
+        with patch(
+            "terrabridge.gcp.cloud_sql.create_async_connector"
+        ) as mock_connector:
+            mock_connector.return_value.close_async = AsyncMock()
+            mock_create_engine.return_value.dispose = AsyncMock()
+            engine = await database.async_sqlalchemy_engine(user)
+            assert await database.async_sqlalchemy_engine(user) is engine
+            mock_connector.assert_called_once()
+            mock_create_engine.assert_called_once()
+
+            await adispose_engines()
+            engine.dispose.assert_awaited_once()
+            mock_connector.return_value.close_async.assert_awaited_once()
+
+
+def test_cloud_sql_database_async_registry_drops_closed_loops():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_async_engine"):
+        with patch(
+            "terrabridge.gcp.cloud_sql.create_async_connector"
+        ) as mock_connector:
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(database.async_sqlalchemy_engine(user))
+            loop.close()
+            assert loop in cloud_sql._async_engines
+
+            asyncio.run(database.async_sqlalchemy_engine(user))
+            assert loop not in cloud_sql._async_connectors
+            assert loop not in cloud_sql._async_engines
+            assert mock_connector.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_cloud_sql_database_mysql_async_sqlalchemy():
     database = CloudSQLDatabase(
@@ -159,11 +330,51 @@ async def test_cloud_sql_database_mysql_async_sqlalchemy():
         resource_name="mysql_user1", state_file="tests/data/terraform.tfstate"
     )
 
-    try:
-        await database.async_sqlalchemy_engine(user)
-    except NotImplementedError:
-        return
-    raise AssertionError("Expected NotImplementedError")
+    with patch("terrabridge.gcp.cloud_sql._async_mysql_driver", return_value=None):
+        with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+            with patch("terrabridge.gcp.cloud_sql.Connector"):
+                engine = await database.async_sqlalchemy_engine(user)
+                assert isinstance(engine, ThreadedAsyncEngine)
+                assert engine.sync_engine is database.sqlalchemy_engine(user)
+                assert await database.async_sqlalchemy_engine(user) is engine
+                mock_create_engine.assert_called_once_with(
+                    "mysql+pymysql://", creator=ANY, poolclass=_MeteredQueuePool
+                )
+
+
+@pytest.mark.asyncio
+async def test_cloud_sql_database_mysql_native_async_sqlalchemy():
+    database = CloudSQLDatabase(
+        resource_name="mysql_database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(
+        resource_name="mysql_user1", state_file="tests/data/terraform.tfstate"
+    )
+
+    with patch("terrabridge.gcp.cloud_sql._async_mysql_driver", return_value="asyncmy"):
+        with patch(
+            "terrabridge.gcp.cloud_sql.create_async_engine"
+        ) as mock_create_engine:
+            with patch(
+                "terrabridge.gcp.cloud_sql.create_async_connector"
+            ) as mock_connector:
+                await database.async_sqlalchemy_engine(user)
+                mock_create_engine.assert_called_once_with(
+                    "mysql+asyncmy://",
+                    async_creator=ANY,
+                    poolclass=_MeteredAsyncAdaptedQueuePool,
+                )
+
+                creator = mock_create_engine.call_args.kwargs["async_creator"]
+                await creator()
+                mock_connector.return_value.connect_async.assert_called_once_with(
+                    instance_connection_string=database.cloud_sql_instance.connection_name,
+                    driver="asyncmy",
+                    user=user.name,
+                    password=user.password,
+                    db=database.name,
+                    ip_type=ANY,
+                )
 
 
 @pytest.mark.asyncio
@@ -175,8 +386,193 @@ async def test_cloud_sql_database_sqlserver_async_sqlalchemy():
         resource_name="sql_server_user", state_file="tests/data/terraform.tfstate"
     )
 
-    try:
-        await database.async_sqlalchemy_engine(user)
-    except NotImplementedError:
-        return
-    raise AssertionError("Expected NotImplementedError")
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector"):
+            engine = await database.async_sqlalchemy_engine(
+                user, pool=PoolSettings(pool_size=3, max_overflow=1)
+            )
+            assert isinstance(engine, ThreadedAsyncEngine)
+            assert engine._executor._max_workers == 4
+            mock_create_engine.assert_called_once_with(
+                "mssql+pytds://",
+                creator=ANY,
+                poolclass=_MeteredQueuePool,
+                pool_size=3,
+                max_overflow=1,
+                pool_timeout=30,
+                pool_recycle=-1,
+                pool_pre_ping=False,
+            )
+
+
+@pytest.mark.asyncio
+async def test_threaded_async_engine():
+    sync_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    engine = ThreadedAsyncEngine(sync_engine, max_workers=2)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE users (name TEXT)"))
+        await conn.execute(text("INSERT INTO users VALUES ('a'), ('b')"))
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT name FROM users ORDER BY name"))
+        assert result.scalars().all() == ["a", "b"]
+        assert await conn.scalar(text("SELECT COUNT(*) FROM users")) == 2
+        assert await conn.run_sync(lambda sync_conn: sync_conn.closed) is False
+
+    with pytest.raises(RuntimeError):
+        async with engine.begin() as conn:
+            await conn.execute(text("INSERT INTO users VALUES ('c')"))
+            raise RuntimeError()
+    async with engine.connect() as conn:
+        assert await conn.scalar(text("SELECT COUNT(*) FROM users")) == 2
+
+    await engine.dispose()
+
+
+def _sqlite_engine(poolclass, pool_size=3):
+    def creator():
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+    engine = create_engine(
+        "sqlite://", creator=creator, poolclass=poolclass, pool_size=pool_size
+    )
+    cloud_sql._instrument(engine)
+    return engine
+
+
+def test_warmup_engine_and_pool_metrics():
+    engine = _sqlite_engine(_MeteredQueuePool)
+
+    warmup_engine(engine, n=10)
+
+    stats = pool_metrics(engine).snapshot()
+    assert stats["connects"] == 3
+    assert stats["checkouts"] == 3
+    assert stats["checkedin"] == 3
+    assert stats["checkedout"] == 0
+    assert stats["overflow"] == 0
+    assert stats["checkout_latency_max"] >= stats["checkout_latency_p99"] > 0
+
+    # The metrics survive the pool being recreated.
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.invalidate()
+    stats = pool_metrics(engine).snapshot()
+    assert stats["connects"] == 4
+    assert stats["checkouts"] == 4
+    assert stats["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_awarmup_threaded_engine():
+    engine = ThreadedAsyncEngine(_sqlite_engine(_MeteredQueuePool, pool_size=2))
+
+    await awarmup_engine(engine)
+
+    assert pool_metrics(engine).snapshot()["connects"] == 2
+    await engine.dispose()
+
+
+def test_cloud_sql_database_warmup_pool_preset():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    with patch("terrabridge.gcp.cloud_sql.create_engine") as mock_create_engine:
+        with patch("terrabridge.gcp.cloud_sql.Connector"):
+            with patch("terrabridge.gcp.cloud_sql.warmup_engine") as mock_warmup:
+                engine = database.warmup(user, 2, pool="serverless")
+
+                assert engine is database.sqlalchemy_engine(
+                    user, pool=POOL_PRESETS["serverless"]
+                )
+                mock_warmup.assert_called_once_with(engine, 2)
+                mock_create_engine.assert_called_once_with(
+                    "postgresql+pg8000://",
+                    creator=ANY,
+                    poolclass=_MeteredQueuePool,
+                    pool_size=2,
+                    max_overflow=2,
+                    pool_timeout=30,
+                    pool_recycle=1800,
+                    pool_pre_ping=True,
+                )
+
+    with pytest.raises(ValueError):
+        database.sqlalchemy_engine(user, pool="unknown")
+
+
+@pytest.mark.asyncio
+async def test_cloud_sql_database_asyncpg_pool():
+    database = CloudSQLDatabase(
+        resource_name="database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(resource_name="user", state_file="tests/data/terraform.tfstate")
+
+    mock_pool = MagicMock(close=AsyncMock())
+
+    async def create_pool(*args, **kwargs):
+        return mock_pool
+
+    with patch(
+        "terrabridge.gcp.cloud_sql.asyncpg.create_pool",
+        autospec=True,
+        side_effect=create_pool,
+    ) as mock_create_pool:
+        with patch(
+            "terrabridge.gcp.cloud_sql.create_async_connector"
+        ) as mock_connector:
+            mock_connector.return_value.close_async = AsyncMock()
+            mock_connector.return_value.connect_async = AsyncMock()
+
+            pool = await database.asyncpg_pool(
+                user, min_size=1, max_size=4, statement_cache_size=0
+            )
+            assert (
+                await database.asyncpg_pool(
+                    user, min_size=1, max_size=4, statement_cache_size=0
+                )
+                is pool
+            )
+            mock_create_pool.assert_called_once_with(
+                connect=ANY,
+                min_size=1,
+                max_size=4,
+                statement_cache_size=0,
+                max_queries=50000,
+                max_inactive_connection_lifetime=300.0,
+            )
+
+            connect = mock_create_pool.call_args.kwargs["connect"]
+            await connect(loop=ANY, statement_cache_size=0)
+            mock_connector.return_value.connect_async.assert_awaited_once_with(
+                instance_connection_string=database.cloud_sql_instance.connection_name,
+                driver="asyncpg",
+                user=user.name,
+                password=user.password,
+                db=database.name,
+                ip_type=ANY,
+                loop=ANY,
+                statement_cache_size=0,
+            )
+
+            await adispose_engines()
+            pool.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cloud_sql_database_asyncpg_pool_mysql():
+    database = CloudSQLDatabase(
+        resource_name="mysql_database", state_file="tests/data/terraform.tfstate"
+    )
+    user = CloudSQLUser(
+        resource_name="mysql_user1", state_file="tests/data/terraform.tfstate"
+    )
+
+    with pytest.raises(NotImplementedError):
+        await database.asyncpg_pool(user)
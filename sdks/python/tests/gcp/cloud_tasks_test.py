@@ -1,4 +1,19 @@
-from terrabridge.gcp.cloud_tasks import CloudTasksQueue
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+from google.cloud import tasks_v2
+
+from terrabridge.gcp import cloud_tasks
+from terrabridge.gcp.cloud_tasks import CloudTasksQueue, EnqueueError, task_id
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(cloud_tasks, "_RETRY_INITIAL", 0)
 
 
 def test_cloud_tasks_queue():
@@ -12,3 +27,234 @@ def test_cloud_tasks_queue():
         "projects/terrabridge-testing/locations/"
         "us-central1/queues/cloud-tasks-queue-test"
     )
+
+
+def test_task_id():
+    assert task_id("resize", 1) == task_id("resize", 1)
+    assert task_id("resize", 1) != task_id("resize", 2)
+    assert task_id("ab", "c") != task_id("a", "bc")
+    assert all(c in "0123456789abcdef" for c in task_id(b"\x00"))
+
+
+def test_enqueue(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    result = queue.enqueue(
+        "https://worker.example.com/run",
+        {"job": 1},
+        name="job-1",
+        headers={"X-Trace": "abc"},
+        service_account_email="worker@example.com",
+    )
+
+    assert result is client.create_task.return_value
+    kwargs = client.create_task.call_args.kwargs
+    assert kwargs["parent"] == queue.id
+    task = kwargs["task"]
+    assert task.name == f"{queue.id}/tasks/job-1"
+    assert task.http_request.url == "https://worker.example.com/run"
+    assert task.http_request.http_method == tasks_v2.HttpMethod.POST
+    assert json.loads(task.http_request.body) == {"job": 1}
+    assert task.http_request.headers == {
+        "X-Trace": "abc",
+        "Content-Type": "application/json",
+    }
+    assert task.http_request.oidc_token.service_account_email == "worker@example.com"
+
+
+def test_enqueue_retries_quota_errors(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task.side_effect = [
+        api_exceptions.ResourceExhausted("quota"),
+        api_exceptions.ResourceExhausted("quota"),
+        "task",
+    ]
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    assert queue.enqueue("https://worker.example.com/run") == "task"
+    assert client.create_task.call_count == 3
+
+
+def test_enqueue_only_retries_unavailable_for_named_tasks(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task.side_effect = api_exceptions.ServiceUnavailable("down")
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    with pytest.raises(api_exceptions.ServiceUnavailable):
+        queue.enqueue("https://worker.example.com/run")
+    assert client.create_task.call_count == 1
+
+    client.create_task.side_effect = [
+        api_exceptions.ServiceUnavailable("down"),
+        api_exceptions.AlreadyExists("exists"),
+    ]
+    assert queue.enqueue("https://worker.example.com/run", name="job-1") is None
+
+
+def test_enqueue_many(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+
+    def create_task(parent, task):
+        if task.name.endswith("/tasks/3"):
+            raise api_exceptions.AlreadyExists("exists")
+        return task.name
+
+    client.create_task.side_effect = create_task
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    results = queue.enqueue_many(
+        ({"url": "https://worker.example.com/run", "name": str(i)} for i in range(10)),
+        max_concurrency=4,
+    )
+
+    assert results == [None if i == 3 else f"{queue.id}/tasks/{i}" for i in range(10)]
+
+
+def test_enqueue_many_raises_after_sending_all(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task.side_effect = [api_exceptions.InvalidArgument("bad")] + [
+        "task"
+    ] * 4
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    with pytest.raises(EnqueueError) as error:
+        queue.enqueue_many(
+            [{"url": "https://worker.example.com/run"}] * 5, max_concurrency=1
+        )
+    assert client.create_task.call_count == 5
+    # The tasks that were created are kept, so only the failed one is retried.
+    assert error.value.results[1:] == ["task"] * 4
+    [(index, failure)] = error.value.errors
+    assert index == 0
+    assert isinstance(failure, api_exceptions.InvalidArgument)
+    assert error.value.__cause__ is failure
+
+
+def test_enqueue_many_task_retries(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task.side_effect = api_exceptions.ServiceUnavailable("down")
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    with pytest.raises(EnqueueError):
+        queue.enqueue_many(
+            [{"url": "https://worker.example.com/run", "name": "a", "retries": 0}],
+            retries=3,
+        )
+    assert client.create_task.call_count == 1
+
+
+def test_enqueue_many_bounds_tasks_in_flight(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    lock = threading.Lock()
+    read = []
+    finished = 0
+    in_flight = []
+    later_task_created = threading.Event()
+
+    def create_task(parent, task):
+        nonlocal finished
+        with lock:
+            in_flight.append(len(read) - finished)
+        if task.name.endswith("/tasks/0"):
+            # A slow task does not hold back the tasks read after it.
+            later_task_created.wait(5)
+        elif task.name.endswith("/tasks/9"):
+            later_task_created.set()
+        with lock:
+            finished += 1
+        return "task"
+
+    client.create_task.side_effect = create_task
+    monkeypatch.setattr(cloud_tasks, "_get_client", lambda: client)
+
+    def tasks():
+        for i in range(10):
+            read.append(i)
+            yield {"url": "https://worker.example.com/run", "name": str(i)}
+
+    results = queue.enqueue_many(tasks(), max_concurrency=2)
+
+    assert results == ["task"] * 10
+    assert later_task_created.is_set()
+    # One more task is read while waiting for room.
+    assert max(in_flight) <= 3
+
+
+@pytest.mark.asyncio
+async def test_aenqueue_many(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task = AsyncMock(
+        side_effect=[api_exceptions.ResourceExhausted("quota")]
+        + [f"task-{i}" for i in range(5)]
+    )
+    monkeypatch.setattr(cloud_tasks, "_get_async_client", lambda: client)
+
+    results = await queue.aenqueue_many(
+        [{"url": "https://worker.example.com/run", "payload": "x"}] * 5,
+        max_concurrency=1,
+    )
+
+    assert results == [f"task-{i}" for i in range(5)]
+    assert client.create_task.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_aenqueue_many_bounds_tasks_in_flight(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    read = []
+    finished = 0
+    in_flight = []
+    later_task_created = asyncio.Event()
+
+    async def create_task(parent, task):
+        nonlocal finished
+        in_flight.append(len(read) - finished)
+        if task.name.endswith("/tasks/0"):
+            # A slow task does not hold back the tasks read after it.
+            await asyncio.wait_for(later_task_created.wait(), 5)
+        elif task.name.endswith("/tasks/9"):
+            later_task_created.set()
+        finished += 1
+        return "task"
+
+    client.create_task = AsyncMock(side_effect=create_task)
+    monkeypatch.setattr(cloud_tasks, "_get_async_client", lambda: client)
+
+    def tasks():
+        for i in range(10):
+            read.append(i)
+            yield {"url": "https://worker.example.com/run", "name": str(i)}
+
+    results = await queue.aenqueue_many(tasks(), max_concurrency=2)
+
+    assert results == ["task"] * 10
+    # One more task is read while waiting for room.
+    assert max(in_flight) <= 3
+
+
+@pytest.mark.asyncio
+async def test_aenqueue_many_raises_after_sending_all(monkeypatch):
+    queue = CloudTasksQueue("queue", state_file="tests/data/terraform.tfstate")
+    client = MagicMock()
+    client.create_task = AsyncMock(
+        side_effect=[api_exceptions.InvalidArgument("bad")] + ["task"] * 2
+    )
+    monkeypatch.setattr(cloud_tasks, "_get_async_client", lambda: client)
+
+    with pytest.raises(EnqueueError) as error:
+        await queue.aenqueue_many(
+            [{"url": "https://worker.example.com/run", "retries": 0}] * 3,
+            max_concurrency=1,
+        )
+    assert error.value.results[1:] == ["task"] * 2
+    assert [index for index, _ in error.value.errors] == [0]
@@ -0,0 +1,11 @@
+import pytest
+
+from terrabridge.gcp.clients import registry
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    # Tests patch client classes, so clients must not leak between tests.
+    registry._reset()
+    yield
+    registry._reset()
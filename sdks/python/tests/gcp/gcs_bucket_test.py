@@ -1,7 +1,11 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fsspec.implementations.memory import MemoryFileSystem
 
 import terrabridge
-from terrabridge.gcp import GCSBucket
+from terrabridge.gcp import GCSBucket, gcs_bucket, set_http_pool_size
+from terrabridge.gcp.clients import registry
 
 # TODO: add tests for reading bucket
 
@@ -10,6 +14,12 @@ class _FakeBucket:
     pass
 
 
+@pytest.fixture(autouse=True)
+def reset_client():
+    yield
+    set_http_pool_size(None)
+
+
 def test_gcs_bucket():
     bucket = GCSBucket(
         resource_name="bucket",
@@ -31,6 +41,59 @@ def test_gcs_bucket():
         )
 
 
+def test_gcs_bucket_cached():
+    bucket = GCSBucket(
+        resource_name="bucket",
+        state_file="tests/data/terraform.tfstate",
+    )
+
+    with patch("google.cloud.storage.Client") as mock:
+        assert bucket.bucket() is bucket.bucket()
+        mock.return_value.get_bucket.assert_called_once()
+
+        bucket.metadata_ttl = 0
+        bucket._bucket_fetched_at -= 1
+        bucket.bucket()
+        assert mock.return_value.get_bucket.call_count == 2
+
+        handle = bucket.bucket(fetch_metadata=False)
+        assert bucket.bucket(fetch_metadata=False) is handle
+        mock.return_value.bucket.assert_called_once_with(
+            "terrabridge-testing-terrabridge-testing"
+        )
+
+        # The client is shared across buckets.
+        GCSBucket(
+            resource_name="bucket",
+            state_file="tests/data/terraform.tfstate",
+            module_name="module.bucket",
+        ).bucket()
+        mock.assert_called_once()
+
+
+def test_gcs_bucket_http_pool_size():
+    bucket = GCSBucket(
+        resource_name="bucket",
+        state_file="tests/data/terraform.tfstate",
+    )
+    set_http_pool_size(64)
+    clients = len(registry)
+
+    with patch("google.auth.default", return_value=(None, "project")):
+        with patch("google.cloud.storage.Client") as mock:
+            bucket.bucket(fetch_metadata=False)
+
+            http = mock.call_args.kwargs["_http"]
+            adapter = http.get_adapter("https://storage.googleapis.com")
+            assert adapter._pool_maxsize == 64
+            assert mock.call_args.kwargs["project"] == "project"
+    assert gcs_bucket._get_client() is mock.return_value
+
+    # The client with the previous pool size is evicted from the registry.
+    set_http_pool_size(None)
+    assert len(registry) == clients
+
+
 def test_gcs_bucket_module():
     bucket = GCSBucket(
         resource_name="bucket",
@@ -60,3 +123,158 @@ def test_gcs_bucket_global_no_state_file():
     except ValueError:
         return
     raise AssertionError("Expected ValueError")
+
+
+class _FakeBlob:
+    def __init__(self, objects, name, **kwargs):
+        self._objects = objects
+        self.name = name
+        self.generation = 1
+
+    @property
+    def size(self):
+        return len(self._objects[self.name])
+
+    def upload_from_filename(self, path):
+        with open(path, "rb") as f:
+            self._objects[self.name] = f.read()
+
+    def upload_from_string(self, data):
+        self._objects[self.name] = data
+
+    def download_to_filename(self, path):
+        with open(path, "wb") as f:
+            f.write(self._objects[self.name])
+
+    def download_as_bytes(self, start=None, end=None, checksum="md5"):
+        return self._objects[self.name][start : end + 1]
+
+    def compose(self, sources):
+        assert len(sources) <= 32
+        self._objects[self.name] = b"".join(
+            self._objects[source.name] for source in sources
+        )
+
+    def delete(self):
+        del self._objects[self.name]
+
+
+class _FakeStorageClient:
+    def __init__(self):
+        self.objects = {}
+
+    def bucket(self, name):
+        client = self
+
+        class Bucket:
+            def blob(self, blob_name, **kwargs):
+                return _FakeBlob(client.objects, blob_name, **kwargs)
+
+            def get_blob(self, blob_name):
+                if blob_name not in client.objects:
+                    return None
+                return self.blob(blob_name)
+
+        return Bucket()
+
+
+def test_gcs_bucket_handle_follows_client(monkeypatch):
+    bucket = GCSBucket(
+        resource_name="bucket",
+        state_file="tests/data/terraform.tfstate",
+    )
+    with patch("google.cloud.storage.Client") as mock:
+        mock.side_effect = lambda *args, **kwargs: MagicMock()
+        handle = bucket.bucket(fetch_metadata=False)
+        assert bucket.bucket(fetch_metadata=False) is handle
+
+        # A forked child gets a new client, and with it a new handle.
+        registry._reset()
+        assert bucket.bucket(fetch_metadata=False) is not handle
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = _FakeStorageClient()
+    monkeypatch.setattr(gcs_bucket, "_get_client", lambda: client)
+    return client
+
+
+def test_gcs_bucket_upload_download_many(fake_client, tmp_path):
+    bucket = GCSBucket(
+        resource_name="bucket", state_file="tests/data/terraform.tfstate"
+    )
+    files = []
+    for i in range(20):
+        path = tmp_path / f"file-{i}"
+        path.write_bytes(f"data-{i}".encode())
+        files.append((str(path), f"remote/file-{i}"))
+    progress = []
+
+    results = bucket.upload_many(files, max_workers=4, on_progress=progress.append)
+
+    assert [result.name for result in results] == [name for _, name in files]
+    assert all(result.error is None for result in results)
+    assert len(progress) == 20
+    assert fake_client.objects["remote/file-3"] == b"data-3"
+
+    downloads = [
+        (name, str(tmp_path / f"download-{i}")) for i, (_, name) in enumerate(files)
+    ]
+    downloads.append(("missing", str(tmp_path / "missing")))
+    results = bucket.download_many(downloads)
+    assert (tmp_path / "download-7").read_bytes() == b"data-7"
+    assert isinstance(results[-1].error, KeyError)
+    with pytest.raises(KeyError):
+        bucket.download_many(downloads[-1:], raise_exception=True)
+    with pytest.raises(ValueError):
+        bucket.download_many(downloads, worker_type="fiber")
+
+
+def test_gcs_bucket_sliced_and_composite(fake_client, tmp_path):
+    bucket = GCSBucket(
+        resource_name="bucket", state_file="tests/data/terraform.tfstate"
+    )
+    data = bytes(range(256)) * 200
+    source = tmp_path / "source"
+    source.write_bytes(data)
+
+    result = bucket.upload_composite(str(source), "large", chunk_size=1000)
+    assert result.bytes == len(data)
+    # 52 parts need two levels of composition, and every temporary is removed.
+    assert list(fake_client.objects) == ["large"]
+    assert fake_client.objects["large"] == data
+
+    dest = tmp_path / "dest"
+    slices = []
+    result = bucket.download_sliced(
+        "large", str(dest), slice_size=4096, on_progress=slices.append
+    )
+    assert result.bytes == len(data)
+    assert len(slices) == 13
+    assert dest.read_bytes() == data
+
+    with pytest.raises(FileNotFoundError):
+        bucket.download_sliced("missing", str(dest))
+
+
+def test_gcs_bucket_open(monkeypatch):
+    fs = MemoryFileSystem()
+    monkeypatch.setattr(gcs_bucket, "_get_filesystem", lambda: fs)
+    bucket = GCSBucket(
+        resource_name="bucket", state_file="tests/data/terraform.tfstate"
+    )
+    data = bytes(range(256)) * 64
+
+    with bucket.open("dir/object", "wb") as f:
+        f.write(data)
+    assert fs.cat_file("terrabridge-testing-terrabridge-testing/dir/object") == data
+
+    with bucket.open("dir/object", block_size=1024) as f:
+        f.seek(1000)
+        assert f.read(10) == data[1000:1010]
+
+    assert bucket.read_range("dir/object", 5, 9) == data[5:9]
+    buffer = bytearray(100)
+    assert bucket.read_range_into("dir/object", len(data) - 40, buffer) == 40
+    assert buffer[:40] == data[-40:]
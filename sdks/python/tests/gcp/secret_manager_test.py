@@ -1,6 +1,13 @@
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
-from terrabridge.gcp.secret_manager import SecretManagerSecret
+import pytest
+
+from terrabridge.gcp.secret_manager import (
+    SecretManagerSecret,
+    afetch_secrets,
+    fetch_secrets,
+)
 
 
 def test_secret_manager_secret():
@@ -20,3 +27,37 @@ def test_secret_manager_secret():
         mock.return_value.access_secret_version.assert_called_once_with(
             name="projects/717658685230/secrets/secret/versions/latest"
         )
+
+
+def test_fetch_secrets_shares_client():
+    secrets = [
+        SecretManagerSecret("secret", state_file="tests/data/terraform.tfstate")
+        for _ in range(5)
+    ]
+
+    with patch("google.cloud.secretmanager.SecretManagerServiceClient") as mock:
+        mock.return_value.access_secret_version.side_effect = (
+            lambda name: SimpleNamespace(payload=SimpleNamespace(data=name.encode()))
+        )
+        results = fetch_secrets(secrets, version="3")
+
+        mock.assert_called_once()
+        assert results == [b"projects/717658685230/secrets/secret/versions/3"] * 5
+        assert mock.return_value.access_secret_version.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_aversion():
+    secret = SecretManagerSecret("secret", state_file="tests/data/terraform.tfstate")
+
+    with patch("google.cloud.secretmanager.SecretManagerServiceAsyncClient") as mock:
+        mock.return_value.access_secret_version = AsyncMock()
+        mock.return_value.access_secret_version.return_value.payload.data = b"secret"
+
+        assert await secret.aversion() == b"secret"
+        assert await afetch_secrets([secret, secret]) == [b"secret", b"secret"]
+
+        mock.assert_called_once()
+        mock.return_value.access_secret_version.assert_called_with(
+            name="projects/717658685230/secrets/secret/versions/latest"
+        )
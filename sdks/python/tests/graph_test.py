@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+from terrabridge import parser
+from terrabridge.gcp import CloudSQLDatabase
+from terrabridge.graph import DependencyGraph
+from terrabridge.parser import _ResourceKey, dependency_graph
+
+STATE_FILE = "tests/data/terraform.tfstate"
+
+
+def _graph(edges):
+    resources = {}
+    for name, dependencies in edges.items():
+        resources[_ResourceKey(name, None)] = {
+            "type": "null_resource",
+            "attributes": {},
+            "dependencies": [f"null_resource.{d}" for d in dependencies],
+        }
+    return DependencyGraph(resources)
+
+
+def test_state_graph():
+    graph = dependency_graph(STATE_FILE)
+    instance = "google_sql_database_instance.cloud_sql_instance"
+
+    assert len(graph) == 22
+    assert "module.bucket.google_storage_bucket.bucket" in graph
+    assert graph.dependents(instance) == [
+        "google_sql_database.database",
+        "google_sql_user.user",
+    ]
+    assert graph.dependencies("google_sql_user.user") == [instance]
+    assert graph.all_dependents("google_pubsub_lite_reservation.lite_reservation") == [
+        "google_pubsub_lite_subscription.lite_sub",
+        "google_pubsub_lite_topic.lite_topic",
+    ]
+    assert graph.resource_type(instance) == "google_sql_database_instance"
+    assert graph.resource_key(instance) == _ResourceKey("cloud_sql_instance", None)
+    with pytest.raises(ValueError):
+        graph.dependents("google_sql_database_instance.missing")
+
+    order = graph.topological_order()
+    assert sorted(order) == sorted(graph.addresses)
+    for address in order:
+        for dependency in graph.dependencies(address):
+            assert order.index(dependency) < order.index(address)
+
+    # Built once per parsed state.
+    assert dependency_graph(STATE_FILE) is graph
+
+
+def test_closure_and_impact():
+    graph = _graph({"a": [], "b": ["a"], "c": ["b"], "d": ["a", "c"], "e": []})
+
+    assert graph.all_dependencies("null_resource.d") == [
+        "null_resource.a",
+        "null_resource.c",
+        "null_resource.b",
+    ]
+    assert graph.all_dependents("null_resource.b") == [
+        "null_resource.c",
+        "null_resource.d",
+    ]
+    assert graph.impact(["null_resource.b", "null_resource.e"]) == [
+        "null_resource.c",
+        "null_resource.d",
+    ]
+    assert graph.impact(["null_resource.a", "null_resource.c"]) == [
+        "null_resource.b",
+        "null_resource.d",
+    ]
+    assert graph.topological_order() == [
+        "null_resource.a",
+        "null_resource.e",
+        "null_resource.b",
+        "null_resource.c",
+        "null_resource.d",
+    ]
+
+
+def test_cycle():
+    graph = _graph({"a": ["c"], "b": ["a"], "c": ["b"], "d": []})
+    with pytest.raises(ValueError):
+        graph.topological_order()
+
+
+def test_module_dependencies(tmp_path):
+    path = tmp_path / "terraform.tfstate"
+
+    def resource(type_, name, attributes, dependencies=()):
+        return {
+            "module": "module.db",
+            "mode": "managed",
+            "type": type_,
+            "name": name,
+            "instances": [
+                {
+                    "attributes": {"id": name, "project": "p", **attributes},
+                    "dependencies": list(dependencies),
+                }
+            ],
+        }
+
+    resources = [
+        resource(
+            "google_sql_database_instance",
+            "instance",
+            {
+                "name": "i",
+                "connection_name": "p:r:i",
+                "database_version": "POSTGRES_15",
+            },
+        ),
+        resource(
+            "google_sql_database",
+            "database",
+            {"name": "d"},
+            ["module.db.google_sql_database_instance.instance"],
+        ),
+    ]
+    path.write_text(json.dumps({"version": 4, "resources": resources}))
+    try:
+        database = CloudSQLDatabase(
+            "database", module_name="module.db", state_file=str(path)
+        )
+        assert database.cloud_sql_instance.name == "i"
+    finally:
+        parser.tf_state_cache.pop(str(path), None)
@@ -1,9 +1,16 @@
+import gzip
+import json
+import os
+
+import pytest
+from fsspec.implementations.local import LocalFileOpener
+
 import terrabridge
 from terrabridge.gcp import GCSBucket
-from terrabridge.parser import _parse_terraform_state
+from terrabridge.parser import _parse_terraform_state, refresh_state
 
-# NOTE: We don't test the local flow in this file because it's covered by
-# all the other tests
+# NOTE: We don't test the plain local flow in this file because it's covered
+# by all the other tests
 
 
 def test_parse_gcs_state():
@@ -22,3 +29,67 @@ def test_parse_s3_state():
         "bucket", state_file="s3://terrabridge-testing/terraform.tfstate"
     )
     assert bucket.url == "gs://terrabridge-testing-terrabridge-testing"
+
+
+def _write_state(path, resources, compress=None):
+    data = json.dumps({"version": 4, "resources": resources}).encode()
+    if compress == "gzip":
+        data = gzip.compress(data)
+    elif compress == "zstd":
+        data = pytest.importorskip("zstandard").ZstdCompressor().compress(data)
+    path.write_bytes(data)
+
+
+def _resource(name, bucket):
+    return {
+        "mode": "managed",
+        "type": "google_storage_bucket",
+        "name": name,
+        "instances": [
+            {
+                "attributes": {
+                    "id": bucket,
+                    "name": bucket,
+                    "project": "project",
+                    "url": f"gs://{bucket}",
+                }
+            }
+        ],
+    }
+
+
+@pytest.mark.parametrize("compress", [None, "gzip", "zstd"])
+def test_parse_compressed_state(tmp_path, compress):
+    path = tmp_path / "terraform.tfstate"
+    _write_state(path, [_resource("bucket", "a")], compress)
+
+    bucket = GCSBucket("bucket", state_file=str(path))
+
+    assert bucket.url == "gs://a"
+
+
+def test_refresh_state(tmp_path, monkeypatch):
+    path = tmp_path / "terraform.tfstate"
+    _write_state(path, [_resource("bucket", "a")])
+    fetches = []
+    read = LocalFileOpener.read
+    monkeypatch.setattr(
+        LocalFileOpener,
+        "read",
+        lambda self, *args: fetches.append(args) or read(self, *args),
+    )
+
+    assert refresh_state(str(path))
+    assert not refresh_state(str(path))
+    assert len(fetches) == 1
+    assert GCSBucket("bucket", state_file=str(path)).url == "gs://a"
+
+    _write_state(path, [_resource("other", "b")])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert refresh_state(str(path))
+    assert len(fetches) == 2
+    assert GCSBucket("other", state_file=str(path)).url == "gs://b"
+    with pytest.raises(ValueError):
+        GCSBucket("bucket", state_file=str(path))
@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import terrabridge
+from terrabridge import parser
+from terrabridge.base import _rehydrate
+from terrabridge.codegen import _resource_classes
+from terrabridge.gcp import CloudSQLDatabase, GCSBucket
+
+STATE_FILE = "tests/data/terraform.tfstate"
+AWS_STATE_FILE = "tests/data/aws.tfstate"
+
+
+def _bucket_url(bucket):
+    return bucket.url, STATE_FILE in parser.tf_state_cache
+
+
+def _write_state(path, serial, bucket):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "version": 4,
+                "serial": serial,
+                "resources": [
+                    {
+                        "mode": "managed",
+                        "type": "google_storage_bucket",
+                        "name": "bucket",
+                        "instances": [
+                            {
+                                "attributes": {
+                                    "id": bucket,
+                                    "name": bucket,
+                                    "project": "project",
+                                    "url": f"gs://{bucket}",
+                                }
+                            }
+                        ],
+                    }
+                ],
+            },
+            f,
+        )
+    # Make sure the modification time, which versions local files, changes.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + serial * 10**9))
+
+
+def test_pickle_is_a_reference():
+    bucket = GCSBucket("bucket", state_file=STATE_FILE)
+    # Live clients can't be pickled, they are not part of the reference.
+    bucket._bucket = threading.Lock()
+
+    data = pickle.dumps(bucket)
+    assert len(data) < 300
+    assert b"terrabridge-testing-terrabridge-testing" not in data
+
+    copy = pickle.loads(data)
+    assert type(copy) is GCSBucket
+    assert copy.url == bucket.url
+    assert copy._bucket is None
+
+    module_bucket = pickle.loads(
+        pickle.dumps(
+            GCSBucket("bucket", module_name="module.bucket", state_file=STATE_FILE)
+        )
+    )
+    assert module_bucket.name == "terrabridge-testing-terrabridge-testing-module"
+    database = pickle.loads(
+        pickle.dumps(CloudSQLDatabase("database", state_file=STATE_FILE))
+    )
+    assert database.name == "terrabridge-testing-database"
+
+
+@pytest.mark.parametrize("terraform_type, cls", sorted(_resource_classes().items()))
+def test_pickle_every_resource_class(terraform_type, cls):
+    state_file = AWS_STATE_FILE if terraform_type.startswith("aws_") else STATE_FILE
+    with open(state_file) as f:
+        resources = json.load(f)["resources"]
+    name = next(r["name"] for r in resources if r["type"] == terraform_type)
+    resource = cls(name, state_file=state_file)
+
+    copy = pickle.loads(pickle.dumps(resource))
+    assert type(copy) is cls
+    assert copy._attributes == resource._attributes
+
+
+def test_pickle_global_state_file(monkeypatch):
+    monkeypatch.setattr(terrabridge, "state_file", STATE_FILE)
+    data = pickle.dumps(GCSBucket("bucket"))
+
+    # The receiving process may not set terrabridge.state_file.
+    monkeypatch.setattr(terrabridge, "state_file", None)
+    assert pickle.loads(data).url == "gs://terrabridge-testing-terrabridge-testing"
+
+
+def test_rehydrate_refreshes_older_state(tmp_path, monkeypatch):
+    path = str(tmp_path / "terraform.tfstate")
+    _write_state(path, 1, "a")
+    try:
+        assert GCSBucket("bucket", state_file=path).url == "gs://a"
+
+        refreshes = []
+        refresh_state = parser.refresh_state
+        monkeypatch.setattr(
+            parser,
+            "refresh_state",
+            lambda p: refreshes.append(p) or refresh_state(p),
+        )
+        assert _rehydrate(GCSBucket, "bucket", None, path, 1).url == "gs://a"
+        assert refreshes == []
+
+        # The sender saw a newer state than this process parsed.
+        _write_state(path, 2, "b")
+        assert _rehydrate(GCSBucket, "bucket", None, path, 2).url == "gs://b"
+        assert refreshes == [path]
+        assert parser._state_serials[path] == 2
+    finally:
+        parser.tf_state_cache.pop(path, None)
+
+
+def test_process_pool():
+    bucket = GCSBucket("bucket", state_file=STATE_FILE)
+    # A spawned worker has no copy of the parent's parsed state.
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        url, cached = executor.submit(_bucket_url, bucket).result()
+    assert url == bucket.url
+    assert cached
+
+
+@pytest.fixture(autouse=True)
+def _cleanup():
+    yield
+    parser.tf_state_cache.pop(STATE_FILE, None)
+    parser.tf_state_cache.pop(AWS_STATE_FILE, None)
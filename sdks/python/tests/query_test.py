@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from terrabridge import parser
+from terrabridge.gcp import CloudSQLInstance, GCSBucket
+from terrabridge.query import compile_path, select
+
+STATE_FILE = "tests/data/terraform.tfstate"
+
+ATTRIBUTES = {
+    "settings": [{"ip_configuration": [{"private_network": "vpc"}]}],
+    "labels": {"team": "data", "app.kubernetes.io/name": "web"},
+    "lifecycle_rule": [
+        {"action": [{"type": "Delete"}]},
+        {"action": [{"type": "SetStorageClass"}]},
+        {"action": []},
+    ],
+}
+
+
+def test_compile_path():
+    assert (
+        compile_path("settings[0].ip_configuration[0].private_network")(ATTRIBUTES)
+        == "vpc"
+    )
+    assert compile_path('labels["app.kubernetes.io/name"]')(ATTRIBUTES) == "web"
+    assert compile_path("lifecycle_rule[-1].action")(ATTRIBUTES) == []
+    assert compile_path("lifecycle_rule[*].action[0].type")(ATTRIBUTES) == [
+        "Delete",
+        "SetStorageClass",
+    ]
+    assert sorted(compile_path("labels[*]")(ATTRIBUTES)) == ["data", "web"]
+
+    missing = compile_path("settings[1].ip_configuration")
+    assert missing(ATTRIBUTES) is None
+    assert missing(ATTRIBUTES, "default") == "default"
+    assert compile_path("labels.team.name")(ATTRIBUTES) is None
+    assert compile_path("labels[0]")(ATTRIBUTES) is None
+
+    # Compiled paths are cached.
+    assert compile_path("labels.team") is compile_path("labels.team")
+
+
+@pytest.mark.parametrize(
+    "path", ["", ".labels", "labels.", "labels..team", "labels[x]", "a.[0]", "a b"]
+)
+def test_compile_path_invalid(path):
+    with pytest.raises(ValueError):
+        compile_path(path)
+
+
+def test_resource_get():
+    instance = CloudSQLInstance("cloud_sql_instance", state_file=STATE_FILE)
+    assert instance.get("settings[0].tier") == "db-custom-1-3840"
+    assert instance.get("ip_address[*].type") == ["PRIMARY", "OUTGOING"]
+    assert instance.get("settings[0].missing", "default") == "default"
+
+
+def test_select():
+    assert select("google_storage_bucket", "location", state_file=STATE_FILE) == {
+        "google_storage_bucket.bucket": "US",
+        "module.bucket.google_storage_bucket.bucket": "US",
+    }
+    assert select("google_storage_bucket", "missing", state_file=STATE_FILE) == {}
+    assert select("google_pubsub_topic", "name", state_file=STATE_FILE) == {
+        "google_pubsub_topic.topic": "example-topic"
+    }
+    assert select("aws_s3_bucket", "bucket", state_file=STATE_FILE) == {}
+
+
+def test_select_after_refresh(tmp_path):
+    path = tmp_path / "terraform.tfstate"
+
+    def write(buckets):
+        resources = [
+            {
+                "mode": "managed",
+                "type": "google_storage_bucket",
+                "name": name,
+                "instances": [
+                    {
+                        "attributes": {
+                            "id": name,
+                            "name": name,
+                            "project": "p",
+                            "url": f"gs://{name}",
+                        }
+                    }
+                ],
+            }
+            for name in buckets
+        ]
+        path.write_text(json.dumps({"version": 4, "resources": resources}))
+
+    write(["a"])
+    try:
+        assert select("google_storage_bucket", "url", state_file=str(path)) == {
+            "google_storage_bucket.a": "gs://a"
+        }
+        write(["a", "b"])
+        parser._load_state(str(path), path.read_bytes(), None)
+        assert list(select("google_storage_bucket", "url", state_file=str(path))) == [
+            "google_storage_bucket.a",
+            "google_storage_bucket.b",
+        ]
+        assert GCSBucket("b", state_file=str(path)).get("url") == "gs://b"
+    finally:
+        parser.tf_state_cache.pop(str(path), None)
@@ -0,0 +1,235 @@
+import gc
+import gzip
+import json
+import socket
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fsspec
+import pytest
+
+from terrabridge import parser, sources
+from terrabridge.gcp import GCSBucket
+from terrabridge.sources import (
+    FsspecStateSource,
+    HTTPStateSource,
+    get_state_source,
+    register_state_source,
+)
+
+
+def _state(bucket):
+    return json.dumps(
+        {
+            "version": 4,
+            "resources": [
+                {
+                    "mode": "managed",
+                    "type": "google_storage_bucket",
+                    "name": "bucket",
+                    "instances": [
+                        {
+                            "attributes": {
+                                "id": bucket,
+                                "name": bucket,
+                                "project": "project",
+                                "url": f"gs://{bucket}",
+                            }
+                        }
+                    ],
+                }
+            ],
+        }
+    ).encode()
+
+
+class StateServer:
+    def __init__(self):
+        self.states = {"/state": (_state("a"), '"1"')}
+        self.requests = []
+        self.redirects = {"/redirect": "/state", "/private-redirect": "/private"}
+        self.credentials = []
+        self.clients = set()
+        self.connections = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, status, body=b"", headers=()):
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                server.requests.append(
+                    (self.command, self.path, self.headers.get("If-None-Match"))
+                )
+                server.clients.add(self.client_address)
+                server.connections.append(self.connection)
+                server.credentials.append(
+                    (self.headers.get("Authorization"), self.headers.get("X-Token"))
+                )
+                if self.path in server.redirects:
+                    location = server.redirects[self.path]
+                    return self._respond(302, headers=[("Location", location)])
+                if self.path == "/private":
+                    if self.headers.get("Authorization") != "Bearer token":
+                        return self._respond(401)
+                    return self._respond(200, _state("private"))
+                if self.path == "/v1/kv/state?raw":
+                    body = gzip.compress(_state("consul"))
+                    return self._respond(
+                        200,
+                        body,
+                        [("X-Consul-Index", "7"), ("Content-Encoding", "gzip")],
+                    )
+                if self.path not in server.states:
+                    return self._respond(404)
+                body, etag = server.states[self.path]
+                if self.headers.get("If-None-Match") == etag:
+                    return self._respond(304, headers=[("ETag", etag)])
+                self._respond(200, body, [("ETag", etag)])
+
+            do_HEAD = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("localhost", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://localhost:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    server = StateServer()
+    yield server
+    server.close()
+    for path in list(parser.tf_state_cache):
+        if path.startswith(server.url):
+            del parser.tf_state_cache[path]
+    for prefix in list(sources._sources):
+        if prefix.startswith(server.url):
+            del sources._sources[prefix]
+
+
+def test_http_state(server):
+    path = f"{server.url}/state"
+
+    assert GCSBucket("bucket", state_file=path).url == "gs://a"
+    assert not parser.state_changed(path)
+    assert not parser.refresh_state(path)
+
+    server.states["/state"] = (_state("b"), '"2"')
+    assert parser.state_changed(path)
+    assert parser.refresh_state(path)
+    assert GCSBucket("bucket", state_file=path).url == "gs://b"
+
+    assert server.requests == [
+        ("GET", "/state", None),
+        ("HEAD", "/state", None),
+        ("GET", "/state", '"1"'),
+        ("HEAD", "/state", None),
+        ("GET", "/state", '"1"'),
+    ]
+    # Every request reused the same keep-alive connection.
+    assert len(server.clients) == 1
+
+
+def test_http_redirect_and_consul(server):
+    source = HTTPStateSource()
+
+    assert source.fetch(f"{server.url}/redirect")[0] == _state("a")
+
+    data, version = source.fetch(f"{server.url}/v1/kv/state?raw")
+    assert data == _state("consul")
+    assert version == "X-Consul-Index:7"
+    # Consul has no conditional requests, an unchanged index skips the parse.
+    assert source.fetch(f"{server.url}/v1/kv/state?raw", version) is None
+
+
+def test_http_errors_and_headers(server):
+    with pytest.raises(ValueError):
+        HTTPStateSource().fetch(f"{server.url}/missing")
+    with pytest.raises(ValueError):
+        HTTPStateSource().fetch(f"{server.url}/private")
+
+    register_state_source(
+        f"{server.url}/private",
+        HTTPStateSource(headers={"Authorization": "Bearer token"}),
+    )
+    path = f"{server.url}/private"
+    assert GCSBucket("bucket", state_file=path).url == "gs://private"
+
+
+def test_http_redirect_keeps_credentials_on_the_same_host(server):
+    source = HTTPStateSource(headers={"Authorization": "Bearer token"})
+
+    assert source.fetch(f"{server.url}/private-redirect")[0] == _state("private")
+
+
+def test_http_redirect_drops_credentials_for_other_hosts(server):
+    other = StateServer()
+    try:
+        server.redirects["/moved"] = f"{other.url}/private"
+        source = HTTPStateSource(
+            headers={"Authorization": "Bearer token", "X-Token": "secret"}
+        )
+
+        with pytest.raises(ValueError):
+            source.fetch(f"{server.url}/moved")
+        assert server.credentials == [("Bearer token", "secret")]
+        assert other.credentials == [(None, None)]
+    finally:
+        other.close()
+
+
+def test_http_sources_are_reset_without_being_kept_alive():
+    source = HTTPStateSource()
+    local = source._local
+    sources._reset_http_sources()
+    assert source._local is not local
+
+    count = len(sources._http_sources)
+    ref = weakref.ref(source)
+    del source
+    gc.collect()
+    assert ref() is None
+    assert len(sources._http_sources) == count - 1
+
+
+def test_http_reconnects_after_server_closes_connection(server):
+    source = HTTPStateSource()
+    path = f"{server.url}/state"
+    assert source.fetch(path)[1] == 'ETag:"1"'
+
+    # The server drops the idle keep-alive connection.
+    server.connections[-1].shutdown(socket.SHUT_RDWR)
+
+    assert source.fetch(path)[1] == 'ETag:"1"'
+
+
+def test_fsspec_sources():
+    fs = fsspec.filesystem("memory")
+    fs.pipe_file("/states/terraform.tfstate", _state("memory"))
+
+    source = get_state_source("memory://states/terraform.tfstate")
+    assert isinstance(source, FsspecStateSource)
+    bucket = GCSBucket("bucket", state_file="memory://states/terraform.tfstate")
+    assert bucket.url == "gs://memory"
+
+    path = "tests/data/terraform.tfstate"
+    local = get_state_source(path)
+    assert not local.changed(path, local.version(path))
+    assert local.changed(path, None)